@@ -0,0 +1,99 @@
+"""
+Measure the cost of creating the output path of a song.
+
+Usage:
+    python scripts/benchmark_file_names.py
+    python scripts/benchmark_file_names.py "{album-artist}/{album}/{title}" --repeat 5000
+
+The baseline is what `create_file_name` did before the templates were
+compiled: a deep copy of the song, `format_query` and `create_path_object`.
+"""
+
+import argparse
+import copy
+import statistics
+import time
+
+from spotdl.types.song import Song
+from spotdl.utils.formatter import (
+    FileNameTemplate,
+    create_file_name,
+    create_path_object,
+    format_query,
+)
+
+SONG = Song.from_missing_data(
+    name="Ropes",
+    artists=["Dirty Palm", "Chandler Jewels"],
+    artist="Dirty Palm",
+    album_name="Ropes",
+    album_artist="Dirty Palm",
+    genres=["gaming edm"],
+    disc_number=1,
+    disc_count=1,
+    duration=188,
+    year=2021,
+    date="2021-10-28",
+    track_number=1,
+    tracks_count=1,
+    isrc="GB2LD2110301",
+    song_id="1t2qKa8K72IBC8yQlhD9bU",
+    list_name="Playlist",
+    list_position=5,
+    list_length=11,
+)
+
+
+def measure(func, repeat: int) -> float:
+    """
+    Measure the median duration of a function in microseconds.
+    """
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations) * 1_000_000
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "template",
+        nargs="?",
+        default="{album-artist}/{album}/{track-number} - {title}.{output-ext}",
+    )
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    template = FileNameTemplate(args.template)
+
+    def baseline():
+        create_path_object(
+            format_query(copy.deepcopy(SONG), template.template, True, "mp3")
+        )
+
+    results = {
+        "baseline": measure(baseline, args.repeat),
+        "create_file_name": measure(
+            lambda: create_file_name(SONG, args.template, "mp3"), args.repeat
+        ),
+        "compiled": measure(lambda: template.create(SONG, "mp3"), args.repeat),
+    }
+
+    print(template.create(SONG, "mp3"))
+    for name, duration in results.items():
+        print(
+            f"  {name:<18} {duration:8.2f} us"
+            f"  {results['baseline'] / duration:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare the html backends on saved pages of the lyrics providers.
+
+Usage:
+    python scripts/benchmark_html.py genius-lyrics page.html [page.html ...]
+    python scripts/benchmark_html.py azlyrics-search search.html --repeat 50
+
+Pages can be saved with e.g. `curl -o page.html <url>`. The baseline is a
+BeautifulSoup `html.parser` parse of the whole page, which is what the
+providers did before the extraction was targeted.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from spotdl.providers.lyrics import AzLyrics, Genius, MusixMatch
+from spotdl.utils.html import available_backends
+
+EXTRACTORS = {
+    "genius-lyrics": Genius.parse_lyrics,
+    "musixmatch-lyrics": MusixMatch.parse_lyrics,
+    "musixmatch-search": MusixMatch.parse_results,
+    "azlyrics-lyrics": AzLyrics.parse_lyrics,
+    "azlyrics-search": AzLyrics.parse_results,
+}
+
+
+def measure(func, repeat: int) -> float:
+    """
+    Measure the median duration of a function in milliseconds.
+    """
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return statistics.median(durations) * 1000
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("page_type", choices=EXTRACTORS.keys())
+    parser.add_argument("pages", nargs="+", type=Path)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    extract = EXTRACTORS[args.page_type]
+
+    for path in args.pages:
+        html = path.read_text(encoding="utf-8")
+        print(f"{path} ({len(html) / 1024:.0f} KiB)")
+
+        baseline = measure(lambda: BeautifulSoup(html, "html.parser"), args.repeat)
+        print(f"  {'baseline':<12} {baseline:8.2f} ms")
+
+        expected = extract(html, "html.parser")
+        for backend in available_backends():
+            # pylint: disable=cell-var-from-loop
+            duration = measure(lambda: extract(html, backend), args.repeat)
+            same = "" if extract(html, backend) == expected else "  (differs)"
+            print(
+                f"  {backend:<12} {duration:8.2f} ms"
+                f"  {baseline / duration:5.1f}x{same}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare reading all the tags of a library with reading only some fields.
+
+Usage:
+    python scripts/benchmark_tags.py ~/Music
+    python scripts/benchmark_tags.py ~/Music --fields url isrc --limit 2000
+
+The baseline is `get_file_metadata`, which loads every tag including the
+album art. Time is measured per file, memory is the peak of the allocations
+made while reading a single file.
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from spotdl.utils.ffmpeg import FFMPEG_FORMATS
+from spotdl.utils.metadata import get_file_metadata
+from spotdl.utils.tags import read_tags
+
+
+def measure(func, paths):
+    """
+    Measure the median duration in milliseconds and the median
+    peak memory in KiB of a function called on every file.
+    """
+
+    durations = []
+    peaks = []
+    for path in paths:
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            func(path)
+        except Exception:  # pylint: disable=broad-except
+            pass
+        durations.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return statistics.median(durations) * 1000, statistics.median(peaks) / 1024
+
+
+def main():
+    """
+    Run the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("library", type=Path)
+    parser.add_argument("--fields", nargs="+", default=["url"])
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = [
+        path
+        for path in sorted(args.library.rglob("*"))
+        if path.suffix[1:] in FFMPEG_FORMATS
+    ][: args.limit]
+
+    fields = set(args.fields)
+    for suffix in sorted({path.suffix for path in paths}):
+        group = [path for path in paths if path.suffix == suffix]
+        print(f"{suffix} ({len(group)} files)")
+
+        baseline, baseline_peak = measure(get_file_metadata, group)
+        print(f"  {'all tags':<12} {baseline:8.2f} ms {baseline_peak:9.0f} KiB")
+
+        duration, peak = measure(lambda path: read_tags(path, fields), group)
+        print(
+            f"  {'read_tags':<12} {duration:8.2f} ms {peak:9.0f} KiB"
+            f"  {baseline / duration:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,15 @@
 import concurrent.futures
 import logging
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 from spotdl._version import __version__
 from spotdl.console import console_entry_point
-from spotdl.download.downloader import Downloader
 from spotdl.types.options import DownloaderOptionalOptions, DownloaderOptions
 from spotdl.types.song import Song
-from spotdl.utils.search import parse_query
+
+if TYPE_CHECKING:
+    from spotdl.download.downloader import Downloader
 
 __all__ = ["Spotdl", "console_entry_point", "__version__"]
 
@@ -52,11 +53,14 @@ def __init__(
         - loop: Event loop to use
         """
 
+        # pylint: disable=import-outside-toplevel
+        from spotdl.download.downloader import Downloader
+
         if downloader_settings is None:
             downloader_settings = {}
 
         # Initialize downloader
-        self.downloader = Downloader(
+        self.downloader: "Downloader" = Downloader(
             settings=downloader_settings,
             loop=loop,
         )
@@ -75,6 +79,10 @@ def search(self, query: List[str]) -> List[Song]:
         - query can be a list of CSV files, .spotdl files, or YouTube URLs
         """
 
+        from spotdl.utils.search import (  # pylint: disable=import-outside-toplevel
+            parse_query,
+        )
+
         return parse_query(
             query=query,
             threads=self.downloader.settings["threads"],
@@ -2,35 +2,52 @@
 Module that holds the entry point for the console.
 """
 
-import cProfile
 import logging
-import pstats
+import multiprocessing
 import signal
 import sys
 import time
+from typing import TYPE_CHECKING, Callable, List
 
-from spotdl.console.download import download
-from spotdl.console.meta import meta
-from spotdl.console.save import save
-from spotdl.console.sync import sync
-from spotdl.console.url import url
-from spotdl.console.web import web
-from spotdl.download.downloader import Downloader, DownloaderError
 from spotdl.utils.arguments import parse_arguments
-from spotdl.utils.config import create_settings
+from spotdl.utils.config import DOWNLOADER_OPTIONS, create_settings
 from spotdl.utils.console import ACTIONS, generate_initial_config, is_executable
 from spotdl.utils.downloader import check_ytmusic_connection
 from spotdl.utils.ffmpeg import FFmpegError, download_ffmpeg, is_ffmpeg_installed
+from spotdl.utils.lazy import lazy_import
 from spotdl.utils.logging import init_logging
+from spotdl.utils.profiling import SamplingProfiler
+
+if TYPE_CHECKING:
+    from spotdl.download.downloader import Downloader
 
 __all__ = ["console_entry_point", "OPERATIONS"]
 
+
+def _lazy_operation(path: str) -> Callable[..., None]:
+    """
+    Create an operation that imports its module on the first call,
+    so that only the selected operation and its dependencies are imported.
+
+    ### Arguments
+    - path: The import path of the operation, e.g. `spotdl.console.download:download`.
+
+    ### Returns
+    - The operation function.
+    """
+
+    def operation(query: List[str], downloader: "Downloader") -> None:
+        return lazy_import(path)(query=query, downloader=downloader)
+
+    return operation
+
+
 OPERATIONS = {
-    "download": download,
-    "sync": sync,
-    "save": save,
-    "meta": meta,
-    "url": url,
+    "download": _lazy_operation("spotdl.console.download:download"),
+    "sync": _lazy_operation("spotdl.console.sync:sync"),
+    "save": _lazy_operation("spotdl.console.save:save"),
+    "meta": _lazy_operation("spotdl.console.meta:meta"),
+    "url": _lazy_operation("spotdl.console.url:url"),
 }
 
 logger = logging.getLogger(__name__)
@@ -38,16 +55,28 @@
 
 def console_entry_point():
     """
-    Entry point for the console. With profile flag, it runs the code with cProfile.
+    Entry point for the console. With profile flag, it runs the code with
+    the sampling profiler, which covers the worker threads as well.
     """
 
+    # Lets the worker processes of the meta operation start
+    # in the executables built with PyInstaller
+    multiprocessing.freeze_support()
+
     if "--profile" in sys.argv:
-        with cProfile.Profile() as profile:
-            entry_point()
+        profiler = SamplingProfiler()
+        profiler.start()
 
-        stats = pstats.Stats(profile)
-        stats.sort_stats(pstats.SortKey.TIME)
-        stats.dump_stats("spotdl.profile")
+        try:
+            entry_point()
+        finally:
+            profiler.stop()
+            report_path, folded_path = profiler.save("spotdl.profile")
+            logger.info(
+                "Saved profile report to %s and folded stacks to %s",
+                report_path,
+                folded_path,
+            )
     else:
         entry_point()
 
@@ -81,6 +110,35 @@ def entry_point():
 
     init_logging(downloader_settings["log_level"], downloader_settings["log_format"])
 
+    # Submitting a job to the daemon doesn't need the downloader,
+    # the daemon applies the settings passed on the command line to its own
+    # pylint: disable=import-outside-toplevel
+    if arguments.operation == "submit":
+        from spotdl.console.submit import submit
+        from spotdl.utils.daemon import get_socket_path
+
+        query = arguments.query
+        operation = "download"
+        if len(query) > 1 and query[0] in OPERATIONS:
+            operation, query = query[0], query[1:]
+
+        submit(
+            arguments.socket_path or get_socket_path(),
+            operation,
+            query,
+            {
+                key: value
+                for key, value in vars(arguments).items()
+                if key in DOWNLOADER_OPTIONS and value is not None
+            },
+        )
+
+        return None
+
+    # The downloader imports the providers and their dependencies,
+    # so it's imported only when we know that we are going to use it
+    from spotdl.download.downloader import Downloader, DownloaderError
+
     # If the application is frozen, we check for ffmpeg
     # if it's not present download it create config file
     if is_executable():
@@ -102,6 +160,19 @@ def entry_point():
                 "Please use a VPN, change youtube-music to piped, or use other audio providers"
             )
 
+    # Start the daemon, it keeps the downloader warm between the submitted jobs
+    if arguments.operation == "serve":
+        from spotdl.console.serve import serve
+        from spotdl.utils.daemon import get_socket_path
+
+        serve(
+            arguments.socket_path or get_socket_path(),
+            downloader_settings,
+            OPERATIONS,
+        )
+
+        return None
+
     # If the application is frozen start web ui
     # or if the operation is `web`
     if is_executable() or arguments.operation == "web":
@@ -111,6 +182,8 @@ def entry_point():
             web_settings["web_use_output_dir"] = True
 
         # Start web ui
+        from spotdl.console.web import web
+
         web(web_settings, downloader_settings)
 
         return None
@@ -3,22 +3,54 @@
 """
 
 import asyncio
+import concurrent.futures
+import functools
 import logging
+import multiprocessing
+import os
+import threading
+import time
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from spotdl.download.downloader import Downloader
 from spotdl.types.song import Song
+from spotdl.utils.cover_cache import CoverCache
 from spotdl.utils.ffmpeg import FFMPEG_FORMATS
 from spotdl.utils.lrc import generate_lrc
 from spotdl.utils.metadata import embed_metadata, get_file_metadata
 from spotdl.utils.search import QueryError, parse_query, reinit_song
 
-__all__ = ["meta"]
+__all__ = ["meta", "find_audio_files"]
+
+# Number of files sent to a worker process at once when reading the tags
+READ_CHUNK_SIZE = 64
+
+# Seconds between two progress messages
+PROGRESS_INTERVAL = 5
 
 logger = logging.getLogger(__name__)
 
 
+def find_audio_files(path: Path) -> Iterator[Path]:
+    """
+    Find the audio files in a folder and its subfolders.
+
+    ### Arguments
+    - path: The folder.
+
+    ### Returns
+    - Iterator over the files, in a single walk of the folder tree.
+    """
+
+    for root, folders, files in os.walk(path):
+        folders.sort()
+        for name in sorted(files):
+            file = Path(root, name)
+            if file.suffix[1:] in FFMPEG_FORMATS:
+                yield file
+
+
 def meta(query: List[str], downloader: Downloader) -> None:
     """
     This function applies metadata to the selected songs
@@ -30,7 +62,9 @@ def meta(query: List[str], downloader: Downloader) -> None:
     - downloader: Already initialized downloader instance.
 
     ### Notes
-    - This function is multi-threaded.
+    - This function is multi-threaded. The tags are read and written
+        by a pool of processes, since mutagen is limited by the GIL,
+        and the lookups of missing metadata run on threads.
     """
 
     # Create a list of all songs from all paths in query
@@ -42,8 +76,7 @@ def meta(query: List[str], downloader: Downloader) -> None:
             continue
 
         if test_path.is_dir():
-            for out_format in FFMPEG_FORMATS:
-                paths.extend(test_path.glob(f"*.{out_format}"))
+            paths.extend(find_audio_files(test_path))
         elif test_path.is_file():
             if test_path.suffix.split(".")[-1] not in FFMPEG_FORMATS:
                 logger.error("File is not a supported audio format: %s", path)
@@ -51,122 +84,193 @@ def meta(query: List[str], downloader: Downloader) -> None:
 
             paths.append(test_path)
 
-    def process_file(file: Path):
-        # metadata of the file, url is present in the file.
-        song_meta = get_file_metadata(file, downloader.settings["id3_separator"])
+    start = time.perf_counter()
+    id3_separator = downloader.settings["id3_separator"]
+    cover_cache = downloader.cover_cache
+    write_options = {
+        "skip_album_art": downloader.settings["skip_album_art"],
+        "cover_cache": (
+            None
+            if cover_cache is None
+            else (str(cover_cache.path), cover_cache.max_bytes)
+        ),
+        "cover_max_size": downloader.settings["cover_max_size"],
+    }
 
-        # Check if song has metadata
-        # and if it has all the required fields
-        # if it has all of these fields, we can assume that the metadata is correct
-        if song_meta and not downloader.settings["force_update_metadata"]:
-            if (
-                song_meta.get("artist")
-                and song_meta.get("artists")
-                and song_meta.get("name")
-                and song_meta.get("lyrics")
-                and song_meta.get("album_art")
-            ):
-                logger.info("Song already has metadata: %s", file.name)
-                if downloader.settings["generate_lrc"]:
-                    lrc_file = file.with_suffix(".lrc")
-                    if lrc_file.exists():
-                        logger.info("Lrc file already exists for %s", file.name)
-                        return None
-
-                    song = Song.from_missing_data(
-                        name=song_meta["name"],
-                        artists=song_meta["artists"],
-                        artist=song_meta["artist"],
-                    )
-
-                    generate_lrc(song, file)
-                    if lrc_file.exists():
-                        logger.info("Saved lrc file for %s", song.display_name)
-                    else:
-                        logger.info("Could not find lrc file for %s", song.display_name)
-
-                return None
-
-        # Same as above
-        if (
-            not song_meta
-            or None
-            in [
-                song_meta.get("name"),
-                song_meta.get("album_art"),
-                song_meta.get("artist"),
-                song_meta.get("artists"),
-                song_meta.get("track_number"),
-            ]
-            or downloader.settings["force_update_metadata"]
-        ):
-            # Song does not have metadata, or it is missing some fields
-            # or we are forcing update of metadata
-            logger.error(
-                "Could not find metadata for %s. "
-                "Spotify search is no longer available.",
-                file.name,
+    executor = _create_process_pool(downloader.settings["meta_processes"], len(paths))
+    try:
+        # Read the tags of all files in a single pass, the result
+        # is reused for the redownload at the end
+        read_results: Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]
+        if executor is None:
+            read_results = map(
+                functools.partial(_read_metadata, id3_separator=id3_separator),
+                paths,
+            )
+        else:
+            read_results = executor.map(
+                functools.partial(_read_metadata, id3_separator=id3_separator),
+                paths,
+                chunksize=READ_CHUNK_SIZE,
             )
-            return None
 
-        # Song has metadata, so we use it to reinitialize the song object
-        # and fill in the missing metadata
-        try:
-            song = reinit_song(Song.from_missing_data(**song_meta))
-        except QueryError:
-            logger.error("Could not find metadata for %s", file.name)
-            return None
+        metadata: Dict[Path, Optional[Dict[str, Any]]] = {}
+        progress = _Progress("Read the tags of", len(paths))
+        for file, (song_meta, error) in zip(paths, read_results):
+            if error is not None:
+                logger.error("Could not read the tags of %s: %s", file, error)
 
-        # Check if the song has lyric
-        # if not use downloader to find lyrics
-        if song_meta is None or song_meta.get("lyrics") is None:
-            logger.debug("Fetching lyrics for %s", song.display_name)
-            song.lyrics = downloader.search_lyrics(song)
-            if song.lyrics:
-                logger.info("Found lyrics for song: %s", song.display_name)
-        else:
-            song.lyrics = song_meta.get("lyrics")
+            metadata[file] = song_meta
+            progress.advance()
 
-        # Apply metadata to the song
-        embed_metadata(file, song, skip_album_art=downloader.settings["skip_album_art"])
+        # Urls of the songs, updated for the files that get new metadata
+        urls: Dict[Path, Optional[str]] = {
+            file: song_meta.get("url") if song_meta else None
+            for file, song_meta in metadata.items()
+        }
+        updated: List[Path] = []
+        progress = _Progress("Processed", len(paths))
 
-        logger.info("Applied metadata to %s", file.name)
+        def write_metadata(file: Path, song: Song) -> None:
+            if executor is not None:
+                executor.submit(
+                    _write_metadata, file, song.json, write_options
+                ).result()
+                return
 
-        if downloader.settings["generate_lrc"]:
+            embed_metadata(
+                file,
+                song,
+                skip_album_art=downloader.settings["skip_album_art"],
+                cover_cache=downloader.cover_cache,
+                cover_max_size=downloader.settings["cover_max_size"],
+            )
+
+        def write_lrc(file: Path, song: Song) -> None:
             lrc_file = file.with_suffix(".lrc")
             if lrc_file.exists():
                 logger.info("Lrc file already exists for %s", file.name)
-                return None
+                return
 
-            generate_lrc(song, file)
+            with downloader.stage("lrc", song):
+                generate_lrc(song, file, downloader.lyrics_cache)
             if lrc_file.exists():
                 logger.info("Saved lrc file for %s", song.display_name)
             else:
                 logger.info("Could not find lrc file for %s", song.display_name)
-        return None
 
-    async def pool_worker(file_path: Path) -> None:
-        async with downloader.semaphore:
-            # The following function calls blocking code, which would block whole event loop.
-            # Therefore it has to be called in a separate thread via ThreadPoolExecutor. This
-            # is not a problem, since GIL is released for the I/O operations, so it shouldn't
-            # hurt performance.
-            await downloader.loop.run_in_executor(None, process_file, file_path)
+        def process_file(file: Path):
+            # metadata of the file, url is present in the file.
+            song_meta = metadata[file]
+
+            # Check if song has metadata
+            # and if it has all the required fields
+            # if it has all of these fields, we can assume that the metadata is correct
+            if song_meta and not downloader.settings["force_update_metadata"]:
+                if (
+                    song_meta.get("artist")
+                    and song_meta.get("artists")
+                    and song_meta.get("name")
+                    and song_meta.get("lyrics")
+                    and song_meta.get("album_art")
+                ):
+                    logger.info("Song already has metadata: %s", file.name)
+                    if downloader.settings["generate_lrc"]:
+                        write_lrc(
+                            file,
+                            Song.from_missing_data(
+                                name=song_meta["name"],
+                                artists=song_meta["artists"],
+                                artist=song_meta["artist"],
+                            ),
+                        )
+
+                    return None
+
+            # Same as above
+            if (
+                not song_meta
+                or None
+                in [
+                    song_meta.get("name"),
+                    song_meta.get("album_art"),
+                    song_meta.get("artist"),
+                    song_meta.get("artists"),
+                    song_meta.get("track_number"),
+                ]
+                or downloader.settings["force_update_metadata"]
+            ):
+                # Song does not have metadata, or it is missing some fields
+                # or we are forcing update of metadata
+                logger.error(
+                    "Could not find metadata for %s. "
+                    "Spotify search is no longer available.",
+                    file.name,
+                )
+                return None
+
+            # Song has metadata, so we use it to reinitialize the song object
+            # and fill in the missing metadata
+            try:
+                song = reinit_song(Song.from_missing_data(**song_meta))
+            except QueryError:
+                logger.error("Could not find metadata for %s", file.name)
+                return None
+
+            # Check if the song has lyric
+            # if not use downloader to find lyrics
+            if song_meta.get("lyrics") is None:
+                logger.debug("Fetching lyrics for %s", song.display_name)
+                song.lyrics = downloader.search_lyrics(song)
+                if song.lyrics:
+                    logger.info("Found lyrics for song: %s", song.display_name)
+            else:
+                song.lyrics = song_meta.get("lyrics")
+
+            # Apply metadata to the song
+            with downloader.stage("embed", song):
+                write_metadata(file, song)
+
+            logger.info("Applied metadata to %s", file.name)
+            urls[file] = song.url
+            updated.append(file)
+
+            if downloader.settings["generate_lrc"]:
+                write_lrc(file, song)
+
+            return None
+
+        async def pool_worker(file_path: Path) -> None:
+            async with downloader.semaphore:
+                # The following function calls blocking code, which would block
+                # whole event loop. Therefore it has to be called in a separate
+                # thread via ThreadPoolExecutor. The tags themselves are
+                # written by the process pool.
+                try:
+                    await downloader.loop.run_in_executor(None, process_file, file_path)
+                finally:
+                    progress.advance()
 
-    tasks = [pool_worker(path) for path in paths]
+        tasks = [pool_worker(path) for path in paths]
 
-    # call all task asynchronously, and wait until all are finished
-    downloader.loop.run_until_complete(asyncio.gather(*tasks))
+        # call all task asynchronously, and wait until all are finished
+        downloader.loop.run_until_complete(asyncio.gather(*tasks))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    duration = time.perf_counter() - start
+    logger.info(
+        "Updated the metadata of %d of %d files in %.1fs (%.1f files/s)",
+        len(updated),
+        len(paths),
+        duration,
+        len(updated) / duration if duration else 0.0,
+    )
 
     # to re-download the local songs
     if downloader.settings["redownload"]:
-        songs_url: List[str] = []
-        for file in paths:
-            meta_data = get_file_metadata(
-                Path(file), downloader.settings["id3_separator"]
-            )
-            if meta_data and meta_data["url"]:
-                songs_url.append(meta_data["url"])
+        songs_url = [url for url in urls.values() if url]
 
         songs_list = parse_query(
             query=songs_url,
@@ -180,3 +284,141 @@ async def pool_worker(file_path: Path) -> None:
         )
 
         downloader.download_multiple_songs(songs_list)
+
+
+class _Progress:
+    """
+    Thread-safe counter that logs the progress at most every
+    `PROGRESS_INTERVAL` seconds and when it's done.
+    """
+
+    def __init__(self, action: str, total: int):
+        """
+        Initialize the counter.
+
+        ### Arguments
+        - action: Description of what is done to the files.
+        - total: The number of files.
+        """
+
+        self.action = action
+        self.total = total
+        self.done = 0
+        self.start = time.perf_counter()
+        self._logged = self.start
+        self._lock = threading.Lock()
+
+    def advance(self) -> None:
+        """
+        Count a file as done.
+        """
+
+        with self._lock:
+            self.done += 1
+            now = time.perf_counter()
+            if self.done < self.total and now - self._logged < PROGRESS_INTERVAL:
+                return
+
+            self._logged = now
+
+        duration = now - self.start
+        logger.info(
+            "%s %d/%d files (%.1f files/s)",
+            self.action,
+            self.done,
+            self.total,
+            self.done / duration if duration else 0.0,
+        )
+
+
+def _create_process_pool(
+    processes: Optional[int], files: int
+) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """
+    Create the pool of processes that read and write the tags.
+
+    ### Arguments
+    - processes: The number of processes, None for the number of CPUs
+        and 0 to read and write the tags on the threads.
+    - files: The number of files to process.
+
+    ### Returns
+    - The pool, or None if the tags are read and written on the threads.
+    """
+
+    if processes == 0 or files < 2:
+        return None
+
+    # Spawned processes don't inherit the locks held by the
+    # threads of the downloader, unlike forked ones
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(processes or os.cpu_count() or 1, files),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _read_metadata(
+    file: Path, id3_separator: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Read the metadata of a file, runs in the process pool.
+
+    ### Arguments
+    - file: The file.
+    - id3_separator: The separator used for the id3 tags.
+
+    ### Returns
+    - The metadata, with the album art replaced by whether the file has one,
+        so it isn't sent back to the main process, and the error if the
+        file couldn't be read.
+    """
+
+    try:
+        song_meta = get_file_metadata(file, id3_separator)
+    except Exception as exc:  # pylint: disable=broad-except
+        return None, str(exc)
+
+    if song_meta is not None and song_meta.get("album_art") is not None:
+        song_meta["album_art"] = bool(song_meta["album_art"])
+
+    return song_meta, None
+
+
+def _write_metadata(file: Path, song_data: Dict[str, Any], options: Dict) -> None:
+    """
+    Embed the metadata of a song in a file, runs in the process pool.
+
+    ### Arguments
+    - file: The file.
+    - song_data: The song as a dictionary.
+    - options: The `skip_album_art` and `cover_max_size` settings, and the
+        path and size of the cover cache or None if it's disabled.
+    """
+
+    cover_cache = None
+    if options["cover_cache"] is not None:
+        cover_cache = _get_cover_cache(*options["cover_cache"])
+
+    embed_metadata(
+        file,
+        Song.from_dict(song_data),
+        skip_album_art=options["skip_album_art"],
+        cover_cache=cover_cache,
+        cover_max_size=options["cover_max_size"],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_cover_cache(path: str, max_bytes: int) -> CoverCache:
+    """
+    Get the cover cache of the current process.
+
+    ### Arguments
+    - path: The folder of the cache.
+    - max_bytes: The maximum size of the stored covers.
+
+    ### Returns
+    - The cover cache, shared by the calls in this process.
+    """
+
+    return CoverCache(path, max_bytes)
@@ -0,0 +1,205 @@
+"""
+Serve module for the console.
+
+The daemon keeps the downloaders, their providers, caches and connection
+pools warm between jobs, which are submitted with `spotdl submit`.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Union, cast
+
+from spotdl.download.downloader import Downloader
+from spotdl.download.progress_handler import ProgressHandler, SongTracker
+from spotdl.types.options import DownloaderOptions
+from spotdl.utils.config import DOWNLOADER_OPTIONS
+from spotdl.utils.daemon import DaemonServer, JobContext
+
+__all__ = ["serve", "DOWNLOADER_CACHE_SIZE"]
+
+# Number of downloaders with different settings kept alive by the daemon
+DOWNLOADER_CACHE_SIZE = 4
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[..., None]
+
+
+class _JobLogHandler(logging.Handler):
+    """
+    Forwards the log records of a job to the client.
+    """
+
+    def __init__(self, context: JobContext):
+        """
+        Initialize the handler.
+
+        ### Arguments
+        - context: The connection to the client.
+        """
+
+        super().__init__()
+        self.context = context
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Send a log record to the client.
+
+        ### Arguments
+        - record: The log record.
+        """
+
+        # Progress is sent as separate progress messages
+        if record.name == "spotdl.download.progress_handler":
+            return
+
+        try:
+            self.context.log(record.levelname, self.format(record))
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+
+
+class _Daemon:
+    """
+    Runs the submitted jobs with cached downloaders.
+    """
+
+    def __init__(
+        self, downloader_settings: DownloaderOptions, operations: Dict[str, Operation]
+    ):
+        """
+        Initialize the daemon.
+
+        ### Arguments
+        - downloader_settings: The settings that the jobs overrides are applied to.
+        - operations: The operations the jobs can run, by name.
+        """
+
+        self.downloader_settings = downloader_settings
+        self.operations = operations
+        self.downloaders: "OrderedDict[str, Downloader]" = OrderedDict()
+
+    def get_downloader(self, overrides: Dict[str, Any]) -> Downloader:
+        """
+        Get a downloader for the settings of a job, creating it if needed.
+
+        ### Arguments
+        - overrides: The settings overrides of the job.
+
+        ### Returns
+        - The downloader.
+        """
+
+        settings = cast(
+            DownloaderOptions,
+            {
+                **self.downloader_settings,
+                **{
+                    key: value
+                    for key, value in overrides.items()
+                    if key in DOWNLOADER_OPTIONS and value is not None
+                },
+            },
+        )
+
+        fingerprint = json.dumps(settings, sort_keys=True, default=str)
+        downloader = self.downloaders.get(fingerprint)
+        if downloader is not None:
+            self.downloaders.move_to_end(fingerprint)
+            logger.debug("Reusing downloader")
+            return downloader
+
+        downloader = Downloader(settings)
+        self.downloaders[fingerprint] = downloader
+        if len(self.downloaders) > DOWNLOADER_CACHE_SIZE:
+            # Jobs run one after another, so the evicted downloader is idle
+            _, evicted = self.downloaders.popitem(last=False)
+            evicted.close()
+
+        return downloader
+
+    def close(self) -> None:
+        """
+        Close the cached downloaders.
+        """
+
+        while self.downloaders:
+            _, downloader = self.downloaders.popitem()
+            downloader.close()
+
+    def run_job(self, job: Dict[str, Any], context: JobContext) -> None:
+        """
+        Run a job submitted by a client.
+
+        ### Arguments
+        - job: The job message.
+        - context: The connection to the client.
+        """
+
+        operation = job.get("operation", "download")
+        if operation not in self.operations:
+            raise ValueError(f"Invalid operation: {operation}")
+
+        log_handler = _JobLogHandler(context)
+        log_handler.setFormatter(logging.Formatter("%(message)s"))
+        spotdl_logger = logging.getLogger("spotdl")
+        spotdl_logger.addHandler(log_handler)
+
+        previous_cwd = os.getcwd()
+
+        try:
+            # Relative paths in the query and settings are relative to the client
+            os.chdir(job.get("cwd") or previous_cwd)
+
+            logger.info("Running %s job: %s", operation, " ".join(job["query"]))
+            downloader = self.get_downloader(job.get("overrides", {}))
+
+            def song_update(tracker: SongTracker, message: str):
+                context.progress(tracker.song_name, tracker.progress, message)
+
+            # Fresh progress and errors for every job
+            downloader.progress_handler = ProgressHandler(
+                simple_tui=True, update_callback=song_update
+            )
+            downloader.errors = []
+
+            self.operations[operation](query=job["query"], downloader=downloader)
+        finally:
+            os.chdir(previous_cwd)
+            spotdl_logger.removeHandler(log_handler)
+
+
+def serve(
+    socket_path: Union[str, Path],
+    downloader_settings: DownloaderOptions,
+    operations: Dict[str, Operation],
+):
+    """
+    Run the daemon until it's interrupted.
+
+    ### Arguments
+    - socket_path: The path to the socket to listen on.
+    - downloader_settings: The default settings of the jobs.
+    - operations: The operations the jobs can run, by name.
+    """
+
+    downloader_settings["simple_tui"] = True
+    daemon = _Daemon(downloader_settings, operations)
+
+    with DaemonServer(socket_path, daemon.run_job) as server:
+        # Create the default downloader upfront, so that the first job starts instantly
+        daemon.get_downloader({})
+
+        logger.info("Listening for jobs on %s", socket_path)
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.close()
+
+    logger.info("Daemon stopped")
@@ -0,0 +1,57 @@
+"""
+Submit module for the console.
+
+Thin client that sends a job to the daemon started with `spotdl serve`
+and prints the progress streamed back by it.
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from spotdl.utils.daemon import submit_job
+
+__all__ = ["submit"]
+
+logger = logging.getLogger(__name__)
+
+
+def submit(
+    socket_path: Union[str, Path],
+    operation: str,
+    query: List[str],
+    overrides: Dict[str, Any],
+):
+    """
+    Submit a job to the daemon and print its progress.
+
+    ### Arguments
+    - socket_path: The path to the daemon socket.
+    - operation: The operation to run.
+    - query: The query of the operation.
+    - overrides: The settings passed on the command line.
+
+    ### Notes
+    - Exits with status 1 if the job failed.
+    """
+
+    last_status: Dict[str, str] = {}
+
+    for message in submit_job(socket_path, operation, query, overrides):
+        if message["type"] == "log":
+            logger.log(logging.getLevelName(message["level"]), message["message"])
+        elif message["type"] == "progress":
+            # Only print the changes of the status
+            if last_status.get(message["song"]) != message["message"]:
+                last_status[message["song"]] = message["message"]
+                logger.info("%s: %s", message["song"], message["message"])
+        elif message["type"] == "done":
+            if message["success"]:
+                return
+
+            logger.error("Job failed: %s", message["error"])
+            sys.exit(1)
+
+    logger.error("Connection to the daemon was closed before the job finished")
+    sys.exit(1)
@@ -9,7 +9,7 @@
 
 from spotdl.download.downloader import Downloader
 from spotdl.types.song import Song
-from spotdl.utils.formatter import create_file_name
+from spotdl.utils.formatter import FileNameTemplate
 from spotdl.utils.m3u import gen_m3u_files
 from spotdl.utils.search import parse_query
 
@@ -120,14 +120,16 @@ def sync(
             ],
         )
 
+        # Compiled once for all the songs of the sync file and the playlist
+        file_name_template = FileNameTemplate(
+            downloader.settings["output"], downloader.settings["restrict"]
+        )
+
         # Get the names and URLs of previously downloaded songs from the sync file
         old_files = []
         for entry in sync_data["songs"]:
-            file_name = create_file_name(
-                Song.from_dict(entry),
-                downloader.settings["output"],
-                downloader.settings["format"],
-                downloader.settings["restrict"],
+            file_name = file_name_template.create(
+                Song.from_dict(entry), downloader.settings["format"]
             )
 
             old_files.append((file_name, entry["url"]))
@@ -147,11 +149,8 @@ def sync(
                 else:
                     new_song = songs_playlist[new_urls.index(url)]
 
-                    new_path = create_file_name(
-                        Song.from_dict(new_song.json),
-                        downloader.settings["output"],
-                        downloader.settings["format"],
-                        downloader.settings["restrict"],
+                    new_path = file_name_template.create(
+                        Song.from_dict(new_song.json), downloader.settings["format"]
                     )
 
                     if path != new_path:
@@ -4,29 +4,27 @@
 
 import asyncio
 import datetime
+import functools
 import json
 import logging
 import re
 import shutil
 import sys
+import time
 import traceback
 from argparse import Namespace
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Type, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from yt_dlp.postprocessor.modify_chapters import ModifyChaptersPP
 from yt_dlp.postprocessor.sponsorblock import SponsorBlockPP
 
+from spotdl.download.lookup import LookupMixin
 from spotdl.download.progress_handler import ProgressHandler
-from spotdl.providers.audio import (
-    AudioProvider,
-    BandCamp,
-    Piped,
-    SoundCloud,
-    YouTube,
-    YouTubeMusic,
-)
-from spotdl.providers.lyrics import AzLyrics, Genius, LyricsProvider, MusixMatch, Synced
+from spotdl.providers.audio import AUDIO_PROVIDERS
+from spotdl.providers.audio.base import AudioProvider
+from spotdl.providers.lyrics import LYRICS_PROVIDERS
 from spotdl.types.options import DownloaderOptionalOptions, DownloaderOptions
 from spotdl.types.song import Song
 from spotdl.utils.archive import Archive
@@ -38,12 +36,17 @@
     get_temp_path,
     modernize_settings,
 )
+from spotdl.utils.cover_cache import CoverCache, get_cover_cache_path
 from spotdl.utils.ffmpeg import FFmpegError, convert, get_ffmpeg_path
-from spotdl.utils.formatter import create_file_name
-from spotdl.utils.lrc import generate_lrc
+from spotdl.utils.formatter import FileNameTemplate, get_file_name_template
+from spotdl.utils.http import configure_http_client
+from spotdl.utils.image import is_pillow_installed
 from spotdl.utils.m3u import gen_m3u_files
 from spotdl.utils.metadata import MetadataError, embed_metadata
+from spotdl.utils.metrics import RunMetrics
+from spotdl.utils.profiling import profile_stage
 from spotdl.utils.search import gather_known_songs, reinit_song
+from spotdl.utils.tracing import enable_tracing, get_tracer, span
 
 __all__ = [
     "AUDIO_PROVIDERS",
@@ -53,21 +56,6 @@
     "SPONSOR_BLOCK_CATEGORIES",
 ]
 
-AUDIO_PROVIDERS: Dict[str, Type[AudioProvider]] = {
-    "youtube": YouTube,
-    "youtube-music": YouTubeMusic,
-    "soundcloud": SoundCloud,
-    "bandcamp": BandCamp,
-    "piped": Piped,
-}
-
-LYRICS_PROVIDERS: Dict[str, Type[LyricsProvider]] = {
-    "genius": Genius,
-    "musixmatch": MusixMatch,
-    "azlyrics": AzLyrics,
-    "synced": Synced,
-}
-
 SPONSOR_BLOCK_CATEGORIES = {
     "sponsor": "Sponsor",
     "intro": "Intermission/Intro Animation",
@@ -79,7 +67,6 @@
     "music_offtopic": "Non-Music Section",
 }
 
-
 logger = logging.getLogger(__name__)
 
 
@@ -89,7 +76,7 @@ class DownloaderError(Exception):
     """
 
 
-class Downloader:
+class Downloader(LookupMixin):
     """
     Downloader class, this is where all the downloading pre/post processing happens etc.
     It handles the downloading/moving songs, multithreading, metadata embedding etc.
@@ -134,6 +121,19 @@ def __init__(
                 "No audio providers specified. Please specify at least one."
             )
 
+        for lyrics_provider in self.settings["lyrics_providers"]:
+            if lyrics_provider not in LYRICS_PROVIDERS:
+                raise DownloaderError(f"Invalid lyrics provider: {lyrics_provider}")
+
+        if "genius" in self.settings["lyrics_providers"] and not self.settings.get(
+            "genius_token"
+        ):
+            raise DownloaderError("Genius token not found in settings")
+
+        for audio_provider in self.settings["audio_providers"]:
+            if audio_provider not in AUDIO_PROVIDERS:
+                raise DownloaderError(f"Invalid audio provider: {audio_provider}")
+
         # If ffmpeg is the default value and it's not installed
         # try to use the spotdl's ffmpeg
         self.ffmpeg = self.settings["ffmpeg"]
@@ -152,12 +152,35 @@ def __init__(
             else asyncio.ProactorEventLoop()  # type: ignore
         )
 
+        # Loops passed in belong to the caller, they are not closed by `close`
+        self._owns_loop = loop is None
         if loop is None:
             asyncio.set_event_loop(self.loop)
 
         # semaphore is required to limit concurrent asyncio executions
         self.semaphore = asyncio.Semaphore(self.settings["threads"])
 
+        # Searches that run on the event loop, before the songs get a download slot
+        self.search_semaphore: Optional[asyncio.Semaphore] = None
+        if self.settings["search_concurrency"]:
+            self.search_semaphore = asyncio.Semaphore(
+                self.settings["search_concurrency"]
+            )
+
+        # Cache of the album art, shared by the songs of an album and between runs
+        self.cover_cache: Optional[CoverCache] = None
+        if self.settings["cover_cache"]:
+            self.cover_cache = CoverCache(
+                get_cover_cache_path(),
+                max_bytes=int(self.settings["cover_cache_size"] * 1024 * 1024),
+            )
+
+        if self.settings["cover_max_size"] and not is_pillow_installed():
+            logger.warning(
+                "--cover-max-size needs Pillow, install it with "
+                "`pip install spotdl[covers]`. Covers are embedded as they are"
+            )
+
         self.progress_handler = ProgressHandler(self.settings["simple_tui"])
 
         # Gather already present songs
@@ -181,40 +204,6 @@ def __init__(
 
         logger.debug("Found %s known songs", len(self.known_songs))
 
-        # Initialize lyrics providers
-        self.lyrics_providers: List[LyricsProvider] = []
-        for lyrics_provider in self.settings["lyrics_providers"]:
-            lyrics_class = LYRICS_PROVIDERS.get(lyrics_provider)
-            if lyrics_class is None:
-                raise DownloaderError(f"Invalid lyrics provider: {lyrics_provider}")
-            if lyrics_provider == "genius":
-                access_token = self.settings.get("genius_token")
-                if not access_token:
-                    raise DownloaderError("Genius token not found in settings")
-                self.lyrics_providers.append(Genius(access_token))
-            else:
-                self.lyrics_providers.append(lyrics_class())
-
-        # Initialize audio providers
-        self.audio_providers: List[AudioProvider] = []
-        for audio_provider in self.settings["audio_providers"]:
-            audio_class = AUDIO_PROVIDERS.get(audio_provider)
-            if audio_class is None:
-                raise DownloaderError(f"Invalid audio provider: {audio_provider}")
-
-            self.audio_providers.append(
-                audio_class(
-                    output_format=self.settings["format"],
-                    cookie_file=self.settings["cookie_file"],
-                    search_query=self.settings["search_query"],
-                    filter_results=self.settings["filter_results"],
-                    yt_dlp_args=self.settings["yt_dlp_args"],
-                )
-            )
-
-        # Initialize list of errors
-        self.errors: List[str] = []
-
         # Initialize proxy server
         proxy = self.settings["proxy"]
         proxies = None
@@ -228,6 +217,28 @@ def __init__(
             logger.info("Setting proxy server: %s", proxy)
 
         GlobalConfig.set_parameter("proxies", proxies)
+        GlobalConfig.set_parameter("piped_instances", self.settings["piped_instances"])
+        GlobalConfig.set_parameter(
+            "piped_hedge_delay", self.settings["piped_hedge_delay"]
+        )
+
+        # Size the shared connection pools to the number of concurrent downloads,
+        # providers created below share them
+        configure_http_client(pool_size=self.settings["threads"])
+
+        # Providers, threads and caches of the searches and lyrics lookups
+        self._init_lookups()
+
+        # Initialize list of errors
+        self.errors: List[str] = []
+
+        # Initialize run metrics
+        self.metrics = RunMetrics()
+
+        # Initialize span export
+        if self.settings["trace_file"]:
+            enable_tracing(self.settings["trace_file"])
+            logger.info("Writing trace to %s", self.settings["trace_file"])
 
         # Initialize archive
         self.url_archive = Archive()
@@ -276,12 +287,31 @@ def download_multiple_songs(
 
         self.progress_handler.set_song_count(len(songs))
 
+        # Start collecting metrics for this run
+        self.metrics = RunMetrics()
+
         # Create tasks list
         tasks = [self.pool_download(song) for song in songs]
 
         # Call all task asynchronously, and wait until all are finished
         results = list(self.loop.run_until_complete(asyncio.gather(*tasks)))
 
+        # Wait for the lrc files that are still being written
+        self.wait_for_lrc_files()
+
+        # Drop the prefetched results of songs that were skipped
+        self.prefetched_urls.clear()
+        self.prefetched_lyrics.clear()
+
+        # Print the run metrics
+        self.metrics.finish()
+        for line in self.metrics.format_summary():
+            logger.info(line)
+
+        if self.settings["metrics_file"]:
+            self.metrics.save(self.settings["metrics_file"])
+            logger.info("Saved metrics to %s", self.settings["metrics_file"])
+
         # Print errors
         if self.settings["print_errors"]:
             for error in self.errors:
@@ -329,6 +359,7 @@ def download_multiple_songs(
                 self.settings["restrict"],
                 False,
                 self.settings["detect_formats"],
+                {song.url: path for song, path in results if path and song.url},
             )
 
         # Save results to a file
@@ -354,61 +385,120 @@ async def pool_download(self, song: Song) -> Tuple[Song, Optional[Path]]:
         - This method calls `self.search_and_download` in a new thread.
         """
 
+        song_id = song.url or song.display_name
+        prefetch_time = 0.0
+
+        if self.search_semaphore is not None:
+            prefetch_start = time.perf_counter()
+            async with self.search_semaphore:
+                await self.prefetch(song)
+
+            prefetch_time = time.perf_counter() - prefetch_start
+
         # tasks that cannot acquire semaphore will wait here until it's free
         # only certain amount of tasks can acquire the semaphore at the same time
+        tracer = get_tracer()
+        queued_at = tracer.now() if tracer else 0
+
         async with self.semaphore:
+            if tracer:
+                started_at = tracer.now()
+                tracer.add_span(
+                    "semaphore_wait",
+                    queued_at,
+                    started_at,
+                    {"song_id": song_id},
+                    category="queue",
+                    asynchronous=True,
+                )
+
             if self.settings.get("delay"):
                 await asyncio.sleep(self.settings["delay"])
 
-            return await self.loop.run_in_executor(None, self.search_and_download, song)
+            start_time = time.perf_counter()
+            result = await self.loop.run_in_executor(
+                None, self.search_and_download, song
+            )
 
-    def search(self, song: Song) -> str:
-        """
-        Search for a song using all available providers.
+            self.metrics.record_song(
+                song_id,
+                time.perf_counter() - start_time + prefetch_time,
+                result[1] is not None,
+            )
 
-        ### Arguments
-        - song: The song to search for.
+            if tracer:
+                tracer.add_span(
+                    "song",
+                    started_at,
+                    tracer.now(),
+                    {
+                        "song_id": song_id,
+                        "outcome": "ok" if result[1] is not None else "failed",
+                    },
+                    category="song",
+                    asynchronous=True,
+                )
 
-        ### Returns
-        - tuple with download url and audio provider if successful.
-        """
+            return result
 
-        for audio_provider in self.audio_providers:
-            url = audio_provider.search(song, self.settings["only_verified_results"])
-            if url:
-                return url
+    @property
+    def file_name_template(self) -> FileNameTemplate:
+        """
+        Get the compiled output template, it's compiled again
+        only when the output settings change.
 
-            logger.debug("%s failed to find %s", audio_provider.name, song.display_name)
+        ### Returns
+        - The file name template.
+        """
 
-        raise LookupError(f"No results found for song: {song.display_name}")
+        return get_file_name_template(
+            self.settings["output"],
+            self.settings["restrict"],
+            self.settings["max_filename_length"],
+        )
 
-    def search_lyrics(self, song: Song) -> Optional[str]:
+    @contextmanager
+    def stage(self, name: str, song: Optional[Song] = None) -> Iterator[None]:
         """
-        Search for lyrics using all available providers.
+        Mark the code executed inside of the context manager as a stage,
+        for the profiler, the run metrics and the trace.
 
         ### Arguments
-        - song: The song to search for.
+        - name: The name of the stage.
+        - song: The song that is being processed, if any.
+        """
 
-        ### Returns
-        - lyrics if successful else None.
+        song_id = None if song is None else (song.url or song.display_name)
+        with (
+            profile_stage(name),
+            self.metrics.measure(name, song_id),
+            span(name, "stage", song_id=song_id),
+        ):
+            yield
+
+    def close(self) -> None:
         """
+        Release the threads, caches and event loop of the downloader.
 
-        for lyrics_provider in self.lyrics_providers:
-            lyrics = lyrics_provider.get_lyrics(song.name, song.artists)
-            if lyrics:
-                logger.debug(
-                    "Found lyrics for %s on %s", song.display_name, lyrics_provider.name
-                )
+        ### Notes
+        - Lrc files that were already submitted are still written, pending
+            lyrics lookups are cancelled.
+        - The event loop is only closed if the downloader created it.
+        - The downloader can't be used after it's closed.
+        """
 
-                return lyrics
+        self._close_lookups()
 
-            logger.debug(
-                "%s failed to find lyrics for %s",
-                lyrics_provider.name,
-                song.display_name,
-            )
+        if self.cover_cache is not None:
+            self.cover_cache.close()
 
-        return None
+        if self._owns_loop and not self.loop.is_closed():
+            if self.loop.is_running():
+                logger.debug(
+                    "Not closing the event loop of the downloader, it's running"
+                )
+            else:
+                self.loop.close()
 
     def search_and_download(  # pylint: disable=R0911
         self, song: Song
@@ -453,13 +543,7 @@ def search_and_download(  # pylint: disable=R0911
             song = reinit_song(song)
 
         # Create the output file path
-        output_file = create_file_name(
-            song=song,
-            template=self.settings["output"],
-            file_extension=self.settings["format"],
-            restrict=self.settings["restrict"],
-            file_name_length=self.settings["max_filename_length"],
-        )
+        output_file = self.file_name_template.create(song, self.settings["format"])
 
         if song.explicit is True and self.settings["skip_explicit"] is True:
             logger.info("Skipping explicit song: %s", song.display_name)
@@ -546,21 +630,12 @@ def search_and_download(  # pylint: disable=R0911
                             exc,
                         )
 
-            # Find song lyrics and add them to the song object
-            try:
-                lyrics = self.search_lyrics(song)
-                if lyrics is None:
-                    logger.debug(
-                        "No lyrics found for %s, lyrics providers: %s",
-                        song.display_name,
-                        ", ".join(
-                            [lprovider.name for lprovider in self.lyrics_providers]
-                        ),
-                    )
-                else:
-                    song.lyrics = lyrics
-            except Exception as exc:
-                logger.debug("Could not search for lyrics: %s", exc)
+            # Find song lyrics while the song is downloading,
+            # they are added to the song object before embedding the metadata
+            lyrics_future = self.lyrics_executor.submit(self.search_lyrics, song)
+            lyrics_deadline = None
+            if self.settings["lyrics_timeout"] is not None:
+                lyrics_deadline = time.monotonic() + self.settings["lyrics_timeout"]
 
             # If the file already exists and we want to overwrite the metadata,
             # we can skip the download
@@ -612,11 +687,15 @@ def search_and_download(  # pylint: disable=R0911
                     return song, None
 
                 # Update the metadata
-                embed_metadata(
-                    output_file=output_file,
-                    song=song,
-                    skip_album_art=self.settings["skip_album_art"],
-                )
+                self.wait_for_lyrics(song, lyrics_future, lyrics_deadline)
+                with self.stage("embed", song):
+                    embed_metadata(
+                        output_file=output_file,
+                        song=song,
+                        skip_album_art=self.settings["skip_album_art"],
+                        cover_cache=self.cover_cache,
+                        cover_max_size=self.settings["cover_max_size"],
+                    )
 
                 logger.info(
                     f"Updated metadata for {song.display_name}"
@@ -637,9 +716,9 @@ def search_and_download(  # pylint: disable=R0911
                 download_url = song.download_url
 
             # Initialize audio downloader
-            audio_downloader: Union[AudioProvider, Piped]
+            audio_downloader: AudioProvider
             if self.settings["audio_providers"][0] == "piped":
-                audio_downloader = Piped(
+                audio_downloader = AUDIO_PROVIDERS["piped"](
                     output_format=self.settings["format"],
                     cookie_file=self.settings["cookie_file"],
                     search_query=self.settings["search_query"],
@@ -662,9 +741,10 @@ def search_and_download(  # pylint: disable=R0911
                 display_progress_tracker.yt_dlp_progress_hook
             )
 
-            download_info = audio_downloader.get_download_metadata(
-                download_url, download=True
-            )
+            with self.stage("download", song):
+                download_info = audio_downloader.get_download_metadata(
+                    download_url, download=True
+                )
 
             # Use YouTube thumbnail as cover art if song has no cover_url
             if song.cover_url is None and download_info is not None:
@@ -692,6 +772,9 @@ def search_and_download(  # pylint: disable=R0911
                 temp_folder / f"{download_info['id']}.{download_info['ext']}"
             )
 
+            if temp_file.exists():
+                self.metrics.add_bytes(temp_file.stat().st_size)
+
             if download_info is None:
                 logger.debug(
                     "No download info found for %s, url: %s",
@@ -735,15 +818,17 @@ def search_and_download(  # pylint: disable=R0911
                     bitrate = str(self.settings["bitrate"])
 
                 # Convert the downloaded file to the output format
-                success, result = convert(
-                    input_file=temp_file,
-                    output_file=output_file,
-                    ffmpeg=self.ffmpeg,
-                    output_format=self.settings["format"],
-                    bitrate=bitrate,
-                    ffmpeg_args=self.settings["ffmpeg_args"],
-                    progress_handler=display_progress_tracker.ffmpeg_progress_hook,
-                )
+                with self.stage("convert", song):
+                    success, result = convert(
+                        input_file=temp_file,
+                        output_file=output_file,
+                        ffmpeg=self.ffmpeg,
+                        output_format=self.settings["format"],
+                        bitrate=bitrate,
+                        ffmpeg_args=self.settings["ffmpeg_args"],
+                        progress_handler=display_progress_tracker.ffmpeg_progress_hook,
+                        duration=song.duration,
+                    )
 
                 if self.settings["create_skip_file"]:
                     with open(
@@ -800,51 +885,61 @@ def search_and_download(  # pylint: disable=R0911
 
             # SponsorBlock post processor
             if self.settings["sponsor_block"]:
-                # Initialize the sponsorblock post processor
-                post_processor = SponsorBlockPP(
-                    audio_downloader.audio_handler, SPONSOR_BLOCK_CATEGORIES
-                )
+                with self.stage("sponsorblock", song):
+                    # Initialize the sponsorblock post processor
+                    post_processor = SponsorBlockPP(
+                        audio_downloader.audio_handler, SPONSOR_BLOCK_CATEGORIES
+                    )
 
-                # Run the post processor to get the sponsor segments
-                _, download_info = post_processor.run(download_info)
-                chapters = download_info["sponsorblock_chapters"]
+                    # Run the post processor to get the sponsor segments
+                    _, download_info = post_processor.run(download_info)
+                    chapters = download_info["sponsorblock_chapters"]
 
-                # If there are sponsor segments, remove them
-                if len(chapters) > 0:
-                    logger.info(
-                        "Removing %s sponsor segments for %s",
-                        len(chapters),
-                        song.display_name,
-                    )
+                    # If there are sponsor segments, remove them
+                    if len(chapters) > 0:
+                        logger.info(
+                            "Removing %s sponsor segments for %s",
+                            len(chapters),
+                            song.display_name,
+                        )
 
-                    # Initialize the modify chapters post processor
-                    modify_chapters = ModifyChaptersPP(
-                        downloader=audio_downloader.audio_handler,
-                        remove_sponsor_segments=SPONSOR_BLOCK_CATEGORIES,
-                    )
+                        # Initialize the modify chapters post processor
+                        modify_chapters = ModifyChaptersPP(
+                            downloader=audio_downloader.audio_handler,
+                            remove_sponsor_segments=SPONSOR_BLOCK_CATEGORIES,
+                        )
+
+                        # Run the post processor to remove the sponsor segments
+                        # this returns a list of files to delete
+                        files_to_delete, download_info = modify_chapters.run(
+                            download_info
+                        )
 
-                    # Run the post processor to remove the sponsor segments
-                    # this returns a list of files to delete
-                    files_to_delete, download_info = modify_chapters.run(download_info)
+                        # Delete the files that were created by the post processor
+                        for file_to_delete in files_to_delete:
+                            Path(file_to_delete).unlink()
 
-                    # Delete the files that were created by the post processor
-                    for file_to_delete in files_to_delete:
-                        Path(file_to_delete).unlink()
+            self.wait_for_lyrics(song, lyrics_future, lyrics_deadline)
 
             try:
-                embed_metadata(
-                    output_file,
-                    song,
-                    id3_separator=self.settings["id3_separator"],
-                    skip_album_art=self.settings["skip_album_art"],
-                )
+                with self.stage("embed", song):
+                    embed_metadata(
+                        output_file,
+                        song,
+                        id3_separator=self.settings["id3_separator"],
+                        skip_album_art=self.settings["skip_album_art"],
+                        cover_cache=self.cover_cache,
+                        cover_max_size=self.settings["cover_max_size"],
+                    )
             except Exception as exception:
                 raise MetadataError(
                     "Failed to embed metadata to the song"
                 ) from exception
 
-            if self.settings["generate_lrc"]:
-                generate_lrc(song, output_file)
+            if self.lrc_executor is not None:
+                lrc_future = self.lrc_executor.submit(self.write_lrc, song, output_file)
+                self.lrc_futures.add(lrc_future)
+                lrc_future.add_done_callback(functools.partial(self.on_lrc_done, song))
 
             display_progress_tracker.notify_complete()
 
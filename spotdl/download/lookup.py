@@ -0,0 +1,655 @@
+"""
+Lookup module, the searches and lyrics lookups of the downloader.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import time
+from pathlib import Path
+from typing import ContextManager, Dict, List, Optional, Set, Tuple, Union
+
+from spotdl.providers.audio.base import AudioProvider
+from spotdl.providers.lyrics.base import LyricsProvider
+from spotdl.providers.registry import get_provider_registry
+from spotdl.types.options import DownloaderOptions
+from spotdl.types.song import Song
+from spotdl.utils.circuit import CircuitOpenError
+from spotdl.utils.formatter import FileNameTemplate
+from spotdl.utils.lrc import generate_lrc
+from spotdl.utils.lyrics_cache import (
+    CachedLyrics,
+    LyricsCache,
+    get_lyrics_cache_path,
+)
+from spotdl.utils.metrics import RunMetrics
+from spotdl.utils.race import race, race_async
+from spotdl.utils.tracing import span
+
+__all__ = ["LookupMixin", "LRC_THREADS"]
+
+# Number of threads writing the lrc files, the lookups are mostly cached
+LRC_THREADS = 2
+
+logger = logging.getLogger(__name__)
+
+
+class LookupMixin:
+    """
+    Searches and lyrics lookups of the `Downloader`, blocking and on the event loop.
+    Holds the providers, the lyrics threads and the lyrics cache.
+    """
+
+    settings: DownloaderOptions
+    metrics: RunMetrics
+    errors: List[str]
+
+    @property
+    def file_name_template(self) -> FileNameTemplate:
+        """
+        Get the compiled output template, implemented by the downloader.
+
+        ### Returns
+        - The file name template.
+        """
+
+        raise NotImplementedError
+
+    def stage(self, name: str, song: Optional[Song] = None) -> ContextManager[None]:
+        """
+        Mark the code executed inside of the context manager as a stage,
+        implemented by the downloader.
+
+        ### Arguments
+        - name: The name of the stage.
+        - song: The song that is being processed, if any.
+        """
+
+        raise NotImplementedError
+
+    def _init_lookups(self) -> None:
+        """
+        Initialize the providers, the lyrics threads and the lyrics cache.
+
+        ### Notes
+        - The provider settings are validated by the downloader.
+        """
+
+        # Threads that look up the lyrics while the songs are downloading
+        self.lyrics_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.settings["threads"], thread_name_prefix="lyrics"
+        )
+
+        # Threads for racing the lyrics providers, losing calls
+        # keep running here without blocking the lyrics threads
+        self.lyrics_race_executor: Optional[concurrent.futures.ThreadPoolExecutor] = (
+            None
+        )
+        if self.settings["race_lyrics"]:
+            self.lyrics_race_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.settings["threads"]
+                * max(len(self.settings["lyrics_providers"]), 1),
+                thread_name_prefix="lyrics-race",
+            )
+
+        # Threads that write the lrc files after the songs are tagged
+        self.lrc_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if self.settings["generate_lrc"]:
+            self.lrc_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=LRC_THREADS, thread_name_prefix="lrc"
+            )
+
+        # Lrc files that are being written, they remove themselves when done
+        self.lrc_futures: Set[concurrent.futures.Future] = set()
+
+        # Persistent cache of the lyrics lookups
+        self.lyrics_cache: Optional[LyricsCache] = None
+        if self.settings["lyrics_cache"] and self.settings["lyrics_providers"]:
+            self.lyrics_cache = LyricsCache(
+                get_lyrics_cache_path(),
+                ttl=self.settings["lyrics_cache_ttl"] * 24 * 60 * 60,
+                negative_ttl=self.settings["lyrics_cache_negative_ttl"] * 24 * 60 * 60,
+            )
+        self.prefetched_urls: Dict[str, Optional[str]] = {}
+        self.prefetched_lyrics: Dict[str, Optional[str]] = {}
+        # Get the providers from the process-wide registry, downloaders
+        # with the same settings share them
+        registry = get_provider_registry()
+        circuit = None
+        if self.settings["circuit_failures"]:
+            circuit = (
+                self.settings["circuit_failures"],
+                self.settings["circuit_cooldown"],
+            )
+
+        # Initialize lyrics providers
+        self.lyrics_providers: List[LyricsProvider] = []
+        for lyrics_provider in self.settings["lyrics_providers"]:
+            if lyrics_provider == "genius":
+                self.lyrics_providers.append(
+                    registry.get(
+                        "lyrics",
+                        lyrics_provider,
+                        circuit,
+                        access_token=self.settings.get("genius_token"),
+                    )
+                )
+            else:
+                self.lyrics_providers.append(
+                    registry.get("lyrics", lyrics_provider, circuit)
+                )
+
+        # Initialize audio providers
+        self.audio_providers: List[AudioProvider] = []
+        for audio_provider in self.settings["audio_providers"]:
+            self.audio_providers.append(
+                registry.get(
+                    "audio",
+                    audio_provider,
+                    circuit,
+                    output_format=self.settings["format"],
+                    cookie_file=self.settings["cookie_file"],
+                    search_query=self.settings["search_query"],
+                    filter_results=self.settings["filter_results"],
+                    yt_dlp_args=self.settings["yt_dlp_args"],
+                )
+            )
+
+        # Report the state changes of the circuit breakers in the metrics,
+        # the breakers are shared so every downloader subscribes to them
+        self.providers: List[Union[LyricsProvider, AudioProvider]] = [
+            *self.lyrics_providers,
+            *self.audio_providers,
+        ]
+        for provider in self.providers:
+            if provider.circuit is not None:
+                provider.circuit.subscribe(self.on_circuit_change)
+
+    def _close_lookups(self) -> None:
+        """
+        Release the lyrics threads and the lyrics cache, and stop
+        reporting the circuit changes.
+        """
+
+        for provider in self.providers:
+            if provider.circuit is not None:
+                provider.circuit.unsubscribe(self.on_circuit_change)
+
+        self.lyrics_executor.shutdown(wait=False, cancel_futures=True)
+        if self.lyrics_race_executor is not None:
+            self.lyrics_race_executor.shutdown(wait=False, cancel_futures=True)
+
+        if self.lrc_executor is not None:
+            self.lrc_executor.shutdown(wait=True)
+            self.lrc_futures.clear()
+
+        if self.lyrics_cache is not None:
+            self.lyrics_cache.close()
+
+    def search(self, song: Song) -> str:
+        """
+        Search for a song using all available providers.
+
+        ### Arguments
+        - song: The song to search for.
+
+        ### Returns
+        - tuple with download url and audio provider if successful.
+        """
+
+        song_id = song.url or song.display_name
+        if song_id in self.prefetched_urls:
+            url = self.prefetched_urls.pop(song_id)
+            if url:
+                return url
+
+            raise LookupError(f"No results found for song: {song.display_name}")
+
+        error: Optional[Exception] = None
+        with self.stage("search", song):
+            for audio_provider in self.audio_providers:
+                if not self.circuit_allows(audio_provider):
+                    error = error or CircuitOpenError(
+                        f"{audio_provider.name} is failing, skipped searching for "
+                        f"{song.display_name}"
+                    )
+                    continue
+
+                try:
+                    url = audio_provider.search(
+                        song, self.settings["only_verified_results"]
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.debug(
+                        "%s failed to search for %s: %s",
+                        audio_provider.name,
+                        song.display_name,
+                        exc,
+                    )
+                    error = exc
+                    continue
+
+                if url:
+                    return url
+
+                logger.debug(
+                    "%s failed to find %s", audio_provider.name, song.display_name
+                )
+
+        # Surface the error if no provider could search for the song
+        if error is not None:
+            raise error
+
+        raise LookupError(f"No results found for song: {song.display_name}")
+
+    def search_lyrics(self, song: Song) -> Optional[str]:
+        """
+        Search for lyrics using all available providers.
+
+        ### Arguments
+        - song: The song to search for.
+
+        ### Returns
+        - lyrics if successful else None.
+        """
+
+        song_id = song.url or song.display_name
+        if song_id in self.prefetched_lyrics:
+            return self.prefetched_lyrics.pop(song_id)
+
+        cached = self.get_cached_lyrics(song)
+        if cached is not None:
+            return cached.lyrics
+
+        found: Optional[Tuple[str, str]] = None
+        complete = True
+        with self.stage("lyrics", song):
+            if self.lyrics_race_executor is not None:
+                providers = [
+                    provider
+                    for provider in self.lyrics_providers
+                    if self.circuit_allows(provider)
+                ]
+                complete = len(providers) == len(self.lyrics_providers)
+
+                found = race(
+                    [
+                        functools.partial(self._get_lyrics, provider, song)
+                        for provider in providers
+                    ],
+                    self.settings["race_lyrics_grace"],
+                    self.lyrics_race_executor,
+                )
+            else:
+                for lyrics_provider in self.lyrics_providers:
+                    if not self.circuit_allows(lyrics_provider):
+                        complete = False
+                        continue
+
+                    found = self._get_lyrics(lyrics_provider, song)
+                    if found:
+                        break
+
+        return self.cache_lyrics(song, found, complete)
+
+    def _get_lyrics(
+        self, lyrics_provider: LyricsProvider, song: Song
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Get the lyrics of a song from a single provider.
+
+        ### Arguments
+        - lyrics_provider: The lyrics provider.
+        - song: The song to search for.
+
+        ### Returns
+        - The name of the provider and the lyrics if successful else None.
+        """
+
+        lyrics = lyrics_provider.get_lyrics(song.name, song.artists)
+        if lyrics:
+            logger.debug(
+                "Found lyrics for %s on %s", song.display_name, lyrics_provider.name
+            )
+
+            return lyrics_provider.name, lyrics
+
+        logger.debug(
+            "%s failed to find lyrics for %s", lyrics_provider.name, song.display_name
+        )
+
+        return None
+
+    def get_cached_lyrics(self, song: Song) -> Optional[CachedLyrics]:
+        """
+        Get the lyrics of a song from the lyrics cache.
+
+        ### Arguments
+        - song: The song.
+
+        ### Returns
+        - The cached lookup, with `lyrics` set to None for songs that are known
+            to have no lyrics. None if the song isn't cached.
+        """
+
+        if self.lyrics_cache is None:
+            return None
+
+        cached = self.lyrics_cache.get(
+            song, providers=",".join(self.settings["lyrics_providers"])
+        )
+        if cached is not None:
+            logger.debug(
+                "Using cached lyrics lookup for %s (%s)",
+                song.display_name,
+                cached.provider or "no lyrics",
+            )
+
+        return cached
+
+    def cache_lyrics(
+        self, song: Song, found: Optional[Tuple[str, str]], complete: bool = True
+    ) -> Optional[str]:
+        """
+        Store the result of a lyrics lookup in the lyrics cache.
+
+        ### Arguments
+        - song: The song.
+        - found: The name of the provider and the lyrics, None if none were found.
+        - complete: Whether all providers were asked, misses of incomplete
+            lookups are not cached.
+
+        ### Returns
+        - The lyrics if found else None.
+        """
+
+        provider, lyrics = found or (None, None)
+        if self.lyrics_cache is not None and (lyrics or complete):
+            self.lyrics_cache.set(
+                song,
+                lyrics,
+                provider,
+                providers=",".join(self.settings["lyrics_providers"]),
+            )
+
+        return lyrics
+
+    def write_lrc(self, song: Song, output_file: Path) -> None:
+        """
+        Write the lrc file of a downloaded song, runs in the lrc threads.
+
+        ### Arguments
+        - song: The song.
+        - output_file: The path to the downloaded song.
+        """
+
+        try:
+            with self.stage("lrc", song):
+                generate_lrc(song, output_file, self.lyrics_cache)
+        except Exception as exception:  # pylint: disable=broad-except
+            logger.error(
+                "Failed to write the lrc file for %s: %s", song.display_name, exception
+            )
+            self.errors.append(
+                f"{song.url} - {exception.__class__.__name__}: {exception}"
+            )
+
+    def wait_for_lrc_files(self) -> None:
+        """
+        Wait until all submitted lrc files are written.
+        """
+
+        concurrent.futures.wait(self.lrc_futures.copy())
+
+    def on_lrc_done(self, song: Song, future: concurrent.futures.Future) -> None:
+        """
+        Called when the lrc file of a song is written, or failed to be written.
+
+        ### Arguments
+        - song: The song the lrc file is for.
+        - future: The future of the `write_lrc` call.
+        """
+
+        self.lrc_futures.discard(future)
+
+        # `write_lrc` reports its own errors, only unexpected ones end up here
+        exception = None if future.cancelled() else future.exception()
+        if exception is not None:
+            logger.error(
+                "Failed to write the lrc file for %s: %s", song.display_name, exception
+            )
+            self.errors.append(
+                f"{song.url} - {exception.__class__.__name__}: {exception}"
+            )
+
+    def wait_for_lyrics(
+        self,
+        song: Song,
+        lyrics_future: "concurrent.futures.Future[Optional[str]]",
+        deadline: Optional[float] = None,
+    ) -> None:
+        """
+        Wait for the lyrics lookup of a song and add the lyrics to the song object.
+
+        ### Arguments
+        - song: The song the lyrics were looked up for.
+        - lyrics_future: The future of the `search_lyrics` call.
+        - deadline: The `time.monotonic` time after which the song is
+            tagged without lyrics, None to wait for the lookup to finish.
+        """
+
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+
+        try:
+            with self.stage("lyrics_wait", song):
+                lyrics = lyrics_future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            lyrics_future.cancel()
+            logger.debug(
+                "Lyrics lookup for %s missed the deadline, continuing without lyrics",
+                song.display_name,
+            )
+            return
+        except Exception as exc:
+            logger.debug("Could not search for lyrics: %s", exc)
+            return
+
+        if lyrics is None:
+            logger.debug(
+                "No lyrics found for %s, lyrics providers: %s",
+                song.display_name,
+                ", ".join([lprovider.name for lprovider in self.lyrics_providers]),
+            )
+        else:
+            song.lyrics = lyrics
+
+    def on_circuit_change(self, name: str, state: str) -> None:
+        """
+        Record a state change of a circuit breaker in the metrics.
+
+        ### Arguments
+        - name: The name of the provider.
+        - state: The new state of the circuit.
+        """
+
+        self.metrics.record_circuit(name, state)
+
+    def circuit_allows(self, provider: Union[AudioProvider, LyricsProvider]) -> bool:
+        """
+        Check if the circuit breaker of a provider lets a call through.
+
+        ### Arguments
+        - provider: The audio or lyrics provider.
+
+        ### Returns
+        - False if the provider is failing and should be skipped.
+        """
+
+        if provider.circuit is None or provider.circuit.allow():
+            return True
+
+        self.metrics.record_circuit(provider.name, "rejected")
+        logger.debug("Skipping %s, it's failing", provider.name)
+
+        return False
+
+    async def search_async(self, song: Song) -> Optional[str]:
+        """
+        Search for a song using all available providers, on the event loop.
+
+        ### Arguments
+        - song: The song to search for.
+
+        ### Returns
+        - The download url if successful else None.
+        """
+
+        song_id = song.url or song.display_name
+        with (
+            self.metrics.measure("search", song_id),
+            span("search", "stage", asynchronous=True, song_id=song_id),
+        ):
+            error: Optional[Exception] = None
+            for audio_provider in self.audio_providers:
+                if not self.circuit_allows(audio_provider):
+                    error = error or CircuitOpenError(
+                        f"{audio_provider.name} is failing, skipped searching for "
+                        f"{song.display_name}"
+                    )
+                    continue
+
+                try:
+                    url = await audio_provider.search_async(
+                        song, self.settings["only_verified_results"]
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    error = exc
+                    continue
+
+                if url:
+                    return url
+
+                logger.debug(
+                    "%s failed to find %s", audio_provider.name, song.display_name
+                )
+
+        if error is not None:
+            raise error
+
+        return None
+
+    async def search_lyrics_async(self, song: Song) -> Optional[str]:
+        """
+        Search for lyrics using all available providers, on the event loop.
+
+        ### Arguments
+        - song: The song to search for.
+
+        ### Returns
+        - lyrics if successful else None.
+        """
+
+        cached = self.get_cached_lyrics(song)
+        if cached is not None:
+            return cached.lyrics
+
+        found: Optional[Tuple[str, str]] = None
+        complete = True
+        song_id = song.url or song.display_name
+        with (
+            self.metrics.measure("lyrics", song_id),
+            span("lyrics", "stage", asynchronous=True, song_id=song_id),
+        ):
+            if self.settings["race_lyrics"]:
+                providers = [
+                    provider
+                    for provider in self.lyrics_providers
+                    if self.circuit_allows(provider)
+                ]
+                complete = len(providers) == len(self.lyrics_providers)
+
+                found = await race_async(
+                    [self._get_lyrics_async(provider, song) for provider in providers],
+                    self.settings["race_lyrics_grace"],
+                )
+            else:
+                for lyrics_provider in self.lyrics_providers:
+                    if not self.circuit_allows(lyrics_provider):
+                        complete = False
+                        continue
+
+                    found = await self._get_lyrics_async(lyrics_provider, song)
+                    if found:
+                        break
+
+        return self.cache_lyrics(song, found, complete)
+
+    async def _get_lyrics_async(
+        self, lyrics_provider: LyricsProvider, song: Song
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Get the lyrics of a song from a single provider, on the event loop.
+
+        ### Arguments
+        - lyrics_provider: The lyrics provider.
+        - song: The song to search for.
+
+        ### Returns
+        - The name of the provider and the lyrics if successful else None.
+        """
+
+        lyrics = await lyrics_provider.get_lyrics_async(song.name, song.artists)
+        if lyrics:
+            return lyrics_provider.name, lyrics
+
+        logger.debug(
+            "%s failed to find lyrics for %s", lyrics_provider.name, song.display_name
+        )
+
+        return None
+
+    async def prefetch(self, song: Song) -> None:
+        """
+        Search for the song and its lyrics on the event loop, before the song
+        gets a download slot. The results are used by `search` and `search_lyrics`.
+
+        ### Arguments
+        - song: The song to search for.
+
+        ### Notes
+        - Songs that are missing metadata, already have a download url,
+            or that will be skipped because the file exists are not prefetched.
+        """
+
+        if song.download_url or not (song.name and (song.artists or song.artist)):
+            return None
+
+        if self.settings["overwrite"] == "skip":
+            try:
+                output_file = self.file_name_template.create(
+                    song, self.settings["format"]
+                )
+            except Exception:  # pylint: disable=broad-except
+                output_file = None
+
+            if output_file is not None and output_file.exists():
+                return None
+
+        song_id = song.url or song.display_name
+        url, lyrics = await asyncio.gather(
+            self.search_async(song),
+            self.search_lyrics_async(song),
+            return_exceptions=True,
+        )
+
+        # On errors the blocking search runs again in the download thread
+        if not isinstance(url, BaseException):
+            self.prefetched_urls[song_id] = url
+        else:
+            logger.debug("Prefetching %s failed: %s", song.display_name, url)
+
+        if not isinstance(lyrics, BaseException):
+            self.prefetched_lyrics[song_id] = lyrics
+
+        return None
@@ -1,20 +1,17 @@
 """
 Audio providers for spotdl.
+
+The providers are imported on first access, so that only
+the dependencies of the providers that are actually used get imported.
 """
 
-from spotdl.providers.audio.bandcamp import BandCamp
-from spotdl.providers.audio.base import (
-    ISRC_REGEX,
-    AudioProvider,
-    AudioProviderError,
-    YTDLLogger,
-)
-from spotdl.providers.audio.piped import Piped
-from spotdl.providers.audio.soundcloud import SoundCloud
-from spotdl.providers.audio.youtube import YouTube
-from spotdl.providers.audio.ytmusic import YouTubeMusic
+import importlib
+from typing import Any
+
+from spotdl.utils.lazy import LazyRegistry
 
 __all__ = [
+    "AUDIO_PROVIDERS",
     "YouTube",
     "YouTubeMusic",
     "SoundCloud",
@@ -25,3 +22,37 @@
     "YTDLLogger",
     "ISRC_REGEX",
 ]
+
+_LAZY_ATTRIBUTES = {
+    "YouTube": "spotdl.providers.audio.youtube",
+    "YouTubeMusic": "spotdl.providers.audio.ytmusic",
+    "SoundCloud": "spotdl.providers.audio.soundcloud",
+    "BandCamp": "spotdl.providers.audio.bandcamp",
+    "Piped": "spotdl.providers.audio.piped",
+    "AudioProvider": "spotdl.providers.audio.base",
+    "AudioProviderError": "spotdl.providers.audio.base",
+    "YTDLLogger": "spotdl.providers.audio.base",
+    "ISRC_REGEX": "spotdl.providers.audio.base",
+}
+
+AUDIO_PROVIDERS = LazyRegistry(
+    {
+        "youtube": "spotdl.providers.audio.youtube:YouTube",
+        "youtube-music": "spotdl.providers.audio.ytmusic:YouTubeMusic",
+        "soundcloud": "spotdl.providers.audio.soundcloud:SoundCloud",
+        "bandcamp": "spotdl.providers.audio.bandcamp:BandCamp",
+        "piped": "spotdl.providers.audio.piped:Piped",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the audio providers on first access.
+    """
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(importlib.import_module(module_name), name)
@@ -2,19 +2,62 @@
 BandCamp module for downloading and searching songs.
 """
 
+import concurrent.futures
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
-import requests
-
 from spotdl.providers.audio.base import AudioProvider
 from spotdl.types.result import Result
-from spotdl.utils.config import GlobalConfig
+from spotdl.utils.cache import TTLCache
+from spotdl.utils.http import get_http_client
+from spotdl.utils.metrics import register_cache
 
-__all__ = ["BandCamp"]
+__all__ = [
+    "BandCamp",
+    "MAX_DETAIL_FETCHES",
+    "TRALBUM_DETAILS_TTL",
+    "get_tralbum_details",
+]
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of track details fetched at the same time
+MAX_DETAIL_FETCHES = 8
+
+# Number of seconds the track details are cached for
+TRALBUM_DETAILS_TTL = 6 * 60 * 60
+
+_tralbum_details: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=2048, ttl=TRALBUM_DETAILS_TTL
+)
+register_cache("bandcamp-tralbum", _tralbum_details)
+
+
+def get_tralbum_details(band_id: int, track_id: int) -> Dict[str, Any]:
+    """
+    Get the details of a track, cached by band and track ID.
+
+    ### Arguments
+    - band_id: The BandCamp band ID.
+    - track_id: The BandCamp track ID.
+
+    ### Returns
+    - The tralbum details returned by the BandCamp mobile API.
+    """
+
+    def fetch() -> Dict[str, Any]:
+        response = get_http_client().get(
+            url="https://bandcamp.com/api/mobile/25/tralbum_details?band_id="
+            + str(band_id)
+            + "&tralbum_id="
+            + str(track_id)
+            + "&tralbum_type=t",
+        )
+
+        return response.json()
+
+    return _tralbum_details.get_or_set((band_id, track_id), fetch)
+
 
 class BandCampTrack:
     """
@@ -32,7 +75,7 @@ def __init__(self, artist_id: int, track_id: int):
         self.track_duration_seconds: float = 0.00
         self.track_streamable: Optional[bool] = None
         self.has_lyrics: Optional[bool] = None
-        self.lyrics: str = ""
+        self._lyrics: Optional[str] = None
         self.is_price_set: Optional[bool] = None
         self.price: dict = {}
         self.require_email: Optional[bool] = None
@@ -68,16 +111,7 @@ def __init__(self, artist_id: int, track_id: int):
         self.date_published_unix: int = 0
         self.supporters: list = []
 
-        response = requests.get(
-            url="https://bandcamp.com/api/mobile/25/tralbum_details?band_id="
-            + str(artist_id)
-            + "&tralbum_id="
-            + str(track_id)
-            + "&tralbum_type=t",
-            timeout=10,
-            proxies=GlobalConfig.get_parameter("proxies"),
-        )
-        result = response.json()
+        result = get_tralbum_details(artist_id, track_id)
         self.track_id = result["id"]
         self.track_title = result["title"]
         self.track_number = result["tracks"][0]["track_num"]
@@ -85,18 +119,6 @@ def __init__(self, artist_id: int, track_id: int):
         self.track_streamable = result["tracks"][0]["is_streamable"]
         self.has_lyrics = result["tracks"][0]["has_lyrics"]
 
-        # getting lyrics, if there is any
-        if self.has_lyrics is True:
-            resp = requests.get(
-                "https://bandcamp.com/api/mobile/25/tralbum_lyrics?tralbum_id="
-                + str(self.track_id)
-                + "&tralbum_type=t",
-                timeout=10,
-                proxies=GlobalConfig.get_parameter("proxies"),
-            )
-            rjson = resp.json()
-            self.lyrics = rjson["lyrics"][str(self.track_id)]
-
         self.is_price_set = result["is_set_price"]
         self.price = {"currency": result["currency"], "amount": result["price"]}
         self.require_email = result["require_email"]
@@ -126,6 +148,30 @@ def __init__(self, artist_id: int, track_id: int):
 
         self.track_url = result["bandcamp_url"]
 
+    @property
+    def lyrics(self) -> str:
+        """
+        Get the lyrics of the track, they are only fetched on first access.
+
+        ### Returns
+        - The lyrics, or an empty string if the track has none.
+        """
+
+        if self._lyrics is None:
+            self._lyrics = ""
+
+            # getting lyrics, if there is any
+            if self.has_lyrics is True:
+                resp = get_http_client().get(
+                    "https://bandcamp.com/api/mobile/25/tralbum_lyrics?tralbum_id="
+                    + str(self.track_id)
+                    + "&tralbum_type=t",
+                )
+                rjson = resp.json()
+                self._lyrics = rjson["lyrics"][str(self.track_id)]
+
+        return self._lyrics
+
 
 def search(search_string: str = ""):
     """
@@ -141,12 +187,10 @@ def search(search_string: str = ""):
     - A list of artist and track ids if found
     """
 
-    response = requests.get(
+    response = get_http_client().get(
         "https://bandcamp.com/api/fuzzysearch/2/app_autocomplete?q="
         + search_string
         + "&param_with_locations=true",
-        timeout=10,
-        proxies=GlobalConfig.get_parameter("proxies"),
     )
 
     results = response.json()["results"]
@@ -189,10 +233,22 @@ def get_results(self, search_term: str, *_args, **_kwargs) -> List[Result]:
             logger.error("Failed to get results from BandCamp", exc_info=exc)
             return []
 
-        simplified_results: List[Result] = []
-        for result in results:
-            track = BandCampTrack(int(result[0]), int(result[1]))
+        if not results:
+            return []
 
+        # Fetch the details of all tracks at the same time
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(results), MAX_DETAIL_FETCHES)
+        ) as executor:
+            tracks = list(
+                executor.map(
+                    lambda result: BandCampTrack(int(result[0]), int(result[1])),
+                    results,
+                )
+            )
+
+        simplified_results: List[Result] = []
+        for track in tracks:
             simplified_results.append(
                 Result(
                     source="bandcamp",
@@ -2,24 +2,39 @@
 Base audio provider module.
 """
 
+import asyncio
+import functools
 import logging
 import re
 import shlex
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Generator, List, Optional, Tuple, TypeVar
 
 from yt_dlp import YoutubeDL
 
 from spotdl.types.result import Result
 from spotdl.types.song import Song
+from spotdl.utils.circuit import CircuitBreaker
 from spotdl.utils.config import get_temp_path
 from spotdl.utils.formatter import (
     args_to_ytdlp_options,
     create_search_query,
     create_song_title,
 )
-from spotdl.utils.matching import get_best_matches, order_results
+from spotdl.utils.http import run_sync
+from spotdl.utils.matching import (
+    filter_candidates,
+    get_best_matches,
+    score_candidates,
+)
+from spotdl.utils.tracing import span, traced
 
-__all__ = ["AudioProviderError", "AudioProvider", "ISRC_REGEX", "YTDLLogger"]
+__all__ = [
+    "AudioProviderError",
+    "AudioProvider",
+    "AsyncAudioProvider",
+    "ISRC_REGEX",
+    "YTDLLogger",
+]
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +74,13 @@ def error(self, msg):
 
 ISRC_REGEX = re.compile(r"^[A-Z]{2}-?\w{3}-?\d{2}-?\d{5}$")
 
+# Provider call requested by the search steps: (method name, args, kwargs)
+SearchRequest = Tuple[str, Tuple[Any, ...], Dict[str, Any]]
+T = TypeVar("T")
+
+# Steps of a search that return a T, see `AudioProvider._search_steps`
+SearchSteps = Generator[SearchRequest, Any, T]
+
 
 class AudioProvider:
     """
@@ -69,6 +91,16 @@ class AudioProvider:
     SUPPORTS_ISRC: bool
     GET_RESULTS_OPTS: List[Dict[str, Any]]
 
+    # Whether `get_results_async` is implemented without the executor
+    NATIVE_ASYNC = False
+
+    # Whether `enrich_results` fills in fields that are too expensive to
+    # fetch for every search result
+    ENRICHES_RESULTS = False
+
+    # Circuit breaker that the searches report their outcome to, set by the downloader
+    circuit: Optional[CircuitBreaker] = None
+
     def __init__(
         self,
         output_format: str = "mp3",
@@ -148,6 +180,78 @@ def get_views(self, url: str) -> int:
 
         return data["view_count"]
 
+    def enrich_results(self, results: List[Result]) -> List[Result]:
+        """
+        Fill in the fields of the results that are too expensive to fetch
+        in `get_results`. Only called with the results that passed the
+        name, artists and duration filters, when `ENRICHES_RESULTS` is set.
+
+        ### Arguments
+        - results: The results to enrich.
+
+        ### Returns
+        - The enriched results, in the same order.
+        """
+
+        return results
+
+    async def get_results_async(self, search_term: str, **kwargs) -> List[Result]:
+        """
+        Get results from audio provider, on the running event loop.
+        Runs `get_results` in the default executor, providers with
+        native async support override this method.
+
+        ### Arguments
+        - search_term: The search term to use.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - A list of results.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.get_results, search_term, **kwargs)
+        )
+
+    async def get_views_async(self, url: str) -> int:
+        """
+        Get the number of views for a video, on the running event loop.
+
+        ### Arguments
+        - url: The url of the video.
+
+        ### Returns
+        - The number of views.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.get_views, url
+        )
+
+    async def enrich_results_async(self, results: List[Result]) -> List[Result]:
+        """
+        Fill in the fields of the results, on the running event loop.
+
+        ### Arguments
+        - results: The results to enrich.
+
+        ### Returns
+        - The enriched results, in the same order.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.enrich_results, results
+        )
+
+    @traced(
+        "audio_search",
+        "provider",
+        attributes=lambda self, song, *_, **__: {
+            "provider": self.name,
+            "song_id": song.url or song.display_name,
+        },
+        outcome=lambda url: "found" if url else "not_found",
+    )
     def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
         """
         Search for a song and return best match.
@@ -159,6 +263,92 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
         - The url of the best match or None if no match was found.
         """
 
+        try:
+            url = self._run_steps(self._search_steps(song, only_verified))
+        except Exception:
+            if self.circuit is not None:
+                self.circuit.record_failure()
+            raise
+
+        if self.circuit is not None:
+            self.circuit.record_success()
+
+        return url
+
+    async def search_async(
+        self, song: Song, only_verified: bool = False
+    ) -> Optional[str]:
+        """
+        Search for a song and return best match, on the running event loop.
+        Calls of providers without native async support run in the default executor.
+
+        ### Arguments
+        - song: The song to search for.
+
+        ### Returns
+        - The url of the best match or None if no match was found.
+        """
+
+        with span(
+            "audio_search",
+            "provider",
+            asynchronous=True,
+            provider=self.name,
+            song_id=song.url or song.display_name,
+        ) as attributes:
+            steps = self._search_steps(song, only_verified)
+            try:
+                request = next(steps)
+                while True:
+                    method, args, kwargs = request
+                    response = await getattr(self, f"{method}_async")(*args, **kwargs)
+                    request = steps.send(response)
+            except StopIteration as stop:
+                if self.circuit is not None:
+                    self.circuit.record_success()
+
+                attributes["outcome"] = "found" if stop.value else "not_found"
+                return stop.value
+            except Exception:
+                if self.circuit is not None:
+                    self.circuit.record_failure()
+                raise
+
+    def _run_steps(self, steps: SearchSteps[T]) -> T:
+        """
+        Run the steps of a search, calling the blocking provider methods.
+
+        ### Arguments
+        - steps: The generator with the steps.
+
+        ### Returns
+        - The return value of the generator.
+        """
+
+        try:
+            request = next(steps)
+            while True:
+                method, args, kwargs = request
+                request = steps.send(getattr(self, method)(*args, **kwargs))
+        except StopIteration as stop:
+            return stop.value
+
+    def _search_steps(
+        self, song: Song, only_verified: bool
+    ) -> SearchSteps[Optional[str]]:
+        """
+        Search for a song. Shared by the blocking and the async search, every
+        provider call is yielded as `(method name, args, kwargs)` and the
+        result of the call is sent back to the generator.
+
+        ### Arguments
+        - song: The song to search for.
+        - only_verified: Whether to only use verified results.
+
+        ### Returns
+        - The url of the best match or None if no match was found.
+        """
+
         # Create initial search query
         search_query = create_song_title(song.name, song.artists).lower()
         if self.search_query:
@@ -172,7 +362,7 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
 
         # search for song using isrc if it's available
         if song.isrc and self.SUPPORTS_ISRC and not self.search_query:
-            isrc_results = self.get_results(song.isrc)
+            isrc_results = yield ("get_results", (song.isrc,), {})
 
             if only_verified:
                 isrc_results = [result for result in isrc_results if result.verified]
@@ -202,8 +392,8 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
                 return isrc_results[0].url
 
             if len(isrc_results) > 0:
-                sorted_isrc_results = order_results(
-                    isrc_results, song, self.search_query
+                sorted_isrc_results = yield from self._order_results_steps(
+                    isrc_results, song
                 )
 
                 # get the best result, if the score is above 80 return it
@@ -233,7 +423,7 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
         for options in self.GET_RESULTS_OPTS:
             # Query YTM by songs only first, this way if we get correct result on the first try
             # we don't have to make another request
-            search_results = self.get_results(search_query, **options)
+            search_results = yield ("get_results", (search_query,), options)
 
             if only_verified:
                 search_results = [
@@ -269,7 +459,7 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
 
             if self.filter_results:
                 # Order results
-                new_results = order_results(search_results, song, self.search_query)
+                new_results = yield from self._order_results_steps(search_results, song)
             else:
                 new_results = {}
                 if len(search_results) > 0:
@@ -282,7 +472,9 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
             # we are almost 100% sure that this is the correct link
             if len(new_results) != 0:
                 # get the result with highest score
-                best_result, best_score = self.get_best_result(new_results)
+                best_result, best_score = yield from self._best_result_steps(
+                    new_results
+                )
                 logger.debug(
                     "[%s] Best result is %s with score %s",
                     song.song_id,
@@ -309,7 +501,7 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
             return None
 
         # get the result with highest score
-        best_result, best_score = self.get_best_result(results)
+        best_result, best_score = yield from self._best_result_steps(results)
         logger.debug(
             "[%s] Returning best result %s with score %s",
             song.song_id,
@@ -319,6 +511,29 @@ def search(self, song: Song, only_verified: bool = False) -> Optional[str]:
 
         return best_result.url
 
+    def _order_results_steps(
+        self, results: List[Result], song: Song
+    ) -> SearchSteps[Dict[Result, float]]:
+        """
+        Order the results, yields the `enrich_results` call
+        for the results that passed the filters.
+
+        ### Arguments
+        - results: The results to order.
+        - song: The song to order for.
+
+        ### Returns
+        - The results with their scores.
+        """
+
+        candidates = filter_candidates(results, song, self.search_query)
+
+        if self.ENRICHES_RESULTS and candidates:
+            enriched = yield ("enrich_results", (list(candidates),), {})
+            candidates = dict(zip(enriched, candidates.values()))
+
+        return score_candidates(candidates, song)
+
     def get_best_result(self, results: Dict[Result, float]) -> Tuple[Result, float]:
         """
         Get the best match from the results
@@ -331,6 +546,21 @@ def get_best_result(self, results: Dict[Result, float]) -> Tuple[Result, float]:
         - The best match URL and its score
         """
 
+        return self._run_steps(self._best_result_steps(results))
+
+    def _best_result_steps(
+        self, results: Dict[Result, float]
+    ) -> SearchSteps[Tuple[Result, float]]:
+        """
+        Get the best match from the results, yields the `get_views` calls.
+
+        ### Arguments
+        - results: A dictionary of results and their scores
+
+        ### Returns
+        - The best match URL and its score
+        """
+
         best_results = get_best_matches(results, 8)
 
         # If we have only one result, return it
@@ -354,7 +584,7 @@ def get_best_result(self, results: Dict[Result, float]) -> Tuple[Result, float]:
                 if best_result[0].views:
                     views.append(best_result[0].views)
                 else:
-                    views.append(self.get_views(best_result[0].url))
+                    views.append((yield ("get_views", (best_result[0].url,), {})))
 
             highest_views = max(views)
             lowest_views = min(views)
@@ -408,3 +638,41 @@ def name(self) -> str:
         """
 
         return self.__class__.__name__
+
+
+class AsyncAudioProvider(AudioProvider):
+    """
+    Base class for audio providers that search with async http requests.
+    Subclasses implement `get_results_async`, the blocking `get_results`
+    runs it on the shared event loop of `run_sync`.
+    """
+
+    NATIVE_ASYNC = True
+
+    def get_results(self, search_term: str, **kwargs) -> List[Result]:
+        """
+        Get results from audio provider.
+
+        ### Arguments
+        - search_term: The search term to use.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - A list of results.
+        """
+
+        return run_sync(self.get_results_async(search_term, **kwargs))
+
+    async def get_results_async(self, search_term: str, **kwargs) -> List[Result]:
+        """
+        Get results from audio provider, on the running event loop.
+
+        ### Arguments
+        - search_term: The search term to use.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - A list of results.
+        """
+
+        raise NotImplementedError
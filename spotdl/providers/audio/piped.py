@@ -4,30 +4,77 @@
 
 import logging
 import shlex
+import threading
 from typing import Any, Dict, List, Optional
 
-import requests
 from yt_dlp import YoutubeDL
 
 from spotdl.providers.audio.base import (
     ISRC_REGEX,
-    AudioProvider,
+    AsyncAudioProvider,
     AudioProviderError,
     YTDLLogger,
 )
 from spotdl.types.result import Result
 from spotdl.utils.config import GlobalConfig, get_temp_path
 from spotdl.utils.formatter import args_to_ytdlp_options
+from spotdl.utils.http import AsyncResponse, get_async_http_client, new_session
+from spotdl.utils.instance_pool import InstancePool, InstancePoolError
 
-__all__ = ["Piped"]
+__all__ = ["Piped", "DEFAULT_INSTANCES", "get_instance_pool"]
 logger = logging.getLogger(__name__)
 
 HEADERS = {
     "accept": "*/*",
 }
 
+# Instances used when the `piped_instances` setting is empty
+DEFAULT_INSTANCES = ["https://piped.video"]
 
-class Piped(AudioProvider):
+# Base of the urls of the results, the same whichever instance answered,
+# so that the urls stored in the songs and tags stay stable
+CANONICAL_URL = "https://piped.video"
+
+# Path requested by the health probe of the instances
+PROBE_PATH = "/healthcheck"
+
+_pool: Optional[InstancePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_instance_pool() -> InstancePool:
+    """
+    Get the pool of the Piped instances set in `GlobalConfig`,
+    shared by all Piped providers so that the health checks are only done once.
+
+    ### Returns
+    - The instance pool.
+    """
+
+    global _pool  # pylint: disable=global-statement
+
+    instances = [
+        instance.rstrip("/")
+        for instance in GlobalConfig.get_parameter("piped_instances")
+        or DEFAULT_INSTANCES
+    ]
+    hedge_delay = GlobalConfig.get_parameter("piped_hedge_delay")
+
+    with _pool_lock:
+        if (
+            _pool is None
+            or _pool.instances != instances
+            or _pool.hedge_delay != hedge_delay
+        ):
+            if _pool is not None:
+                _pool.close()
+
+            _pool = InstancePool(instances, PROBE_PATH, hedge_delay=hedge_delay)
+
+        return _pool
+
+
+class Piped(AsyncAudioProvider):
     """
     YouTube Music audio provider class
     """
@@ -85,9 +132,9 @@ def __init__(  # pylint: disable=super-init-not-called
             yt_dlp_options.update(user_options)
 
         self.audio_handler = YoutubeDL(yt_dlp_options)
-        self.session = requests.Session()
+        self.session = new_session()
 
-    def get_results(self, search_term: str, **kwargs) -> List[Result]:
+    async def get_results_async(self, search_term: str, **kwargs) -> List[Result]:
         """
         Get results from YouTube Music API and simplify them
 
@@ -106,12 +153,27 @@ def get_results(self, search_term: str, **kwargs) -> List[Result]:
         if params.get("filter") is None:
             params["filter"] = "music_videos"
 
-        response = self.session.get(
-            "https://piped.video/search",
-            params=params,
-            headers=HEADERS,
-            timeout=20,
-        )
+        async def search(instance: str) -> AsyncResponse:
+            response = await get_async_http_client().get(
+                f"{instance}/search",
+                params=params,
+                headers=HEADERS,
+                timeout=20,
+            )
+
+            if response.status_code >= 500:
+                raise AudioProviderError(
+                    f"{instance} answered with status {response.status_code}"
+                )
+
+            return response
+
+        try:
+            response = await get_instance_pool().call_async(search, hedge=True)
+        except InstancePoolError as exc:
+            raise AudioProviderError(
+                f"Failed to get results for {search_term} from Piped: {exc}"
+            ) from exc
 
         if response.status_code != 200:
             raise AudioProviderError(
@@ -131,7 +193,7 @@ def get_results(self, search_term: str, **kwargs) -> List[Result]:
             results.append(
                 Result(
                     source="piped",
-                    url=f"https://piped.video{result['url']}",
+                    url=f"{CANONICAL_URL}{result['url']}",
                     verified=kwargs.get("filter") == "music_songs",
                     name=result["title"],
                     duration=result["duration"],
@@ -161,35 +223,45 @@ def get_download_metadata(self, url: str, download: bool = False) -> Dict:
         """
 
         url_id = url.split("?v=")[1]
-        piped_response = requests.get(
-            f"https://piped.video/streams/{url_id}",
-            timeout=10,
-            proxies=GlobalConfig.get_parameter("proxies"),
-        )
 
-        if piped_response.status_code != 200:
-            raise AudioProviderError(
-                f"Failed to get metadata for {url} from Piped: {piped_response.text}"
-            )
+        def process(instance: str) -> Dict:
+            piped_response = self.session.get(f"{instance}/streams/{url_id}")
 
-        piped_data = piped_response.json()
+            if piped_response.status_code != 200:
+                raise AudioProviderError(
+                    f"Failed to get metadata for {url} from {instance}: "
+                    f"{piped_response.text}"
+                )
 
-        yt_dlp_json = {
-            "title": piped_data["title"],
-            "id": url_id,
-            "view_count": piped_data["views"],
-            "extractor": "Generic",
-            "formats": [],
-        }
+            piped_data = piped_response.json()
+
+            yt_dlp_json = {
+                "title": piped_data["title"],
+                "id": url_id,
+                "view_count": piped_data["views"],
+                "extractor": "Generic",
+                "formats": [],
+            }
+
+            for audio_stream in piped_data["audioStreams"]:
+                yt_dlp_json["formats"].append(
+                    {
+                        "url": audio_stream["url"],
+                        "ext": "webm" if audio_stream["codec"] == "opus" else "m4a",
+                        "abr": audio_stream["quality"].split(" ")[0],
+                        "filesize": audio_stream["contentLength"],
+                    }
+                )
 
-        for audio_stream in piped_data["audioStreams"]:
-            yt_dlp_json["formats"].append(
-                {
-                    "url": audio_stream["url"],
-                    "ext": "webm" if audio_stream["codec"] == "opus" else "m4a",
-                    "abr": audio_stream["quality"].split(" ")[0],
-                    "filesize": audio_stream["contentLength"],
-                }
+            return self.audio_handler.process_video_result(
+                yt_dlp_json, download=download
             )
 
-        return self.audio_handler.process_video_result(yt_dlp_json, download=download)
+        # The streams are proxied by the instance, so a failed download
+        # is retried with the streams of the next instance
+        try:
+            return get_instance_pool().call(process, hedge=not download)
+        except InstancePoolError as exc:
+            raise AudioProviderError(
+                f"Failed to get metadata for {url} from Piped: {exc}"
+            ) from exc
@@ -2,21 +2,28 @@
 SoundCloud module for downloading and searching songs.
 """
 
+import concurrent.futures
+import dataclasses
+import functools
 import logging
 import re
 from itertools import islice
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from soundcloud import SoundCloud as SoundCloudClient
 from soundcloud.resource.track import Track
 
 from spotdl.providers.audio.base import AudioProvider
 from spotdl.types.result import Result
+from spotdl.utils.metrics import register_cache
 
-__all__ = ["SoundCloud"]
+__all__ = ["SoundCloud", "MAX_ALBUM_LOOKUPS"]
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of album lookups running at the same time
+MAX_ALBUM_LOOKUPS = 8
+
 
 class SoundCloud(AudioProvider):
     """
@@ -24,6 +31,7 @@ class SoundCloud(AudioProvider):
     """
 
     SUPPORTS_ISRC = False
+    ENRICHES_RESULTS = True
     GET_RESULTS_OPTS: List[Dict[str, Any]] = [{}]
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -38,6 +46,10 @@ def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.client = SoundCloudClient()
 
+        # Albums are looked up per track, cache them across searches
+        self.get_album_name = functools.lru_cache(maxsize=1024)(self._get_album_name)
+        register_cache("soundcloud-albums", self.get_album_name)
+
     def get_results(self, search_term: str, *_args, **_kwargs) -> List[Result]:
         """
         Get results from slider.kz
@@ -51,14 +63,20 @@ def get_results(self, search_term: str, *_args, **_kwargs) -> List[Result]:
         - A list of slider.kz results if found, None otherwise.
         """
 
-        results = list(islice(self.client.search(search_term), 20))
         regex = r"^(.+?)-|(\(\w+[\s\S]*\))"
         # Because anyone can post on soundcloud, we do another search with an edited search
         # The regex removes anything in brackets and the artist(s)'s name(s) if in the name
         edited_search_term = re.sub(regex, "", search_term)
-        results.extend(list(islice(self.client.search(edited_search_term), 20)))
 
-        # Simplify results
+        # Run both searches at the same time
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            searches = [
+                executor.submit(self._search, term)
+                for term in (search_term, edited_search_term)
+            ]
+            results = [result for search in searches for result in search.result()]
+
+        # Simplify results, the albums are looked up in `enrich_results`
         simplified_results = []
         for result in results:
             if not isinstance(result, Track):
@@ -68,13 +86,6 @@ def get_results(self, search_term: str, *_args, **_kwargs) -> List[Result]:
             if "/preview/" in result.media.transcodings[0].url:
                 continue
 
-            album = self.client.get_track_albums(result.id)
-
-            try:
-                album_name = next(album).title
-            except StopIteration:
-                album_name = None
-
             simplified_results.append(
                 Result(
                     source="soundcloud",
@@ -88,8 +99,79 @@ def get_results(self, search_term: str, *_args, **_kwargs) -> List[Result]:
                     search_query=search_term,
                     views=result.playback_count,
                     explicit=False,
-                    album=album_name,
                 )
             )
 
         return simplified_results
+
+    def enrich_results(self, results: List[Result]) -> List[Result]:
+        """
+        Look up the albums of the results that passed the filters.
+
+        ### Arguments
+        - results: The results to enrich.
+
+        ### Returns
+        - The results with their album names.
+
+        ### Notes
+        - The album only counts towards the score of verified results,
+            so the other results are returned as they are.
+        """
+
+        to_lookup = [
+            result for result in results if result.verified and result.album is None
+        ]
+        if not to_lookup:
+            return results
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(to_lookup), MAX_ALBUM_LOOKUPS)
+        ) as executor:
+            albums = dict(
+                zip(
+                    to_lookup,
+                    executor.map(
+                        lambda result: self.get_album_name(int(result.result_id)),
+                        to_lookup,
+                    ),
+                )
+            )
+
+        return [
+            (
+                dataclasses.replace(result, album=albums[result])
+                if albums.get(result)
+                else result
+            )
+            for result in results
+        ]
+
+    def _search(self, search_term: str) -> List[Any]:
+        """
+        Get the first 20 search results from SoundCloud.
+
+        ### Arguments
+        - search_term: The search term to search for.
+
+        ### Returns
+        - A list of tracks, users and playlists.
+        """
+
+        return list(islice(self.client.search(search_term), 20))
+
+    def _get_album_name(self, track_id: int) -> Optional[str]:
+        """
+        Get the name of the first album a track is on.
+
+        ### Arguments
+        - track_id: The SoundCloud track ID.
+
+        ### Returns
+        - The album name, None if the track isn't on an album.
+        """
+
+        try:
+            return next(self.client.get_track_albums(track_id)).title
+        except StopIteration:
+            return None
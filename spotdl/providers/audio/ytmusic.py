@@ -9,6 +9,7 @@
 from spotdl.providers.audio.base import ISRC_REGEX, AudioProvider
 from spotdl.types.result import Result
 from spotdl.utils.formatter import parse_duration
+from spotdl.utils.http import new_session
 
 __all__ = ["YouTubeMusic"]
 
@@ -35,7 +36,7 @@ def __init__(self, *args: Any, **kwargs: Any) -> None:
 
         super().__init__(*args, **kwargs)
 
-        self.client = YTMusic(language="de")
+        self.client = YTMusic(language="de", requests_session=new_session())
 
     def get_results(self, search_term: str, **kwargs) -> List[Result]:
         """
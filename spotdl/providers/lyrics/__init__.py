@@ -1,11 +1,49 @@
 """
 Lyrics providers for spotdl.
+
+The providers are imported on first access, so that only
+the dependencies of the providers that are actually used get imported.
 """
 
-from spotdl.providers.lyrics.azlyrics import AzLyrics
-from spotdl.providers.lyrics.base import LyricsProvider
-from spotdl.providers.lyrics.genius import Genius
-from spotdl.providers.lyrics.musixmatch import MusixMatch
-from spotdl.providers.lyrics.synced import Synced
+import importlib
+from typing import Any
+
+from spotdl.utils.lazy import LazyRegistry
+
+__all__ = [
+    "LYRICS_PROVIDERS",
+    "AzLyrics",
+    "Genius",
+    "MusixMatch",
+    "Synced",
+    "LyricsProvider",
+]
+
+_LAZY_ATTRIBUTES = {
+    "AzLyrics": "spotdl.providers.lyrics.azlyrics",
+    "Genius": "spotdl.providers.lyrics.genius",
+    "MusixMatch": "spotdl.providers.lyrics.musixmatch",
+    "Synced": "spotdl.providers.lyrics.synced",
+    "LyricsProvider": "spotdl.providers.lyrics.base",
+}
+
+LYRICS_PROVIDERS = LazyRegistry(
+    {
+        "genius": "spotdl.providers.lyrics.genius:Genius",
+        "musixmatch": "spotdl.providers.lyrics.musixmatch:MusixMatch",
+        "azlyrics": "spotdl.providers.lyrics.azlyrics:AzLyrics",
+        "synced": "spotdl.providers.lyrics.synced:Synced",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the lyrics providers on first access.
+    """
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["AzLyrics", "Genius", "MusixMatch", "Synced", "LyricsProvider"]
+    return getattr(importlib.import_module(module_name), name)
@@ -3,16 +3,24 @@
 """
 
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import requests
-from bs4 import BeautifulSoup, Tag
 
-from spotdl.providers.lyrics.base import LyricsProvider
+from spotdl.providers.lyrics.base import LyricsProvider, LyricsProviderError
+from spotdl.utils.cache import RefreshingValue
+from spotdl.utils.html import ParseOnly, parse_html
+from spotdl.utils.http import new_session
 
 __all__ = ["AzLyrics"]
 logger = logging.getLogger(__name__)
-# mypy: disable-error-code="union-attr"
+
+# Number of seconds after which the x_code is refreshed in the background
+X_CODE_TTL = 60 * 60
+
+# Number of seconds a failure to get the x_code is remembered, so that
+# the searches meanwhile fail fast instead of fetching it again
+X_CODE_FAILURE_TTL = 5 * 60
 
 
 class AzLyrics(LyricsProvider):
@@ -23,7 +31,7 @@ class AzLyrics(LyricsProvider):
     def __init__(self):
         super().__init__()
 
-        self.session = requests.Session()
+        self.session = new_session()
         self.session.headers.update(
             {
                 "Host": "www.azlyrics.com",
@@ -45,7 +53,15 @@ def __init__(self):
             }
         )
 
-        self.x_code = self._get_x_code()
+        # The x_code takes two requests to get, so it's fetched in the background
+        # instead of blocking the creation of the provider
+        self.x_code = RefreshingValue(
+            "azlyrics-x-code",
+            self._get_x_code,
+            X_CODE_TTL,
+            failure_ttl=X_CODE_FAILURE_TTL,
+        )
+        self.x_code.refresh()
 
     def get_results(self, name: str, artists: List[str], **_) -> Dict[str, str]:
         """
@@ -58,20 +74,21 @@ def get_results(self, name: str, artists: List[str], **_) -> Dict[str, str]:
 
         ### Returns
         - A dictionary with the results. (The key is the title and the value is the url.)
-        """
 
-        if self.x_code is None:
-            self.x_code = self._get_x_code()
+        ### Errors
+        - LyricsProviderError if the x_code or the search page couldn't be fetched.
+        """
 
-        if self.x_code is None:
-            return {}
+        x_code = self.x_code.get()
+        if x_code is None:
+            raise LyricsProviderError("AZLyrics: Failed to get the x_code")
 
         params = {
             "q": f"{name.strip().replace(' ', '+')}+{artists[0].strip().replace(' ', '+')}",
-            "x": self.x_code,
+            "x": x_code,
         }
 
-        soup = None
+        page = None
         for i in range(4):  # Retry up to 4 times
             try:
                 response = self.session.get(
@@ -81,7 +98,7 @@ def get_results(self, name: str, artists: List[str], **_) -> Dict[str, str]:
                 if not response.ok:
                     continue
 
-                soup = BeautifulSoup(response.content, "html.parser")
+                page = response.content
                 break
 
             except requests.ConnectionError:
@@ -90,63 +107,96 @@ def get_results(self, name: str, artists: List[str], **_) -> Dict[str, str]:
                 )
                 continue
 
-        if soup is None:
-            return {}
+        if page is None:
+            raise LyricsProviderError("AZLyrics: Failed to get the search page")
 
-        td_tags = soup.find_all("td")
-        if len(td_tags) == 0:
-            return {}
+        return self.parse_results(page)
 
-        results = {}
-        for td_tag in td_tags:
+    def extract_lyrics(self, url: str, **_) -> Optional[str]:
+        """
+        Extracts the lyrics from the given url.
 
-            # Ensure td_tag is a Tag object before calling find_all
-            if not isinstance(td_tag, Tag):
-                continue
+        ### Arguments
+        - url: The url to extract the lyrics from.
+        - kwargs: Additional arguments.
 
-            a_tags = td_tag.find_all("a", href=True)
+        ### Returns
+        - The lyrics of the song or None if no lyrics were found.
+        """
 
-            if len(a_tags) == 0:
-                continue
+        response = self.session.get(url)
 
-            a_tag = a_tags[0]
-            url = a_tag.get("href", "").strip()
+        return self.parse_lyrics(response.content)
 
+    @staticmethod
+    def parse_results(
+        html: Union[str, bytes], backend: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Extracts the results from a search page.
+
+        ### Arguments
+        - html: The search page.
+        - backend: The html backend to use, None for the fastest installed one.
+
+        ### Returns
+        - A dictionary with the results. (The key is the title and the value is the url.)
+        """
+
+        page = parse_html(html, ParseOnly("td"), backend)
+
+        results = {}
+        for td_tag in page.select("td"):
+            a_tag = td_tag.select_one("a[href]")
+            if a_tag is None:
+                continue
+
+            url = a_tag.get("href").strip()
             if url == "":
                 continue
 
-            title = td_tag.find("span").get_text().strip()
-            artist = td_tag.find("b").get_text().strip()
+            title = td_tag.select_one("span")
+            artist = td_tag.select_one("b")
+            if title is None or artist is None:
+                continue
 
-            results[f"{artist} - {title}"] = url
+            results[f"{artist.text.strip()} - {title.text.strip()}"] = url
 
         return results
 
-    def extract_lyrics(self, url: str, **_) -> Optional[str]:
+    @staticmethod
+    def parse_lyrics(
+        html: Union[str, bytes], backend: Optional[str] = None
+    ) -> Optional[str]:
         """
-        Extracts the lyrics from the given url.
+        Extracts the lyrics from a lyrics page.
 
         ### Arguments
-        - url: The url to extract the lyrics from.
-        - kwargs: Additional arguments.
+        - html: The lyrics page.
+        - backend: The html backend to use, None for the fastest installed one.
 
         ### Returns
         - The lyrics of the song or None if no lyrics were found.
         """
 
-        response = self.session.get(url)
-        soup = BeautifulSoup(response.content, "html.parser")
+        page = parse_html(html, ParseOnly("div"), backend)
+
+        # The lyrics are in the first div without a class after the ringtone link
+        lyrics_div = page.select_one("div.ringtone ~ div:not([class]):not([id])")
 
-        # Find all divs that don't have a class
-        div_tags = soup.find_all("div", class_=False, id_=False)
+        if lyrics_div is None:
+            # Layout changed, fall back to the div without a class
+            # that has the longest text
+            div_tags = page.select("div:not([class])")
+            if not div_tags:
+                return None
 
-        # Find the div with the longest text
-        lyrics_div = sorted(div_tags, key=lambda x: len(x.text))[-1]
+            lyrics_div = max(div_tags, key=lambda div: len(div.text))
 
         # extract lyrics from div and clean it up
-        lyrics = lyrics_div.get_text().strip()
+        lyrics = lyrics_div.text.strip()
 
-        return lyrics
+        return lyrics or None
 
     def _get_x_code(self) -> Optional[str]:
         """
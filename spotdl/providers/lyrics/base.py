@@ -2,21 +2,55 @@
 Base module for all other lyrics providers.
 """
 
+import asyncio
+import functools
 import logging
 from typing import Dict, List, Optional
 
+from spotdl.utils.circuit import CircuitBreaker
 from spotdl.utils.formatter import ratio, slugify
+from spotdl.utils.http import run_sync
 from spotdl.utils.matching import based_sort
+from spotdl.utils.tracing import span, traced
 
-__all__ = ["LyricsProvider"]
+__all__ = [
+    "LyricsProvider",
+    "AsyncLyricsProvider",
+    "LyricsProviderError",
+    "traced_lyrics",
+]
 logger = logging.getLogger(__name__)
 
+# Decorator used for the `get_lyrics` methods of the lyrics providers
+traced_lyrics = traced(
+    "lyrics_search",
+    "provider",
+    attributes=lambda self, name, artists, *_, **__: {
+        "provider": self.name,
+        "song_id": f"{', '.join(artists)} - {name}",
+    },
+    outcome=lambda lyrics: "found" if lyrics else "not_found",
+)
+
+
+class LyricsProviderError(Exception):
+    """
+    Base class for all exceptions related to lyrics searching.
+    """
+
 
 class LyricsProvider:
     """
     Base class for all other lyrics providers.
     """
 
+    # Whether `get_results_async` and `extract_lyrics_async`
+    # are implemented without the executor
+    NATIVE_ASYNC = False
+
+    # Circuit breaker that the searches report their outcome to, set by the downloader
+    circuit: Optional[CircuitBreaker] = None
+
     def __init__(self):
         """
         Init the lyrics provider searchand set headers.
@@ -65,6 +99,7 @@ def extract_lyrics(self, url: str, **kwargs) -> Optional[str]:
 
         raise NotImplementedError
 
+    @traced_lyrics
     def get_lyrics(self, name: str, artists: List[str], **kwargs) -> Optional[str]:
         """
         Returns the lyrics for the given song.
@@ -87,8 +122,156 @@ def get_lyrics(self, name: str, artists: List[str], **kwargs) -> Optional[str]:
                 ", ".join(artists),
                 exc,
             )
+            self._record_outcome(False)
+            return None
+
+        url = self._pick_url(results, name, artists)
+        if url is None:
+            self._record_outcome(True)
+            return None
+
+        try:
+            lyrics = self.extract_lyrics(url, **kwargs)
+        except Exception as exc:
+            logger.debug(
+                "%s: Failed to extract lyrics from %s: %s", self.name, url, exc
+            )
+            self._record_outcome(False)
             return None
 
+        self._record_outcome(True)
+
+        return lyrics
+
+    async def get_results_async(
+        self, name: str, artists: List[str], **kwargs
+    ) -> Dict[str, str]:
+        """
+        Returns the results for the given song, on the running event loop.
+        Runs `get_results` in the default executor, providers with
+        native async support override this method.
+
+        ### Arguments
+        - name: The name of the song.
+        - artists: The artists of the song.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - A dictionary with the results. (The key is the title and the value is the url.)
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.get_results, name, artists, **kwargs)
+        )
+
+    async def extract_lyrics_async(self, url: str, **kwargs) -> Optional[str]:
+        """
+        Extracts the lyrics from the given url, on the running event loop.
+
+        ### Arguments
+        - url: The url to extract the lyrics from.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - The lyrics of the song or None if no lyrics were found.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.extract_lyrics, url, **kwargs)
+        )
+
+    async def get_lyrics_async(
+        self, name: str, artists: List[str], **kwargs
+    ) -> Optional[str]:
+        """
+        Returns the lyrics for the given song, on the running event loop.
+
+        ### Arguments
+        - name: The name of the song.
+        - artists: The artists of the song.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - The lyrics of the song or None if no lyrics were found.
+
+        ### Notes
+        - Providers that override `get_lyrics` run it in the default executor.
+        """
+
+        if type(self).get_lyrics is not LyricsProvider.get_lyrics:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(self.get_lyrics, name, artists, **kwargs)
+            )
+
+        with span(
+            "lyrics_search",
+            "provider",
+            asynchronous=True,
+            provider=self.name,
+            song_id=f"{', '.join(artists)} - {name}",
+        ) as attributes:
+            attributes["outcome"] = "not_found"
+
+            try:
+                results = await self.get_results_async(name, artists, **kwargs)
+            except Exception as exc:
+                logger.debug(
+                    "%s: Failed to get results for %s - %s: %s",
+                    self.name,
+                    name,
+                    ", ".join(artists),
+                    exc,
+                )
+                self._record_outcome(False)
+                return None
+
+            url = self._pick_url(results, name, artists)
+            if url is None:
+                self._record_outcome(True)
+                return None
+
+            try:
+                lyrics = await self.extract_lyrics_async(url, **kwargs)
+            except Exception as exc:
+                logger.debug(
+                    "%s: Failed to extract lyrics from %s: %s", self.name, url, exc
+                )
+                self._record_outcome(False)
+                return None
+
+            self._record_outcome(True)
+
+            if lyrics:
+                attributes["outcome"] = "found"
+
+            return lyrics
+
+    def _record_outcome(self, success: bool) -> None:
+        """
+        Report the outcome of a search to the circuit breaker, if there is one.
+
+        ### Arguments
+        - success: Whether the provider answered, even without lyrics.
+        """
+
+        if self.circuit is not None:
+            self.circuit.record(success)
+
+    def _pick_url(
+        self, results: Dict[str, str], name: str, artists: List[str]
+    ) -> Optional[str]:
+        """
+        Pick the result with the title that matches the song best.
+
+        ### Arguments
+        - results: The results of `get_results`.
+        - name: The name of the song.
+        - artists: The artists of the song.
+
+        ### Returns
+        - The url of the result or None if no result matches at least 55%.
+        """
+
         if not results:
             return None
 
@@ -115,13 +298,7 @@ def get_lyrics(self, name: str, artists: List[str], **kwargs) -> Optional[str]:
         if score < 55:
             return None
 
-        try:
-            return self.extract_lyrics(url, **kwargs)
-        except Exception as exc:
-            logger.debug(
-                "%s: Failed to extract lyrics from %s: %s", self.name, url, exc
-            )
-            return None
+        return url
 
     @property
     def name(self) -> str:
@@ -130,3 +307,73 @@ def name(self) -> str:
         """
 
         return self.__class__.__name__
+
+
+class AsyncLyricsProvider(LyricsProvider):
+    """
+    Base class for lyrics providers that use async http requests.
+    Subclasses implement `get_results_async` and `extract_lyrics_async`,
+    the blocking methods run them on the shared event loop of `run_sync`.
+    """
+
+    NATIVE_ASYNC = True
+
+    def get_results(self, name: str, artists: List[str], **kwargs) -> Dict[str, str]:
+        """
+        Returns the results for the given song.
+
+        ### Arguments
+        - name: The name of the song.
+        - artists: The artists of the song.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - A dictionary with the results. (The key is the title and the value is the url.)
+        """
+
+        return run_sync(self.get_results_async(name, artists, **kwargs))
+
+    def extract_lyrics(self, url: str, **kwargs) -> Optional[str]:
+        """
+        Extracts the lyrics from the given url.
+
+        ### Arguments
+        - url: The url to extract the lyrics from.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - The lyrics of the song or None if no lyrics were found.
+        """
+
+        return run_sync(self.extract_lyrics_async(url, **kwargs))
+
+    async def get_results_async(
+        self, name: str, artists: List[str], **kwargs
+    ) -> Dict[str, str]:
+        """
+        Returns the results for the given song, on the running event loop.
+
+        ### Arguments
+        - name: The name of the song.
+        - artists: The artists of the song.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - A dictionary with the results. (The key is the title and the value is the url.)
+        """
+
+        raise NotImplementedError
+
+    async def extract_lyrics_async(self, url: str, **kwargs) -> Optional[str]:
+        """
+        Extracts the lyrics from the given url, on the running event loop.
+
+        ### Arguments
+        - url: The url to extract the lyrics from.
+        - kwargs: Additional arguments.
+
+        ### Returns
+        - The lyrics of the song or None if no lyrics were found.
+        """
+
+        raise NotImplementedError
@@ -4,14 +4,18 @@
 
 from typing import Dict, List, Optional
 
-import requests
-from bs4 import BeautifulSoup
-
 from spotdl.providers.lyrics.base import LyricsProvider
 from spotdl.utils.config import GlobalConfig
+from spotdl.utils.html import ParseOnly, parse_html
+from spotdl.utils.http import new_session
 
 __all__ = ["Genius"]
 
+# The only parts of the song page that are needed
+LYRICS_ELEMENTS = ParseOnly(
+    "div", ("lyrics", "Lyrics__Container", "LyricsHeader__Container")
+)
+
 
 class Genius(LyricsProvider):
     """
@@ -33,7 +37,7 @@ def __init__(self, access_token: str):
             }
         )
 
-        self.session = requests.Session()
+        self.session = new_session()
         self.session.headers.update(self.headers)
 
     def get_results(self, name: str, artists: List[str], **_) -> Dict[str, str]:
@@ -87,7 +91,7 @@ def extract_lyrics(self, url: str, **_) -> Optional[str]:
         )
         url = song_response.json()["response"]["song"]["url"]
 
-        soup = None
+        page = None
         counter = 0
         while counter < 4:
             genius_page_response = self.session.get(
@@ -101,33 +105,45 @@ def extract_lyrics(self, url: str, **_) -> Optional[str]:
                 counter += 1
                 continue
 
-            soup = BeautifulSoup(
-                genius_page_response.text.replace("<br/>", "\n"), "html.parser"
-            )
+            page = genius_page_response.text
 
             break
 
-        if soup is None:
+        if page is None:
             return None
 
-        lyrics_div = soup.select_one("div.lyrics")
-        lyrics_container = soup.select("div[class^=Lyrics__Container]")
+        return self.parse_lyrics(page)
+
+    @staticmethod
+    def parse_lyrics(html: str, backend: Optional[str] = None) -> Optional[str]:
+        """
+        Extracts the lyrics from a song page.
+
+        ### Arguments
+        - html: The song page.
+        - backend: The html backend to use, None for the fastest installed one.
+
+        ### Returns
+        - The lyrics of the song or None if no lyrics were found.
+        """
+
+        page = parse_html(html.replace("<br/>", "\n"), LYRICS_ELEMENTS, backend)
 
         # As of Aug 2025, Genius has added a lyrics header div. Remove it if present.
         # <div data-exclude-from-selection="true"
         # class="LyricsHeader__Container-sc-5e4b7146-1 hFsUgC">
-        lyrics_header = soup.select_one("div[class^=LyricsHeader__Container]")
-
-        if lyrics_header:
-            lyrics_header.decompose()
+        page.remove("div[class^=LyricsHeader__Container]")
 
         # Get lyrics
+        lyrics_div = page.select_one("div.lyrics")
         if lyrics_div:
-            lyrics = lyrics_div.get_text()
-        elif lyrics_container:
-            lyrics = "\n".join(con.get_text() for con in lyrics_container)
+            lyrics = lyrics_div.text
         else:
-            return None
+            lyrics_container = page.select("div[class^=Lyrics__Container]")
+            if not lyrics_container:
+                return None
+
+            lyrics = "\n".join(con.text for con in lyrics_container)
 
         if not lyrics:
             return None
@@ -5,21 +5,19 @@
 from typing import Dict, List, Optional
 from urllib.parse import quote
 
-import requests
-from bs4 import BeautifulSoup
-
-from spotdl.providers.lyrics.base import LyricsProvider
-from spotdl.utils.config import GlobalConfig
+from spotdl.providers.lyrics.base import AsyncLyricsProvider
+from spotdl.utils.html import ParseOnly, parse_html
+from spotdl.utils.http import get_async_http_client
 
 __all__ = ["MusixMatch"]
 
 
-class MusixMatch(LyricsProvider):
+class MusixMatch(AsyncLyricsProvider):
     """
     MusixMatch lyrics provider class.
     """
 
-    def extract_lyrics(self, url: str, **_) -> Optional[str]:
+    async def extract_lyrics_async(self, url: str, **_) -> Optional[str]:
         """
         Extracts the lyrics from the given url.
 
@@ -31,20 +29,52 @@ def extract_lyrics(self, url: str, **_) -> Optional[str]:
         - The lyrics of the song or None if no lyrics were found.
         """
 
-        lyrics_resp = requests.get(
-            url,
-            headers=self.headers,
-            timeout=10,
-            proxies=GlobalConfig.get_parameter("proxies"),
-        )
+        lyrics_resp = await get_async_http_client().get(url, headers=self.headers)
 
-        lyrics_soup = BeautifulSoup(lyrics_resp.text, "html.parser")
-        lyrics_paragraphs = lyrics_soup.select("p.mxm-lyrics__content")
-        lyrics = "\n".join(i.get_text() for i in lyrics_paragraphs)
+        return self.parse_lyrics(lyrics_resp.text)
 
-        return lyrics
+    @staticmethod
+    def parse_lyrics(html: str, backend: Optional[str] = None) -> str:
+        """
+        Extracts the lyrics from a lyrics page.
 
-    def get_results(self, name: str, artists: List[str], **kwargs) -> Dict[str, str]:
+        ### Arguments
+        - html: The lyrics page.
+        - backend: The html backend to use, None for the fastest installed one.
+
+        ### Returns
+        - The lyrics of the song, empty if no lyrics were found.
+        """
+
+        page = parse_html(html, ParseOnly("p", ("mxm-lyrics__content",)), backend)
+        lyrics_paragraphs = page.select("p.mxm-lyrics__content")
+
+        return "\n".join(i.text for i in lyrics_paragraphs)
+
+    @staticmethod
+    def parse_results(html: str, backend: Optional[str] = None) -> Dict[str, str]:
+        """
+        Extracts the results from a search page.
+
+        ### Arguments
+        - html: The search page.
+        - backend: The html backend to use, None for the fastest installed one.
+
+        ### Returns
+        - A dictionary with the results. (The key is the title and the value is the url.)
+        """
+
+        page = parse_html(html, ParseOnly("a"), backend)
+
+        results: Dict[str, str] = {}
+        for tag in page.select("a[href^='/lyrics/']"):
+            results[tag.text] = "https://www.musixmatch.com" + tag.get("href")
+
+        return results
+
+    async def get_results_async(
+        self, name: str, artists: List[str], **kwargs
+    ) -> Dict[str, str]:
         """
         Returns the results for the given song.
 
@@ -71,17 +101,13 @@ def get_results(self, name: str, artists: List[str], **kwargs) -> Dict[str, str]
             query += "/tracks"
 
         search_url = f"https://www.musixmatch.com/search/{query}"
-        search_resp = requests.get(
-            search_url,
-            headers=self.headers,
-            timeout=10,
-            proxies=GlobalConfig.get_parameter("proxies"),
+        search_resp = await get_async_http_client().get(
+            search_url, headers=self.headers
         )
-        search_soup = BeautifulSoup(search_resp.text, "html.parser")
-        song_url_tag = search_soup.select("a[href^='/lyrics/']")
+        results = self.parse_results(search_resp.text)
 
-        if not song_url_tag:
-            # song_url_tag being None means no results were found on the
+        if not results:
+            # no results being found means there were none on the
             # All Results page, therefore, we use `track_search` to
             # search the tracks page.
 
@@ -89,12 +115,6 @@ def get_results(self, name: str, artists: List[str], **kwargs) -> Dict[str, str]
             if track_search:
                 return {}
 
-            return self.get_results(name, artists, track_search=True)
-
-        results: Dict[str, str] = {}
-        for tag in song_url_tag:
-            results[tag.get_text()] = "https://www.musixmatch.com" + str(
-                tag.get("href", "")
-            )
+            return await self.get_results_async(name, artists, track_search=True)
 
         return results
@@ -2,14 +2,14 @@
 Synced lyrics provider using the syncedlyrics library
 """
 
+import logging
 from typing import Dict, List, Optional
 
-import requests
-import syncedlyrics
-
-from spotdl.providers.lyrics.base import LyricsProvider
+from spotdl.providers.lyrics.base import LyricsProvider, traced_lyrics
+from spotdl.utils.lrc import search_synced_lyrics
 
 __all__ = ["Synced"]
+logger = logging.getLogger(__name__)
 
 
 class Synced(LyricsProvider):
@@ -47,6 +47,7 @@ def extract_lyrics(self, url: str, **kwargs) -> Optional[str]:
 
         raise NotImplementedError
 
+    @traced_lyrics
     def get_lyrics(self, name: str, artists: List[str], **kwargs) -> Optional[str]:
         """
         Try to get lyrics using syncedlyrics
@@ -58,21 +59,27 @@ def get_lyrics(self, name: str, artists: List[str], **kwargs) -> Optional[str]:
 
         ### Returns
         - The lyrics of the song or None if no lyrics were found.
+
+        ### Notes
+        - The outcome is reported to the circuit breaker like the
+            searches of the other providers.
         """
 
         try:
-            lyrics = syncedlyrics.search(
-                f"{name} - {artists[0]}",
-                synced_only=not kwargs.get("allow_plain_format", True),
+            lyrics = search_synced_lyrics(
+                name, artists, synced_only=not kwargs.get("allow_plain_format", True)
             )
-            return lyrics
-        except requests.exceptions.SSLError:
-            # Max retries reached
-            return None
-        except TypeError:
-            # Error at syncedlyrics.providers.musixmatch L89 -
-            #   Because `body` is occasionally an empty list instead of a dictionary.
-            # We get this error when allow_plain_format is set to True,
-            #   and there are no synced lyrics present
-            # Because its empty, we know there are no lyrics
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug(
+                "%s: Failed to get lyrics for %s - %s: %s",
+                self.name,
+                name,
+                ", ".join(artists),
+                exc,
+            )
+            self._record_outcome(False)
             return None
+
+        self._record_outcome(True)
+
+        return lyrics
@@ -0,0 +1,152 @@
+"""
+Module for the process-wide registry of provider instances.
+
+Creating a provider can be expensive (clients, sessions, scraped tokens), and
+every `Downloader` used to create its own. The registry creates each provider
+once per configuration and hands the same instance to every downloader that
+asks for it. The providers are already shared between the download threads
+of a single downloader, so sharing them between downloaders is safe.
+"""
+
+import threading
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from spotdl.providers.audio import AUDIO_PROVIDERS
+from spotdl.providers.lyrics import LYRICS_PROVIDERS
+from spotdl.utils.circuit import CircuitBreaker
+
+__all__ = ["ProviderRegistry", "get_provider_registry"]
+
+Fingerprint = Tuple[str, str, Tuple[Tuple[str, Hashable], ...], Optional[Tuple]]
+
+
+class ProviderRegistry:
+    """
+    Thread-safe registry that creates providers on first use and shares them.
+    """
+
+    def __init__(self, classes: Mapping[str, Mapping[str, Any]]):
+        """
+        Initialize the registry.
+
+        ### Arguments
+        - classes: Mapping of the kind of provider (`audio`, `lyrics`) to
+            the mapping of provider names to provider classes.
+        """
+
+        self.classes = classes
+        self._lock = threading.Lock()
+        self._providers: Dict[Fingerprint, Any] = {}
+        self._creating: Dict[Fingerprint, threading.Lock] = {}
+
+    @staticmethod
+    def fingerprint(
+        kind: str,
+        name: str,
+        options: Dict[str, Hashable],
+        circuit: Optional[Tuple[int, float]] = None,
+    ) -> Fingerprint:
+        """
+        Create the key of a provider configuration.
+
+        ### Arguments
+        - kind: The kind of provider.
+        - name: The name of the provider.
+        - options: The arguments the provider is created with.
+        - circuit: The failure threshold and cooldown of the circuit breaker.
+
+        ### Returns
+        - The fingerprint of the configuration.
+        """
+
+        return kind, name, tuple(sorted(options.items())), circuit
+
+    def get(
+        self,
+        kind: str,
+        name: str,
+        circuit: Optional[Tuple[int, float]] = None,
+        **options: Hashable,
+    ) -> Any:
+        """
+        Get the provider for a configuration, creating it on first use.
+
+        ### Arguments
+        - kind: The kind of provider, `audio` or `lyrics`.
+        - name: The name of the provider.
+        - circuit: The failure threshold and cooldown of the circuit breaker
+            to attach to the provider, None for no circuit breaker.
+        - options: The arguments to create the provider with.
+
+        ### Returns
+        - The provider.
+
+        ### Errors
+        - KeyError if there is no provider with this name.
+
+        ### Notes
+        - Concurrent requests for the same configuration wait for a single
+            provider to be created, different providers are created in parallel.
+        """
+
+        provider_class = self.classes[kind][name]
+        key = self.fingerprint(kind, name, options, circuit)
+
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is not None:
+                return provider
+
+            creating = self._creating.setdefault(key, threading.Lock())
+
+        with creating:
+            with self._lock:
+                provider = self._providers.get(key)
+                if provider is not None:
+                    return provider
+
+            provider = provider_class(**options)
+            if circuit is not None:
+                provider.circuit = CircuitBreaker(
+                    provider.name, failure_threshold=circuit[0], cooldown=circuit[1]
+                )
+
+            with self._lock:
+                self._providers[key] = provider
+                self._creating.pop(key, None)
+
+        return provider
+
+    def clear(self) -> None:
+        """
+        Forget all providers, the next requests create new ones.
+        """
+
+        with self._lock:
+            self._providers.clear()
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+
+_registry: Optional[ProviderRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """
+    Get the registry shared by the whole process.
+
+    ### Returns
+    - The registry of the audio and lyrics providers.
+    """
+
+    global _registry  # pylint: disable=global-statement
+
+    with _registry_lock:
+        if _registry is None:
+            _registry = ProviderRegistry(
+                {"audio": AUDIO_PROVIDERS, "lyrics": LYRICS_PROVIDERS}
+            )
+
+        return _registry
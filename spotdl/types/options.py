@@ -72,6 +72,23 @@ class DownloaderOptions(TypedDict):
     respect_skip_file: Optional[bool]
     sync_remove_lrc: Optional[bool]
     delay: Optional[float]
+    metrics_file: Optional[str]
+    trace_file: Optional[str]
+    search_concurrency: Optional[int]
+    piped_instances: Optional[List[str]]
+    piped_hedge_delay: Optional[float]
+    circuit_failures: int
+    circuit_cooldown: float
+    race_lyrics: bool
+    race_lyrics_grace: float
+    lyrics_timeout: Optional[float]
+    lyrics_cache: bool
+    lyrics_cache_ttl: float
+    lyrics_cache_negative_ttl: float
+    cover_cache: bool
+    cover_cache_size: float
+    cover_max_size: Optional[int]
+    meta_processes: Optional[int]
 
 
 class WebOptions(TypedDict):
@@ -153,6 +170,23 @@ class DownloaderOptionalOptions(TypedDict, total=False):
     respect_skip_file: Optional[bool]
     sync_remove_lrc: Optional[bool]
     delay: Optional[float]
+    metrics_file: Optional[str]
+    trace_file: Optional[str]
+    search_concurrency: Optional[int]
+    piped_instances: Optional[List[str]]
+    piped_hedge_delay: Optional[float]
+    circuit_failures: int
+    circuit_cooldown: float
+    race_lyrics: bool
+    race_lyrics_grace: float
+    lyrics_timeout: Optional[float]
+    lyrics_cache: bool
+    lyrics_cache_ttl: float
+    lyrics_cache_negative_ttl: float
+    cover_cache: bool
+    cover_cache_size: float
+    cover_max_size: Optional[int]
+    meta_processes: Optional[int]
 
 
 class WebOptionalOptions(TypedDict, total=False):
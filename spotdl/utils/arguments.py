@@ -9,14 +9,15 @@
 from typing import List
 
 from spotdl import _version
-from spotdl.download.downloader import AUDIO_PROVIDERS, LYRICS_PROVIDERS
+from spotdl.providers.audio import AUDIO_PROVIDERS
+from spotdl.providers.lyrics import LYRICS_PROVIDERS
 from spotdl.utils.ffmpeg import FFMPEG_FORMATS
 from spotdl.utils.formatter import VARS
 from spotdl.utils.logging import NAME_TO_LEVEL
 
 __all__ = ["OPERATIONS", "SmartFormatter", "parse_arguments"]
 
-OPERATIONS = ["download", "save", "web", "sync", "meta", "url"]
+OPERATIONS = ["download", "save", "web", "sync", "meta", "url", "serve", "submit"]
 
 
 class SmartFormatter(argparse.HelpFormatter):
@@ -60,7 +61,10 @@ def parse_main_options(parser: _ArgumentGroup):
             "web: Starts a web interface to simplify the download process.\n"
             "sync: Removes songs that are no longer present, downloads new ones\n"
             "meta: Update your audio files with metadata\n"
-            "url: Get the download URL for songs\n\n"
+            "url: Get the download URL for songs\n"
+            "serve: Starts a daemon that runs jobs submitted with `submit`.\n"
+            "submit: Runs an operation (download by default) in the daemon,\n"
+            "    e.g. `spotdl submit sync playlist.csv`\n\n"
         ),
     )
 
@@ -79,7 +83,8 @@ def parse_main_options(parser: _ArgumentGroup):
     )
 
     try:
-        is_web = sys.argv[1] == "web"
+        # The web interface and the daemon don't take a query
+        is_web = sys.argv[1] in ["web", "serve"]
     except IndexError:
         is_web = False
 
@@ -119,6 +124,127 @@ def parse_main_options(parser: _ArgumentGroup):
         ),
     )
 
+    parser.add_argument(
+        "--race-lyrics",
+        action="store_const",
+        const=True,
+        help=(
+            "Query all lyrics providers at the same time and use the first lyrics "
+            "found, preferring the providers in the order of `--lyrics`."
+        ),
+    )
+
+    parser.add_argument(
+        "--race-lyrics-grace",
+        type=float,
+        help=(
+            "Seconds the preferred lyrics providers get to answer after another "
+            "provider found lyrics, when racing them. (Default: 0.5)"
+        ),
+    )
+
+    parser.add_argument(
+        "--lyrics-timeout",
+        type=float,
+        help=(
+            "Maximum number of seconds to look for lyrics. The lookup runs while "
+            "the song downloads, songs are saved without lyrics if it takes longer."
+        ),
+    )
+
+    parser.add_argument(
+        "--no-lyrics-cache",
+        dest="lyrics_cache",
+        action="store_const",
+        const=False,
+        help=(
+            "Don't cache lyrics lookups. By default lyrics, and songs without "
+            "lyrics, are remembered so they aren't looked up again."
+        ),
+    )
+
+    parser.add_argument(
+        "--lyrics-cache-ttl",
+        type=float,
+        help="Number of days cached lyrics stay valid. (Default: 30)",
+    )
+
+    parser.add_argument(
+        "--lyrics-cache-negative-ttl",
+        type=float,
+        help=(
+            "Number of days a song without lyrics isn't looked up again. "
+            "(Default: 3)"
+        ),
+    )
+
+    parser.add_argument(
+        "--no-cover-cache",
+        dest="cover_cache",
+        action="store_const",
+        const=False,
+        help=(
+            "Don't cache album art. By default covers are kept on disk and "
+            "downloaded once for all the songs of an album."
+        ),
+    )
+
+    parser.add_argument(
+        "--cover-cache-size",
+        type=float,
+        help=(
+            "Maximum size of the album art cache in MB, the least recently used "
+            "covers are removed first. (Default: 256)"
+        ),
+    )
+
+    parser.add_argument(
+        "--cover-max-size",
+        type=int,
+        help=(
+            "Crop the album art to a square of at most this many pixels and "
+            "recompress it to JPEG, e.g. 600. Requires Pillow, "
+            "installed with `pip install spotdl[covers]`. "
+            "(Default: embed the album art as it is)"
+        ),
+    )
+
+    # Piped instances argument
+    parser.add_argument(
+        "--piped-instances",
+        nargs="+",
+        type=str,
+        help=(
+            "The Piped instances to use with the piped audio provider, "
+            "e.g. a self-hosted instance. Requests go to the fastest healthy "
+            "instance and fail over to the others."
+        ),
+    )
+
+    parser.add_argument(
+        "--piped-hedge-delay",
+        type=float,
+        help=(
+            "Seconds to wait for a Piped instance before also sending "
+            "the request to the next instance. (Disabled by default)"
+        ),
+    )
+
+    parser.add_argument(
+        "--circuit-failures",
+        type=int,
+        help=(
+            "Number of consecutive failures after which a provider is skipped "
+            "for the cooldown. 0 disables skipping failing providers."
+        ),
+    )
+
+    parser.add_argument(
+        "--circuit-cooldown",
+        type=float,
+        help="Seconds a failing provider is skipped for before it's tried again.",
+    )
+
     parser.add_argument(
         "--genius-access-token",
         dest="genius_token",
@@ -191,6 +317,16 @@ def parse_ffmpeg_options(parser: _ArgumentGroup):
         help="The number of threads to use when downloading songs.",
     )
 
+    # Add search concurrency argument
+    parser.add_argument(
+        "--search-concurrency",
+        type=int,
+        help=(
+            "Search for songs and lyrics on the event loop before downloading, "
+            "with up to this many songs at once. Not limited by --threads."
+        ),
+    )
+
     # Add constant bit rate argument
     parser.add_argument(
         "--bitrate",
@@ -493,6 +629,17 @@ def parse_output_options(parser: _ArgumentGroup):
         help="skip downloading album art for meta operation",
     )
 
+    # Processes for the meta operation
+    parser.add_argument(
+        "--meta-processes",
+        type=int,
+        help=(
+            "Number of processes that read and write the tags in the meta "
+            "operation, 0 to use threads instead. "
+            "(Default: the number of CPUs)"
+        ),
+    )
+
     # Ignore songs from a paticular album
     parser.add_argument(
         "--ignore-albums",
@@ -542,6 +689,27 @@ def parse_output_options(parser: _ArgumentGroup):
         help="Delay in seconds between song downloads to avoid rate limiting.",
     )
 
+    # Option to save run metrics to a file
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        help=(
+            "Save run metrics (stage timings, latency percentiles, throughput, "
+            "cache hit rates) to a JSON file"
+        ),
+    )
+
+    # Option to export spans to a trace file
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        help=(
+            "Write spans for each stage and provider call to a trace file. "
+            "Uses Chrome Trace Event JSON (open in Perfetto), "
+            "or OTLP-style JSON lines if the file ends with .jsonl"
+        ),
+    )
+
 
 def parse_web_options(parser: _ArgumentGroup):
     """
@@ -651,6 +819,26 @@ def parse_web_options(parser: _ArgumentGroup):
     )
 
 
+def parse_daemon_options(parser: _ArgumentGroup):
+    """
+    Parse daemon options from the command line.
+
+    ### Arguments
+    - parser: The argument parser to add the options to.
+    """
+
+    # Add socket argument
+    parser.add_argument(
+        "--socket",
+        dest="socket_path",
+        type=str,
+        help=(
+            "The Unix socket used by the serve and submit operations. "
+            "Defaults to spotdl.sock in the spotdl directory."
+        ),
+    )
+
+
 def parse_misc_options(parser: _ArgumentGroup):
     """
     Parse misc options from the command line.
@@ -711,7 +899,11 @@ def parse_other_options(parser: _ArgumentGroup):
     parser.add_argument(
         "--profile",
         action="store_true",
-        help="Run in profile mode. Useful for debugging.",
+        help=(
+            "Run in profile mode. Samples all threads and saves a per-stage report "
+            "to spotdl.profile and folded stacks to spotdl.profile.folded. "
+            "Useful for debugging."
+        ),
     )
 
     parser.add_argument(
@@ -758,6 +950,10 @@ def create_parser() -> ArgumentParser:
     web_options = parser.add_argument_group("Web options")
     parse_web_options(web_options)
 
+    # Parse daemon options
+    daemon_options = parser.add_argument_group("Daemon options")
+    parse_daemon_options(daemon_options)
+
     # Parse misc options
     misc_options = parser.add_argument_group("Misc options")
     parse_misc_options(misc_options)
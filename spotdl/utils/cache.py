@@ -0,0 +1,282 @@
+"""
+Module for in-memory caches that expire their entries.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+
+__all__ = ["CacheInfo", "TTLCache", "RefreshingValue"]
+
+T = TypeVar("T")
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache(Generic[T]):
+    """
+    Thread-safe LRU cache whose entries expire after a fixed time.
+    Has a `cache_info` method like `functools.lru_cache`, so it can be
+    registered with `spotdl.utils.metrics.register_cache`.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+
+        ### Arguments
+        - maxsize: The maximum number of entries, the least recently used
+            entry is dropped when the cache is full.
+        - ttl: The number of seconds an entry stays valid.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[T] = None) -> Optional[T]:
+        """
+        Get an entry from the cache.
+
+        ### Arguments
+        - key: The key of the entry.
+        - default: The value returned if the entry is missing or expired.
+
+        ### Returns
+        - The cached value or the default.
+        """
+
+        value = self._lookup(key)
+
+        return default if value is _MISSING else value
+
+    def set(self, key: Hashable, value: T, ttl: Optional[float] = None) -> None:
+        """
+        Add an entry to the cache.
+
+        ### Arguments
+        - key: The key of the entry.
+        - value: The value to cache.
+        - ttl: The number of seconds the entry stays valid,
+            defaults to the ttl of the cache.
+        """
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Get an entry from the cache, creating it if it's missing or expired.
+
+        ### Arguments
+        - key: The key of the entry.
+        - factory: Function that creates the value.
+
+        ### Returns
+        - The cached or created value.
+
+        ### Notes
+        - The factory runs outside of the lock, so concurrent misses
+            for the same key may create the value more than once.
+        """
+
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value  # type: ignore
+
+        value = factory()
+        self.set(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the counters.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get the statistics of the cache.
+
+        ### Returns
+        - Named tuple with the hits, misses, maxsize and currsize.
+        """
+
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            return entry is not None and entry[0] > time.monotonic()
+
+    def _lookup(self, key: Hashable) -> Any:
+        """
+        Look up an entry and update the counters.
+
+        ### Arguments
+        - key: The key of the entry.
+
+        ### Returns
+        - The cached value, or `_MISSING`.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return _MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+
+class RefreshingValue(Generic[T]):
+    """
+    Thread-safe holder of an expensive value, e.g. a token scraped from a page,
+    that is refreshed in the background when it gets old.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Optional[T]],
+        ttl: float,
+        failure_ttl: float = 60.0,
+    ):
+        """
+        Initialize the holder, nothing is fetched yet.
+
+        ### Arguments
+        - name: The name of the value, used in the logs.
+        - fetch: Function that fetches the value, returns None on failure.
+        - ttl: The number of seconds after which the value is refreshed.
+        - failure_ttl: The number of seconds a failed fetch is remembered,
+            `get` doesn't fetch the missing value again in the meantime.
+        """
+
+        self.name = name
+        self.fetch = fetch
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._fetched_at = 0.0
+        self._failed_at: Optional[float] = None
+        self._refresh: Optional[threading.Thread] = None
+
+    def get(self) -> Optional[T]:
+        """
+        Get the value. Fetches it if there is none yet (waiting for a running
+        refresh instead of starting another one), and starts a background
+        refresh if it's older than the ttl.
+
+        ### Returns
+        - The value, or None if it couldn't be fetched. After a failed fetch
+            None is returned without fetching again for `failure_ttl` seconds.
+        """
+
+        with self._lock:
+            value = self._value
+            now = time.monotonic()
+            stale = now - self._fetched_at >= self.ttl
+            failed = (
+                self._failed_at is not None and now - self._failed_at < self.failure_ttl
+            )
+
+        if value is None:
+            if failed:
+                return None
+
+            self.refresh()
+            with self._lock:
+                refresh = self._refresh
+
+            if refresh is not None:
+                refresh.join()
+
+            return self._value
+
+        if stale:
+            self.refresh()
+
+        return value
+
+    def refresh(self) -> None:
+        """
+        Refresh the value in a background thread, unless a refresh is running.
+        """
+
+        with self._lock:
+            if self._refresh is not None:
+                return
+
+            self._refresh = threading.Thread(
+                target=self._update, name=f"refresh-{self.name}", daemon=True
+            )
+            self._refresh.start()
+
+    def invalidate(self) -> None:
+        """
+        Drop the value, e.g. after it was rejected, so the next `get` fetches a new one.
+        """
+
+        with self._lock:
+            self._value = None
+            self._fetched_at = 0.0
+            self._failed_at = None
+
+    def _update(self) -> None:
+        """
+        Fetch the value, the old one is kept if fetching fails.
+        """
+
+        try:
+            value = self.fetch()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug("Failed to refresh %s: %s", self.name, exc)
+            value = None
+
+        with self._lock:
+            if value is not None:
+                self._value = value
+                self._fetched_at = time.monotonic()
+                self._failed_at = None
+            else:
+                self._failed_at = time.monotonic()
+
+            if self._refresh is threading.current_thread():
+                self._refresh = None
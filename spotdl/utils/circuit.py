@@ -0,0 +1,228 @@
+"""
+Module for circuit breakers that stop calling a failing provider.
+
+A circuit starts closed. After `failure_threshold` consecutive failures it
+opens, and calls are rejected until the cooldown has passed. Then a single
+call is let through (half-open): if it succeeds the circuit closes again,
+otherwise it opens for another cooldown.
+
+Circuits are shared by all the downloaders that use the same provider,
+every downloader subscribes to the state changes it wants to record.
+"""
+
+import inspect
+import logging
+import threading
+import time
+import weakref
+from typing import Callable, List, Optional
+
+__all__ = [
+    "CircuitOpenError",
+    "CircuitBreaker",
+    "CLOSED",
+    "OPEN",
+    "HALF_OPEN",
+]
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Listener = Callable[[str, str], None]
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a call is rejected because the circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for a single provider.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        cooldown: float = 60.0,
+        on_change: Optional[Listener] = None,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        ### Arguments
+        - name: The name of the provider, used in the logs.
+        - failure_threshold: The number of consecutive failures that open the circuit.
+        - cooldown: The number of seconds the circuit stays open.
+        - on_change: Function called with the name and the new state
+            every time the state changes, in addition to the subscribed listeners.
+        """
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.on_change = on_change
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._listeners: List["weakref.ref[Listener]"] = []
+
+    @property
+    def state(self) -> str:
+        """
+        Get the current state of the circuit.
+
+        ### Returns
+        - `closed`, `open` or `half_open`.
+        """
+
+        return self._state
+
+    def subscribe(self, listener: Listener) -> None:
+        """
+        Call a function on every state change, until it's unsubscribed
+        or garbage collected.
+
+        ### Arguments
+        - listener: Function called with the name and the new state.
+
+        ### Notes
+        - Only a weak reference to the listener is kept, so that the circuit
+            doesn't keep its owner alive.
+        """
+
+        ref: "weakref.ref[Listener]" = (
+            weakref.WeakMethod(listener)  # type: ignore
+            if inspect.ismethod(listener)
+            else weakref.ref(listener)
+        )
+
+        with self._lock:
+            if not any(other() == listener for other in self._listeners):
+                self._listeners.append(ref)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        """
+        Stop calling a function on the state changes.
+
+        ### Arguments
+        - listener: The subscribed function.
+        """
+
+        with self._lock:
+            self._listeners = [
+                ref
+                for ref in self._listeners
+                if ref() is not None and ref() != listener
+            ]
+
+    def allow(self) -> bool:
+        """
+        Check if a call may be made. When the cooldown has passed,
+        the first caller gets to make the half-open probe call.
+
+        ### Returns
+        - True if the call may be made.
+        """
+
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self._state == OPEN:
+                if now - self._opened_at < self.cooldown:
+                    return False
+
+                self._set_state(HALF_OPEN)
+                self._probe_started_at = now
+                return True
+
+            # Only one probe at a time, unless the probe never reported back
+            if (
+                self._probe_started_at is not None
+                and now - self._probe_started_at < self.cooldown
+            ):
+                return False
+
+            self._probe_started_at = now
+            return True
+
+    def record(self, success: bool) -> None:
+        """
+        Record the outcome of a call.
+
+        ### Arguments
+        - success: Whether the call succeeded.
+        """
+
+        if success:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closes the circuit.
+        """
+
+        with self._lock:
+            self._failures = 0
+            self._probe_started_at = None
+            if self._state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opens the circuit if the threshold is reached
+        or if the half-open probe failed.
+        """
+
+        with self._lock:
+            self._failures += 1
+            self._probe_started_at = None
+
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        """
+        Change the state and notify the listeners, has to be called with the lock held.
+
+        ### Arguments
+        - state: The new state.
+        """
+
+        self._state = state
+
+        if state == OPEN:
+            logger.warning(
+                "%s failed %d times in a row, skipping it for %ds",
+                self.name,
+                self._failures,
+                self.cooldown,
+            )
+        else:
+            logger.info("%s circuit is %s", self.name, state.replace("_", "-"))
+
+        if self.on_change is not None:
+            self.on_change(self.name, state)
+
+        listeners = [ref() for ref in self._listeners]
+        self._listeners = [
+            ref for ref, listener in zip(self._listeners, listeners) if listener
+        ]
+        for listener in listeners:
+            if listener is not None:
+                listener(self.name, state)
@@ -333,6 +333,23 @@ def get_parameter(cls, key):
     "respect_skip_file": False,
     "sync_remove_lrc": False,
     "delay": None,
+    "metrics_file": None,
+    "trace_file": None,
+    "search_concurrency": None,
+    "piped_instances": None,
+    "piped_hedge_delay": None,
+    "circuit_failures": 5,
+    "circuit_cooldown": 60.0,
+    "race_lyrics": False,
+    "race_lyrics_grace": 0.5,
+    "lyrics_timeout": None,
+    "lyrics_cache": True,
+    "lyrics_cache_ttl": 30.0,
+    "lyrics_cache_negative_ttl": 3.0,
+    "cover_cache": True,
+    "cover_cache_size": 256.0,
+    "cover_max_size": None,
+    "meta_processes": None,
 }
 
 WEB_OPTIONS: WebOptions = {
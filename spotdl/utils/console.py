@@ -8,7 +8,6 @@
 from spotdl.utils.config import DEFAULT_CONFIG, get_config_file
 from spotdl.utils.ffmpeg import download_ffmpeg as ffmpeg_download
 from spotdl.utils.ffmpeg import get_local_ffmpeg, is_ffmpeg_installed
-from spotdl.utils.github import check_for_updates as get_update_status
 
 __all__ = [
     "is_frozen",
@@ -83,6 +82,9 @@ def check_for_updates():
     Check for updates to the current version.
     """
 
+    # pylint: disable=import-outside-toplevel
+    from spotdl.utils.github import check_for_updates as get_update_status
+
     version_message = get_update_status()
 
     print(version_message)
@@ -0,0 +1,324 @@
+"""
+Module for the album art cache.
+
+Covers are stored on disk by the hash of their content, so a cover that is
+served under several urls is only stored once, and an index maps the urls to
+the hashes. The cache has a size budget in bytes, the least recently used
+covers are removed when it's exceeded. Concurrent fetches of the same url
+are coalesced into a single download.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Union
+
+from spotdl.utils.cache import TTLCache
+from spotdl.utils.config import get_spotdl_path
+from spotdl.utils.image import detect_mime
+from spotdl.utils.metrics import record_cache
+
+__all__ = ["CoverCache", "CoverImage", "get_cover_cache_path", "hash_cover"]
+
+# Number of covers that are also kept in memory
+MEMORY_COVERS = 32
+
+logger = logging.getLogger(__name__)
+
+
+class CoverImage(NamedTuple):
+    """
+    Cover image, the hash of its content and its MIME type.
+    """
+
+    data: bytes
+    digest: str
+    mime: str = "image/jpeg"
+
+
+def hash_cover(data: bytes) -> str:
+    """
+    Hash the content of a cover.
+
+    ### Arguments
+    - data: The image.
+
+    ### Returns
+    - The hex digest of the image.
+    """
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_cover_cache_path() -> Path:
+    """
+    Get the path to the cover cache folder.
+
+    ### Returns
+    - The path to the folder in the spotdl folder.
+    """
+
+    return get_spotdl_path() / "covers"
+
+
+class CoverCache:
+    """
+    Thread-safe, size-limited, content-addressed cache of cover images.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the cache, the folder is created on first use.
+
+        ### Arguments
+        - path: The folder to store the covers and the index in.
+        - max_bytes: The maximum size of the stored covers.
+        """
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._inflight: Dict[str, "Future[Optional[CoverImage]]"] = {}
+        self._memory: TTLCache[CoverImage] = TTLCache(MEMORY_COVERS, ttl=60 * 60)
+
+    def get(self, url: str) -> Optional[CoverImage]:
+        """
+        Get a cover from the cache.
+
+        ### Arguments
+        - url: The url of the cover.
+
+        ### Returns
+        - The cover or None if it isn't cached.
+        """
+
+        # Recorded by name instead of registering the memory cache,
+        # so the stats of all instances add up
+        cover = self._memory.get(url)
+        record_cache("covers-memory", cover is not None)
+        if cover is not None:
+            return cover
+
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT digest FROM urls WHERE url = ?", (url,)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE blobs SET last_used = ? WHERE digest = ?",
+                        (time.time(), row[0]),
+                    )
+                    connection.commit()
+        except sqlite3.Error as exc:
+            logger.debug("Failed to read the cover cache: %s", exc)
+            row = None
+
+        if row is not None:
+            try:
+                data = self._blob_path(row[0]).read_bytes()
+                cover = CoverImage(data, row[0], detect_mime(data))
+            except OSError:
+                cover = None
+
+        record_cache("covers", cover is not None)
+
+        if cover is not None:
+            self._memory.set(url, cover)
+
+        return cover
+
+    def set(self, url: str, data: bytes) -> CoverImage:
+        """
+        Add a cover to the cache.
+
+        ### Arguments
+        - url: The url of the cover.
+        - data: The image.
+
+        ### Returns
+        - The cover.
+        """
+
+        cover = CoverImage(data, hash_cover(data), detect_mime(data))
+        self._memory.set(url, cover)
+
+        try:
+            blob_path = self._blob_path(cover.digest)
+            with self._lock:
+                connection = self._connect()
+                if not blob_path.exists():
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                    temp_path = blob_path.with_suffix(f".{threading.get_ident()}.tmp")
+                    temp_path.write_bytes(data)
+                    os.replace(temp_path, blob_path)
+
+                now = time.time()
+                connection.execute(
+                    "INSERT OR REPLACE INTO blobs (digest, size, last_used) "
+                    "VALUES (?, ?, ?)",
+                    (cover.digest, len(data), now),
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)",
+                    (url, cover.digest),
+                )
+                connection.commit()
+
+                self._evict(connection)
+        except (sqlite3.Error, OSError) as exc:
+            logger.debug("Failed to write the cover cache: %s", exc)
+
+        return cover
+
+    def fetch(
+        self, url: str, download: Callable[[str], Optional[bytes]]
+    ) -> Optional[CoverImage]:
+        """
+        Get a cover from the cache, downloading it if it isn't cached.
+        Callers that ask for a url that is being downloaded wait
+        for that download instead of starting another one.
+
+        ### Arguments
+        - url: The url of the cover.
+        - download: Function that downloads the cover, returns None on failure.
+
+        ### Returns
+        - The cover or None if it couldn't be downloaded.
+        """
+
+        cover = self.get(url)
+        if cover is not None:
+            return cover
+
+        with self._lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if future is None:
+                # The download may have finished since the lookup
+                cover = self._memory.get(url)
+                if cover is not None:
+                    return cover
+
+                future = Future()
+                self._inflight[url] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            data = download(url)
+            cover = None if data is None else self.set(url, data)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.debug("Failed to download cover %s: %s", url, exc)
+            cover = None
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+
+        future.set_result(cover)
+
+        return cover
+
+    def size(self) -> int:
+        """
+        Get the size of the stored covers.
+
+        ### Returns
+        - The number of bytes.
+        """
+
+        with self._lock:
+            return (
+                self._connect()
+                .execute("SELECT COALESCE(SUM(size), 0) FROM blobs")
+                .fetchone()[0]
+            )
+
+    def close(self) -> None:
+        """
+        Close the index.
+        """
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _blob_path(self, digest: str) -> Path:
+        """
+        Get the path of a stored cover.
+
+        ### Arguments
+        - digest: The hash of the cover.
+
+        ### Returns
+        - The path, covers are spread over subfolders by the start of their hash.
+        """
+
+        return self.path / digest[:2] / digest
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """
+        Remove the least recently used covers until the cache fits
+        in its budget, has to be called with the lock held.
+
+        ### Arguments
+        - connection: The connection to the index.
+        """
+
+        total = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for digest, size in connection.execute(
+            "SELECT digest, size FROM blobs ORDER BY last_used"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+
+            self._blob_path(digest).unlink(missing_ok=True)
+            connection.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+            connection.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            total -= size
+
+        connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the index and create the tables, has to be called with the lock held.
+
+        ### Returns
+        - The connection.
+        """
+
+        if self._connection is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                str(self.path / "index.db"), check_same_thread=False, timeout=10
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                "digest TEXT PRIMARY KEY, "
+                "size INTEGER NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS urls ("
+                "url TEXT PRIMARY KEY, "
+                "digest TEXT NOT NULL)"
+            )
+            self._connection.commit()
+
+        return self._connection
@@ -0,0 +1,322 @@
+"""
+Module for the local daemon protocol.
+
+Jobs are submitted to the daemon over a Unix socket, so the daemon is not
+available on Windows. Every message is
+a single JSON object terminated by a newline:
+- The client sends one `job` message.
+- The daemon answers with any number of `log` and `progress` messages,
+    followed by one `done` message.
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from spotdl.utils.config import get_spotdl_path
+
+__all__ = [
+    "DaemonError",
+    "UNIX_SOCKETS",
+    "JobContext",
+    "DaemonServer",
+    "get_socket_path",
+    "send_message",
+    "read_messages",
+    "submit_job",
+]
+
+# Whether the platform supports Unix sockets, Windows doesn't
+UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonError(Exception):
+    """
+    Base class for all exceptions related to the daemon.
+    """
+
+
+def get_socket_path() -> Path:
+    """
+    Get the default path of the daemon socket.
+
+    ### Returns
+    - The path to the socket in the spotdl folder.
+    """
+
+    return get_spotdl_path() / "spotdl.sock"
+
+
+def _check_unix_sockets() -> None:
+    """
+    Check that the daemon can run on this platform.
+
+    ### Errors
+    - DaemonError if Unix sockets are not available.
+    """
+
+    if not UNIX_SOCKETS:
+        raise DaemonError(
+            "The daemon needs Unix sockets, which are not available on this "
+            "platform. Run the operations directly instead."
+        )
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """
+    Send a message over the socket.
+
+    ### Arguments
+    - sock: The socket to send the message over.
+    - message: The message to send, has to be serializable to JSON.
+    """
+
+    sock.sendall(json.dumps(message, default=str).encode("utf-8") + b"\n")
+
+
+def read_messages(sock: socket.socket) -> Iterator[Dict[str, Any]]:
+    """
+    Read messages from the socket until it's closed.
+
+    ### Arguments
+    - sock: The socket to read the messages from.
+
+    ### Returns
+    - Iterator of the received messages.
+    """
+
+    with sock.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+class JobContext:
+    """
+    Connection to the client that submitted a job.
+    """
+
+    def __init__(self, sock: socket.socket):
+        """
+        Initialize the job context.
+
+        ### Arguments
+        - sock: The client socket.
+        """
+
+        self.sock = sock
+        self.connected = True
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """
+        Send a message to the client. If the client disconnected,
+        the message is dropped and the job keeps running.
+
+        ### Arguments
+        - message: The message to send.
+        """
+
+        if not self.connected:
+            return
+
+        try:
+            send_message(self.sock, message)
+        except OSError:
+            self.connected = False
+
+    def log(self, level: str, message: str) -> None:
+        """
+        Send a log line to the client.
+
+        ### Arguments
+        - level: The name of the log level.
+        - message: The log message.
+        """
+
+        self.send({"type": "log", "level": level, "message": message})
+
+    def progress(self, song: str, progress: int, message: str) -> None:
+        """
+        Send a progress update to the client.
+
+        ### Arguments
+        - song: The display name of the song.
+        - progress: The progress of the song, from 0 to 100.
+        - message: The status message.
+        """
+
+        self.send(
+            {"type": "progress", "song": song, "progress": progress, "message": message}
+        )
+
+
+JobHandler = Callable[[Dict[str, Any], JobContext], None]
+
+
+class _JobRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Reads a job from the client and runs it with the handler of the server.
+    """
+
+    server: "DaemonServer"
+
+    def handle(self):
+        """
+        Run the job sent by the client, and tell it whether the job succeeded.
+        """
+
+        line = self.rfile.readline()
+        context = JobContext(self.request)
+
+        try:
+            job = json.loads(line)
+            if job.get("type") != "job":
+                raise DaemonError(f"Expected a job message, got: {job.get('type')}")
+
+            self.server.job_handler(job, context)
+        # Operations exit on some errors, that shouldn't stop the daemon
+        except (Exception, SystemExit) as exc:  # pylint: disable=broad-except
+            logger.exception("Job failed")
+            context.send(
+                {
+                    "type": "done",
+                    "success": False,
+                    "error": f"{exc.__class__.__name__}: {exc}",
+                }
+            )
+        else:
+            context.send({"type": "done", "success": True, "error": None})
+
+
+# socketserver only defines the Unix server where Unix sockets exist
+_ServerBase: Any = (
+    socketserver.UnixStreamServer if UNIX_SOCKETS else socketserver.BaseServer
+)
+
+
+class DaemonServer(_ServerBase):
+    """
+    Unix socket server that runs the submitted jobs one after another.
+    Clients that connect while a job is running wait in the listen backlog.
+    """
+
+    def __init__(self, socket_path: Union[str, Path], job_handler: JobHandler):
+        """
+        Bind the server to the socket.
+
+        ### Arguments
+        - socket_path: The path to the socket.
+        - job_handler: Function that runs a job, it's called with the job message
+            and the context used to send messages back to the client.
+
+        ### Notes
+        - A stale socket left over by a daemon that didn't exit cleanly is removed,
+            but a socket of a running daemon raises DaemonError.
+
+        ### Errors
+        - DaemonError if Unix sockets are not available, e.g. on Windows.
+        """
+
+        _check_unix_sockets()
+
+        self.socket_path = Path(socket_path)
+        self.job_handler = job_handler
+
+        if self.socket_path.exists():
+            if _is_listening(self.socket_path):
+                raise DaemonError(f"Daemon is already running on {self.socket_path}")
+
+            self.socket_path.unlink()
+
+        super().__init__(str(self.socket_path), _JobRequestHandler)
+
+        # Only the current user should be able to submit jobs
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self):
+        """
+        Close the server and remove its socket.
+        """
+
+        super().server_close()
+
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def _is_listening(socket_path: Path) -> bool:
+    """
+    Check if a daemon is listening on the socket.
+
+    ### Arguments
+    - socket_path: The path to the socket.
+
+    ### Returns
+    - True if a connection could be made.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+
+    return True
+
+
+def submit_job(
+    socket_path: Union[str, Path],
+    operation: str,
+    query: List[str],
+    overrides: Optional[Dict[str, Any]] = None,
+    cwd: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Submit a job to the daemon and stream back its messages.
+
+    ### Arguments
+    - socket_path: The path to the daemon socket.
+    - operation: The operation to run, e.g. `download`.
+    - query: The query of the operation, e.g. the CSV file path.
+    - overrides: Settings that override the settings of the daemon.
+    - cwd: The directory relative paths are resolved against,
+        defaults to the current directory.
+
+    ### Returns
+    - Iterator of the messages sent by the daemon, the last one is the `done` message.
+
+    ### Errors
+    - DaemonError if the daemon is not running or Unix sockets are not available.
+    """
+
+    _check_unix_sockets()
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError as exc:
+        sock.close()
+        raise DaemonError(
+            f"Could not connect to the daemon on {socket_path}. "
+            "Start it with `spotdl serve`."
+        ) from exc
+
+    with sock:
+        send_message(
+            sock,
+            {
+                "type": "job",
+                "operation": operation,
+                "query": query,
+                "overrides": overrides or {},
+                "cwd": cwd or os.getcwd(),
+            },
+        )
+
+        yield from read_messages(sock)
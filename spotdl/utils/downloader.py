@@ -2,8 +2,6 @@
 Module for functions related to downloading songs.
 """
 
-from spotdl.providers.audio import YouTubeMusic
-
 __all__ = ["check_ytmusic_connection"]
 
 
@@ -16,6 +14,9 @@ def check_ytmusic_connection() -> bool:
     - `False` if we can't connect to YouTube Music API
     """
 
+    # pylint: disable=import-outside-toplevel
+    from spotdl.providers.audio.ytmusic import YouTubeMusic
+
     # Check if we are getting results from YouTube Music
     ytm = YouTubeMusic()
     test_results = ytm.get_results("a")
@@ -3,6 +3,7 @@
 and checking for ffmpeg binary, and downloading it if not found.
 """
 
+import inspect
 import os
 import platform
 import re
@@ -10,13 +11,13 @@
 import shutil
 import stat
 import subprocess
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
-
-import requests
+from typing import IO, Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 from spotdl.utils.config import get_spotdl_path
-from spotdl.utils.formatter import to_ms
+from spotdl.utils.tracing import traced
 
 __all__ = [
     "FFMPEG_URLS",
@@ -25,6 +26,7 @@
     "TIME_REGEX",
     "VERSION_REGEX",
     "YEAR_REGEX",
+    "ERROR_LINES",
     "FFmpegError",
     "is_ffmpeg_installed",
     "get_ffmpeg_path",
@@ -69,6 +71,9 @@
 VERSION_REGEX = re.compile(r"ffmpeg version \w?(\d+\.)?(\d+)")
 YEAR_REGEX = re.compile(r"Copyright \(c\) \d\d\d\d\-\d\d\d\d")
 
+# Number of lines of the ffmpeg output kept for the error report
+ERROR_LINES = 100
+
 
 class FFmpegError(Exception):
     """
@@ -213,6 +218,9 @@ def download_ffmpeg() -> Path:
     - executable permission is set for ffmpeg binary.
     """
 
+    # pylint: disable=import-outside-toplevel
+    from spotdl.utils.http import get_http_client
+
     os_name = platform.system().lower()
     os_arch = platform.machine().lower()
     ffmpeg_url: Optional[str] = None
@@ -237,7 +245,7 @@ def download_ffmpeg() -> Path:
     )
 
     # Download binary and save it to a file in spotdl directory
-    ffmpeg_binary = requests.get(ffmpeg_url, allow_redirects=True, timeout=10).content
+    ffmpeg_binary = get_http_client().get(ffmpeg_url, allow_redirects=True).content
     with open(ffmpeg_path, "wb") as ffmpeg_file:
         ffmpeg_file.write(ffmpeg_binary)
 
@@ -248,6 +256,36 @@ def download_ffmpeg() -> Path:
     return ffmpeg_path
 
 
+def _convert_span_attributes(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Create the trace span attributes for a `convert` call.
+
+    ### Arguments
+    - args: The positional arguments of the call.
+    - kwargs: The keyword arguments of the call.
+
+    ### Returns
+    - The attributes, with the defaults of `convert` filled in.
+    """
+
+    call = inspect.signature(convert).bind(*args, **kwargs)
+    call.apply_defaults()
+
+    return {
+        "input_file": str(call.arguments["input_file"]),
+        "output_file": str(call.arguments["output_file"]),
+        "ffmpeg": call.arguments["ffmpeg"],
+        "output_format": call.arguments["output_format"],
+        "bitrate": call.arguments["bitrate"],
+    }
+
+
+@traced(
+    "ffmpeg_convert",
+    "ffmpeg",
+    attributes=_convert_span_attributes,
+    outcome=lambda result: "ok" if result[0] else "failed",
+)
 def convert(
     input_file: Union[Path, Tuple[str, str]],
     output_file: Path,
@@ -256,6 +294,7 @@ def convert(
     bitrate: Optional[str] = None,
     ffmpeg_args: Optional[str] = None,
     progress_handler: Optional[Callable[[int], None]] = None,
+    duration: Optional[float] = None,
 ) -> Tuple[bool, Optional[Dict[str, Any]]]:
     """
     Convert the input file to the output file synchronously with progress handler.
@@ -268,12 +307,16 @@ def convert(
     - bitrate: constant/variable bitrate.
     - ffmpeg_args: ffmpeg arguments.
     - progress_handler: progress handler, has to accept an integer as argument.
+    - duration: duration of the input in seconds, used for the progress.
+        Read from the input file if it's not known.
 
     ### Returns
     - Tuple of conversion status and error dictionary.
 
     ### Notes
     - Make sure to check if ffmpeg is installed before calling this function.
+    - ffmpeg only logs errors, the error dictionary contains
+        the last `ERROR_LINES` lines of its output.
     """
 
     # Initialize ffmpeg command
@@ -286,12 +329,14 @@ def convert(
         "-movflags",
         "+faststart",
         "-v",
-        "debug",
-        "-progress",
-        "-",
+        "error",
         "-nostats",
     ]
 
+    # The progress is written to stdout as key=value lines
+    if progress_handler:
+        arguments.extend(["-progress", "pipe:1"])
+
     file_format = (
         str(input_file.suffix).split(".")[1]
         if isinstance(input_file, Path)
@@ -336,19 +381,23 @@ def convert(
         [ffmpeg, *arguments],
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
+        stderr=subprocess.PIPE,
         universal_newlines=False,
     ) as process:
         if not progress_handler:
             # Wait for process to finish
-            proc_out = process.communicate()
+            _, error_output = process.communicate()
 
             if process.returncode != 0:
                 # get version and build year
                 version = get_ffmpeg_version(ffmpeg)
 
-                # join stdout and stderr and decode to utf-8
-                message = b"".join([out for out in proc_out if out]).decode("utf-8")
+                # keep the last lines of stderr and decode to utf-8
+                message = "\n".join(
+                    error_output.decode("utf-8", errors="replace").splitlines()[
+                        -ERROR_LINES:
+                    ]
+                )
 
                 # return error dictionary
                 return False, {
@@ -364,30 +413,40 @@ def convert(
 
         progress_handler(0)
 
-        out_buffer = []
-        total_dur = None
-        while True:
-            if process.stdout is None:
-                continue
-
-            out_line = (
-                process.stdout.readline().decode("utf-8", errors="replace").strip()
-            )
-
-            if out_line == "" and process.poll() is not None:
-                break
-
-            out_buffer.append(out_line.strip())
-
-            total_dur_match = DUR_REGEX.search(out_line)
-            if total_dur is None and total_dur_match:
-                total_dur = to_ms(**total_dur_match.groupdict())  # type: ignore
-                continue
-            if total_dur:
-                progress_time = TIME_REGEX.search(out_line)
-                if progress_time:
-                    elapsed_time = to_ms(**progress_time.groupdict())  # type: ignore
-                    progress_handler(int(elapsed_time / total_dur * 100))  # type: ignore
+        if duration is None and isinstance(input_file, Path):
+            duration = _probe_duration(input_file)
+
+        # Only the last lines of stderr are kept for the error report,
+        # it's read on a thread so ffmpeg doesn't block on a full pipe
+        error_lines: Deque[str] = deque(maxlen=ERROR_LINES)
+        error_reader = threading.Thread(
+            target=_read_lines,
+            args=(process.stderr, error_lines),
+            name="ffmpeg-stderr",
+            daemon=True,
+        )
+        error_reader.start()
+
+        total_us = duration * 1_000_000 if duration else None
+        last_progress = 0
+        if process.stdout is not None:
+            # The progress is reported as key=value lines
+            for line in process.stdout:
+                key, _, value = line.partition(b"=")
+                if (
+                    total_us is None
+                    or key not in (b"out_time_us", b"out_time_ms")
+                    or not value.strip().isdigit()
+                ):
+                    continue
+
+                progress = min(int(int(value) / total_us * 100), 100)
+                if progress != last_progress:
+                    last_progress = progress
+                    progress_handler(progress)
+
+        process.wait()
+        error_reader.join()
 
         if process.returncode != 0:
             # get version and build year
@@ -399,9 +458,50 @@ def convert(
                 "ffmpeg": ffmpeg,
                 "version": version[0],
                 "build_year": version[1],
-                "error": "\n".join(out_buffer),
+                "error": "\n".join(error_lines),
             }
 
         progress_handler(100)
 
         return True, None
+
+
+def _probe_duration(input_file: Path) -> Optional[float]:
+    """
+    Read the duration of an audio file from its headers.
+
+    ### Arguments
+    - input_file: Path to the file.
+
+    ### Returns
+    - The duration in seconds, or None if the format isn't supported by mutagen.
+    """
+
+    from mutagen import File  # pylint: disable=import-outside-toplevel
+
+    try:
+        audio_file = File(str(input_file))
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+    if audio_file is None or audio_file.info is None:
+        return None
+
+    return audio_file.info.length or None
+
+
+def _read_lines(stream: Optional[IO[bytes]], lines: Deque[str]) -> None:
+    """
+    Read a stream until it's closed.
+
+    ### Arguments
+    - stream: The stream.
+    - lines: Where to add the decoded lines, the oldest lines are
+        dropped if it's bounded.
+    """
+
+    if stream is None:
+        return
+
+    for line in stream:
+        lines.append(line.decode("utf-8", errors="replace").rstrip())
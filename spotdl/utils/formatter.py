@@ -9,16 +9,14 @@
 import re
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from unicodedata import normalize
 
-import pykakasi
 from rapidfuzz import fuzz
 from slugify import slugify as py_slugify
-from yt_dlp import parse_options
-from yt_dlp.utils import sanitize_filename
 
 from spotdl.types.song import Song
+from spotdl.utils.metrics import register_cache
 
 __all__ = [
     "VARS",
@@ -27,9 +25,12 @@
     "create_song_title",
     "sanitize_string",
     "slugify",
+    "get_kakasi",
     "format_query",
     "create_search_query",
     "create_file_name",
+    "get_file_name_template",
+    "FileNameTemplate",
     "parse_duration",
     "to_ms",
     "restrict_filename",
@@ -62,14 +63,50 @@
     "{output-ext}",
 ]
 
-KKS = pykakasi.kakasi()
-
 JAP_REGEX = re.compile(
     "[\u3000-\u303f\u3040-\u309f\u30a0-\u30ff\uff00-\uff9f\u4e00-\u9faf\u3400-\u4dbf]"
 )
 
 DISALLOWED_REGEX = re.compile(r"[^-a-zA-Z0-9\!\@\$]+")
 
+TEMPLATE_FIELD_REGEX = re.compile("(" + "|".join(re.escape(key) for key in VARS) + ")")
+
+# Values of the template fields, same as in format_query
+FIELD_GETTERS: Dict[str, Callable[[Song, bool], Any]] = {
+    "{title}": lambda song, short: song.name,
+    "{artists}": lambda song, short: (
+        song.artists[0] if short is True else ", ".join(song.artists)
+    ),
+    "{artist}": lambda song, short: song.artists[0],
+    "{album}": lambda song, short: song.album_name,
+    "{album-artist}": lambda song, short: song.album_artist,
+    "{genre}": lambda song, short: song.genres[0] if song.genres else "",
+    "{disc-number}": lambda song, short: song.disc_number,
+    "{disc-count}": lambda song, short: song.disc_count,
+    "{duration}": lambda song, short: song.duration,
+    "{year}": lambda song, short: song.year,
+    "{original-date}": lambda song, short: song.date,
+    "{track-number}": lambda song, short: (
+        f"{int(song.track_number):02d}" if song.track_number else ""
+    ),
+    "{tracks-count}": lambda song, short: song.tracks_count,
+    "{isrc}": lambda song, short: song.isrc,
+    "{track-id}": lambda song, short: song.song_id,
+    "{publisher}": lambda song, short: song.publisher,
+    "{list-name}": lambda song, short: song.list_name,
+    "{list-position}": lambda song, short: str(song.list_position).zfill(
+        len(str(song.list_length))
+    ),
+    "{list-length}": lambda song, short: song.list_length,
+}
+
+# List fields that are removed from the template when they aren't set
+LIST_FIELDS = {
+    "{list-length}": "list_length",
+    "{list-position}": "list_position",
+    "{list-name}": "list_name",
+}
+
 logger = logging.getLogger(__name__)
 
 
@@ -119,6 +156,21 @@ def sanitize_string(string: str) -> str:
     return output
 
 
+@lru_cache(maxsize=None)
+def get_kakasi() -> Any:
+    """
+    Get the kakasi converter used to transliterate japanese characters.
+    It's created on the first use, because it's slow to import and initialize.
+
+    ### Returns
+    - the `pykakasi.kakasi` instance
+    """
+
+    import pykakasi  # pylint: disable=import-outside-toplevel
+
+    return pykakasi.kakasi()
+
+
 @lru_cache()
 def slugify(string: str) -> str:
     """
@@ -145,7 +197,7 @@ def slugify(string: str) -> str:
         regex_pattern=JAP_REGEX.pattern,
     )
 
-    results = KKS.convert(normal_slug)
+    results = get_kakasi().convert(normal_slug)
 
     result = ""
     for index, item in enumerate(results):
@@ -312,46 +364,186 @@ def create_file_name(
 
     ### Returns
     - the formatted string as a Path object
+
+    ### Notes
+    - The template is compiled on the first call and reused afterwards,
+        use `FileNameTemplate` directly to keep it for a whole run.
     """
 
-    temp_song = copy.deepcopy(song)
+    return get_file_name_template(template, restrict, file_name_length).create(
+        song, file_extension, short
+    )
 
-    # If template does not contain any of the keys,
-    # append {artists} - {title}.{output-ext} to it
-    if not any(key in template for key in VARS) and template != "":
-        template += "/{artists} - {title}.{output-ext}"
 
-    if template == "":
-        template = "{artists} - {title}.{output-ext}"
+@lru_cache(maxsize=32)
+def get_file_name_template(
+    template: str,
+    restrict: Optional[str] = None,
+    file_name_length: Optional[int] = None,
+) -> "FileNameTemplate":
+    """
+    Get a compiled file name template, shared by the calls with the same arguments.
 
-    # If template ends with a slash. Does not have a file name with extension
-    # at the end of the template, append {artists} - {title}.{output-ext} to it
-    if template.endswith("/") or template.endswith(r"\\") or template.endswith("\\\\"):
-        template += "/{artists} - {title}.{output-ext}"
-
-    # If template does not end with {output-ext}, append it to the end of the template
-    if not template.endswith(".{output-ext}"):
-        template += ".{output-ext}"
-
-    formatted_string = format_query(
-        song=song,
-        template=template,
-        santitize=True,
-        file_extension=file_extension,
-        short=short,
-    )
+    ### Arguments
+    - template: the template string
+    - restrict: sanitization to apply to the filename
+    - file_name_length: the maximum length of the file name
+
+    ### Returns
+    - the compiled template
+    """
+
+    return FileNameTemplate(template, restrict, file_name_length)
+
+
+class FileNameTemplate:
+    """
+    Output template compiled into literal parts and the song fields between
+    them, so file names are built without scanning the template again
+    and only the fields that are used are computed.
+    """
+
+    def __init__(
+        self,
+        template: str,
+        restrict: Optional[str] = None,
+        file_name_length: Optional[int] = None,
+    ):
+        """
+        Compile the template.
+
+        ### Arguments
+        - template: the template string
+        - restrict: sanitization to apply to the filename
+        - file_name_length: the maximum length of the file name
+        """
+
+        # If template does not contain any of the keys,
+        # append {artists} - {title}.{output-ext} to it
+        if not any(key in template for key in VARS) and template != "":
+            template += "/{artists} - {title}.{output-ext}"
+
+        if template == "":
+            template = "{artists} - {title}.{output-ext}"
+
+        # If template ends with a slash. Does not have a file name with extension
+        # at the end of the template, append {artists} - {title}.{output-ext} to it
+        if (
+            template.endswith("/")
+            or template.endswith(r"\\")
+            or template.endswith("\\\\")
+        ):
+            template += "/{artists} - {title}.{output-ext}"
+
+        # If template does not end with {output-ext}, append it to the end of the template
+        if not template.endswith(".{output-ext}"):
+            template += ".{output-ext}"
+
+        self.template = template
+        self.restrict = restrict
+        self.file_name_length = file_name_length or 255
+
+        # Same fix as in format_query
+        if template in ["/.{output-ext}", ".{output-ext}"]:
+            template = "{artists} - {title}.{output-ext}"
+
+        # Literal parts and fields alternate, starting and ending with a literal
+        self.parts: List[str] = TEMPLATE_FIELD_REGEX.split(template)
+        self.fields = frozenset(self.parts[1::2])
+
+    def create(self, song: Song, file_extension: str, short: bool = False) -> Path:
+        """
+        Create the file name for a song.
 
-    file = create_path_object(formatted_string)
+        ### Arguments
+        - song: the song object
+        - file_extension: the file extension to use
+        - short: whether to use the short version of the template
 
-    length_limit = file_name_length or 255
+        ### Returns
+        - the formatted string as a Path object
+        """
 
-    # Check if the file name length is greater than the limit
-    if len(file.name) < length_limit:
-        # Restrict the filename if needed
-        if restrict and restrict != "none":
-            return restrict_filename(file, restrict == "strict")
+        file = create_path_object(self.format(song, file_extension, short))
 
-        return file
+        # Check if the file name length is greater than the limit
+        if len(file.name) < self.file_name_length:
+            # Restrict the filename if needed
+            if self.restrict and self.restrict != "none":
+                return restrict_filename(file, self.restrict == "strict")
+
+            return file
+
+        return _shorten_file_name(
+            song,
+            self.template,
+            file_extension,
+            self.restrict,
+            short,
+            self.file_name_length,
+        )
+
+    def format(self, song: Song, file_extension: str, short: bool = False) -> str:
+        """
+        Replace the fields of the template with the sanitized values of a song.
+
+        ### Arguments
+        - song: the song object
+        - file_extension: the file extension to use
+        - short: whether to use the short version of the template
+
+        ### Returns
+        - the formatted string
+        """
+
+        if any(
+            key in self.fields and getattr(song, attribute) is None
+            for key, attribute in LIST_FIELDS.items()
+        ):
+            # The empty list fields are removed from the template
+            return format_query(song, self.template, True, file_extension, short)
+
+        if file_extension is None and "{output-ext}" in self.fields:
+            raise ValueError(
+                "file_extension is None, but template contains {output-ext}"
+            )
+
+        parts = self.parts.copy()
+        for index in range(1, len(parts), 2):
+            key = parts[index]
+            if key == "{output-ext}":
+                value: Any = file_extension
+            else:
+                value = FIELD_GETTERS[key](song, short)
+
+            parts[index] = "None" if value is None else sanitize_string(str(value))
+
+        return "".join(parts)
+
+
+def _shorten_file_name(
+    song: Song,
+    template: str,
+    file_extension: str,
+    restrict: Optional[str],
+    short: bool,
+    length_limit: int,
+) -> Path:
+    """
+    Create the file name for a song whose file name is too long, by using
+    the short version of the template and shortening the artist and title.
+
+    ### Arguments
+    - song: the song object
+    - template: the template string
+    - file_extension: the file extension to use
+    - restrict: sanitization to apply to the filename
+    - short: whether the short version of the template was used
+    - length_limit: the maximum length of the file name
+
+    ### Returns
+    - the formatted string as a Path object
+    """
 
     if short is False:
         return create_file_name(
@@ -363,6 +555,8 @@ def create_file_name(
             file_name_length=length_limit,
         )
 
+    temp_song = copy.deepcopy(song)
+
     non_template_chars = re.findall(r"(?<!{)[^{}]+(?![^{}]*})", template)
     half_length = int((length_limit * 0.50) - (len("".join(non_template_chars)) / 2))
 
@@ -514,6 +708,10 @@ def restrict_filename(pathobj: Path, strict: bool = True) -> Path:
     - Based on the `sanitize_filename` function from yt-dlp
     """
     if strict:
+        from yt_dlp.utils import (  # pylint: disable=import-outside-toplevel
+            sanitize_filename,
+        )
+
         result = sanitize_filename(pathobj.name, True, False)  # type: ignore
         result = result.replace("_-_", "-")
     else:
@@ -620,6 +818,8 @@ def args_to_ytdlp_options(
     - the dictionary of options
     """
 
+    from yt_dlp import parse_options  # pylint: disable=import-outside-toplevel
+
     parsed_options = parse_options(argument_list).ydl_opts
 
     if defaults is None:
@@ -634,3 +834,8 @@ def args_to_ytdlp_options(
             parsed_options[key] = value
 
     return parsed_options
+
+
+# Report the hit rates of the memoized helpers in the run metrics
+register_cache("slugify", slugify)
+register_cache("ratio", ratio)
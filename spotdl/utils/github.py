@@ -8,9 +8,8 @@
 import re
 from typing import Tuple
 
-import requests
-
 from spotdl import _version
+from spotdl.utils.http import get_http_client
 
 __all__ = [
     "REPO",
@@ -47,7 +46,7 @@ def get_status(start: str, end: str, repo: str = REPO) -> Tuple[str, int, int]:
 
     url = f"https://api.github.com/repos/{repo}/compare/{start}...{end}"
 
-    response = requests.get(url, timeout=10)
+    response = get_http_client().get(url)
 
     if response.status_code != 200:
         if response.status_code == 403:
@@ -79,7 +78,7 @@ def get_latest_version(repo: str = REPO) -> str:
 
     url = f"https://api.github.com/repos/{repo}/releases/latest"
 
-    response = requests.get(url, timeout=10)
+    response = get_http_client().get(url)
 
     if response.status_code != 200:
         if response.status_code == 403:
@@ -205,7 +204,7 @@ def download_github_dir(
 
     dir_out = output_dir
 
-    response = requests.get(api_url, timeout=10).json()
+    response = get_http_client().get(api_url).json()
 
     if (
         isinstance(response, dict)
@@ -242,7 +241,7 @@ def download_github_dir(
 
         if file_url is not None:
             with open(path, "wb") as new_file:
-                new_file.write(requests.get(file_url, timeout=10).content)
+                new_file.write(get_http_client().get(file_url).content)
         else:
             download_github_dir(file["html_url"], flatten, output_dir)
 
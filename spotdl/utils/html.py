@@ -0,0 +1,253 @@
+"""
+Module for parsing the html pages of the scraping providers.
+
+Pages are parsed with the fastest installed backend: selectolax, then
+BeautifulSoup with lxml, then BeautifulSoup with the builtin `html.parser`.
+With the BeautifulSoup backends, `ParseOnly` makes the parser keep only
+the elements that can contain the wanted data instead of the whole page.
+"""
+
+import functools
+import importlib.util
+import re
+from typing import Any, List, NamedTuple, Optional, Tuple, Union
+
+__all__ = [
+    "HTML_BACKENDS",
+    "HtmlNode",
+    "ParseOnly",
+    "available_backends",
+    "get_html_backend",
+    "parse_html",
+]
+
+# Backends in order of preference
+HTML_BACKENDS = ("selectolax", "lxml", "html.parser")
+
+# Modules the optional backends need, older selectolax versions don't have lexbor
+_BACKEND_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml"}
+
+
+class ParseOnly(NamedTuple):
+    """
+    Elements to keep when parsing a page, together with their content.
+    """
+
+    tag: str
+    class_prefixes: Tuple[str, ...] = ()
+
+
+@functools.lru_cache(maxsize=None)
+def available_backends() -> Tuple[str, ...]:
+    """
+    Get the installed html backends.
+
+    ### Returns
+    - The names of the installed backends, in order of preference.
+    """
+
+    backends = []
+    for backend in HTML_BACKENDS[:2]:
+        try:
+            spec = importlib.util.find_spec(_BACKEND_MODULES[backend])
+        except ImportError:
+            # The parent package of the module isn't installed
+            continue
+
+        if spec is not None:
+            backends.append(backend)
+
+    backends.append("html.parser")
+
+    return tuple(backends)
+
+
+def get_html_backend(backend: Optional[str] = None) -> str:
+    """
+    Get the backend to parse pages with.
+
+    ### Arguments
+    - backend: The requested backend, None for the fastest installed one.
+
+    ### Returns
+    - The name of the backend.
+
+    ### Errors
+    - ValueError if the requested backend is unknown or not installed.
+    """
+
+    if backend is None:
+        return available_backends()[0]
+
+    if backend not in available_backends():
+        raise ValueError(f"HTML backend {backend} is not available")
+
+    return backend
+
+
+class HtmlNode:
+    """
+    Element of a parsed page, with the same interface for all backends.
+    """
+
+    def __init__(self, node: Any, backend: str):
+        """
+        Wrap an element of a parsed page.
+
+        ### Arguments
+        - node: The selectolax node or BeautifulSoup tag.
+        - backend: The backend that parsed the page.
+        """
+
+        self._node = node
+        self.backend = backend
+
+    @property
+    def text(self) -> str:
+        """
+        Get the text of the element and its children.
+
+        ### Returns
+        - The text.
+        """
+
+        if self.backend == "selectolax":
+            return self._node.text(deep=True) or ""
+
+        return self._node.get_text()
+
+    def get(self, attribute: str, default: str = "") -> str:
+        """
+        Get an attribute of the element.
+
+        ### Arguments
+        - attribute: The name of the attribute.
+        - default: The value if the element doesn't have the attribute.
+
+        ### Returns
+        - The value of the attribute.
+        """
+
+        if self.backend == "selectolax":
+            attributes = getattr(self._node, "attributes", {})
+            value = attributes.get(attribute)
+        else:
+            value = self._node.get(attribute)
+
+        if value is None:
+            return default
+
+        if isinstance(value, list):
+            return " ".join(value)
+
+        return value
+
+    def select(self, selector: str, limit: Optional[int] = None) -> List["HtmlNode"]:
+        """
+        Find the elements matching a css selector.
+
+        ### Arguments
+        - selector: The css selector.
+        - limit: The maximum number of elements to find.
+
+        ### Returns
+        - The matching elements, in document order.
+        """
+
+        if self.backend == "selectolax":
+            nodes = self._node.css(selector)
+            if limit is not None:
+                nodes = nodes[:limit]
+        else:
+            nodes = self._node.select(selector, limit=limit or 0)
+
+        return [HtmlNode(node, self.backend) for node in nodes]
+
+    def select_one(self, selector: str) -> Optional["HtmlNode"]:
+        """
+        Find the first element matching a css selector,
+        the search stops as soon as it's found.
+
+        ### Arguments
+        - selector: The css selector.
+
+        ### Returns
+        - The element or None if there is none.
+        """
+
+        if self.backend == "selectolax":
+            node = self._node.css_first(selector)
+        else:
+            node = self._node.select_one(selector)
+
+        return None if node is None else HtmlNode(node, self.backend)
+
+    def remove(self, selector: str) -> None:
+        """
+        Remove the elements matching a css selector, together with their content.
+
+        ### Arguments
+        - selector: The css selector.
+        """
+
+        if self.backend == "selectolax":
+            for node in self._node.css(selector):
+                node.decompose()
+        else:
+            for node in self._node.select(selector):
+                node.decompose()
+
+
+def _strainer(only: ParseOnly) -> Any:
+    """
+    Create the BeautifulSoup strainer for `ParseOnly`.
+
+    ### Arguments
+    - only: The elements to keep.
+
+    ### Returns
+    - The `SoupStrainer`.
+    """
+
+    from bs4 import SoupStrainer  # pylint: disable=import-outside-toplevel
+
+    if not only.class_prefixes:
+        return SoupStrainer(only.tag)
+
+    pattern = re.compile("^(?:" + "|".join(map(re.escape, only.class_prefixes)) + ")")
+
+    return SoupStrainer(only.tag, class_=pattern)
+
+
+def parse_html(
+    html: Union[str, bytes],
+    only: Optional[ParseOnly] = None,
+    backend: Optional[str] = None,
+) -> HtmlNode:
+    """
+    Parse a page.
+
+    ### Arguments
+    - html: The page.
+    - only: The elements the page is going to be searched for. The
+        BeautifulSoup backends skip everything else, selectolax parses the
+        whole page either way.
+    - backend: The backend to use, None for the fastest installed one.
+
+    ### Returns
+    - The root of the parsed page.
+    """
+
+    backend = get_html_backend(backend)
+
+    if backend == "selectolax":
+        # pylint: disable=import-outside-toplevel,import-error
+        from selectolax.lexbor import LexborHTMLParser  # type: ignore
+
+        return HtmlNode(LexborHTMLParser(html), backend)
+
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+    parse_only = None if only is None else _strainer(only)
+
+    return HtmlNode(BeautifulSoup(html, backend, parse_only=parse_only), backend)
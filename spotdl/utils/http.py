@@ -0,0 +1,598 @@
+"""
+Module for the shared HTTP client.
+
+All providers, cover art downloads and GitHub calls go through the same
+connection pools, so that connections (and TLS sessions) are reused
+between requests instead of being created for every call.
+
+Async providers use `AsyncHTTPClient`, which is built on aiohttp if it's installed
+(`pip install spotdl[async]`), and falls back to running the requests of the
+shared client in the default executor otherwise, where every request
+holds a thread.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import threading
+import weakref
+from collections import namedtuple
+from typing import Any, Coroutine, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from spotdl.utils.config import GlobalConfig
+from spotdl.utils.metrics import register_cache
+
+__all__ = [
+    "DEFAULT_TIMEOUT",
+    "DEFAULT_POOL_SIZE",
+    "HTTPClient",
+    "PooledSession",
+    "get_http_client",
+    "configure_http_client",
+    "new_session",
+    "AsyncResponse",
+    "AsyncHTTPClient",
+    "get_async_http_client",
+    "close_async_http_client",
+    "run_sync",
+]
+
+# Timeout in seconds used when the caller doesn't pass one
+DEFAULT_TIMEOUT = 10
+
+# Number of connections kept alive per host
+DEFAULT_POOL_SIZE = 10
+
+# Number of hosts that have their own connection pool
+MAX_HOSTS = 32
+
+# Number of concurrent connections per host of the async client
+DEFAULT_ASYNC_POOL_SIZE = 100
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+ConnectionInfo = namedtuple("ConnectionInfo", ["hits", "misses"])
+
+
+class PooledSession(requests.Session):
+    """
+    Session that uses the connection pools of the http client.
+    Applies the default timeout, the proxies from `GlobalConfig`
+    and the per-host limits to every request.
+    """
+
+    def __init__(self, client: "HTTPClient"):
+        """
+        Initialize the session.
+
+        ### Arguments
+        - client: The http client that owns the connection pools.
+        """
+
+        super().__init__()
+
+        self.client = client
+        self.mount("https://", client.adapter)
+        self.mount("http://", client.adapter)
+
+    def request(  # type: ignore # pylint: disable=arguments-differ
+        self, method: str, url: str, **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request through the shared connection pools.
+
+        ### Arguments
+        - method: The http method.
+        - url: The url to request.
+        - kwargs: The arguments of `requests.Session.request`.
+
+        ### Returns
+        - The response.
+
+        ### Notes
+        - The default timeout and the proxies are added if they aren't passed,
+            and the per-host request limit of the client is applied.
+        """
+
+        kwargs.setdefault("timeout", self.client.timeout)
+        if kwargs.get("proxies") is None:
+            kwargs["proxies"] = GlobalConfig.get_parameter("proxies")
+
+        limit = self.client.get_host_limit(url)
+        if limit is None:
+            return super().request(method, url, **kwargs)
+
+        with limit:
+            return super().request(method, url, **kwargs)
+
+    def close(self) -> None:
+        """
+        Clear the cookies of the session, the connection pools stay open.
+        """
+
+        # The adapter is shared with the other sessions, so it's not closed
+        self.cookies.clear()
+
+
+class HTTPClient:
+    """
+    Keep-alive connection pools shared by all http requests.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        host_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the http client.
+
+        ### Arguments
+        - pool_size: The number of connections kept alive per host,
+            should match the number of concurrent downloads.
+        - timeout: The default timeout of the requests in seconds.
+        - host_limits: Maximum number of concurrent requests per host name.
+        """
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.host_limits = dict(host_limits or {})
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        self.adapter = HTTPAdapter(
+            pool_connections=MAX_HOSTS, pool_maxsize=pool_size, max_retries=0
+        )
+        self.session = PooledSession(self)
+
+    def get_host_limit(self, url: str) -> Optional[threading.BoundedSemaphore]:
+        """
+        Get the semaphore limiting the concurrent requests to the host of the url.
+
+        ### Arguments
+        - url: The url of the request.
+
+        ### Returns
+        - The semaphore or None if the host is not limited.
+        """
+
+        if not self.host_limits:
+            return None
+
+        host = urlsplit(url).hostname or ""
+        limit = self.host_limits.get(host)
+        if limit is None:
+            return None
+
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(limit)
+                self._host_semaphores[host] = semaphore
+
+        return semaphore
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a GET request.
+
+        ### Arguments
+        - url: The url to request.
+        - kwargs: Arguments passed to `requests.Session.get`.
+
+        ### Returns
+        - The response.
+        """
+
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a POST request.
+
+        ### Arguments
+        - url: The url to request.
+        - kwargs: Arguments passed to `requests.Session.post`.
+
+        ### Returns
+        - The response.
+        """
+
+        return self.session.post(url, **kwargs)
+
+    def new_session(self) -> PooledSession:
+        """
+        Create a session with its own headers and cookies,
+        that shares the connection pools of the client.
+
+        ### Returns
+        - The session.
+        """
+
+        return PooledSession(self)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the connection reuse stats of the pools.
+
+        ### Returns
+        - Dictionary with the host as key, and the number of requests,
+            opened connections and reused connections as value.
+        """
+
+        stats: Dict[str, Dict[str, int]] = {}
+        pools = self.adapter.poolmanager.pools
+        with pools.lock:
+            # pylint: disable=protected-access
+            pool_list = list(pools._container.values())
+
+        for pool in pool_list:
+            host_stats = stats.setdefault(
+                pool.host, {"requests": 0, "connections": 0, "reused": 0}
+            )
+            host_stats["requests"] += pool.num_requests
+            host_stats["connections"] += pool.num_connections
+            host_stats["reused"] += max(pool.num_requests - pool.num_connections, 0)
+
+        return stats
+
+    def cache_info(self) -> ConnectionInfo:
+        """
+        Get the connection reuse stats in the format of `functools.lru_cache`,
+        a reused connection is a hit and a new connection is a miss.
+
+        ### Returns
+        - Named tuple with the hits and misses.
+        """
+
+        stats = self.stats().values()
+
+        return ConnectionInfo(
+            hits=sum(host["reused"] for host in stats),
+            misses=sum(host["connections"] for host in stats),
+        )
+
+
+_client: Optional[HTTPClient] = None
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Get the shared http client, creating it with the default settings if needed.
+
+    ### Returns
+    - The http client.
+    """
+
+    global _client  # pylint: disable=global-statement
+
+    if _client is None:
+        _client = HTTPClient()
+
+    return _client
+
+
+def configure_http_client(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    timeout: float = DEFAULT_TIMEOUT,
+    host_limits: Optional[Dict[str, int]] = None,
+) -> HTTPClient:
+    """
+    Replace the shared http client with one using the given settings.
+
+    ### Arguments
+    - pool_size: The number of connections kept alive per host.
+    - timeout: The default timeout of the requests in seconds.
+    - host_limits: Maximum number of concurrent requests per host name.
+
+    ### Returns
+    - The http client.
+
+    ### Notes
+    - The client is only replaced if the settings changed, so that the
+        pools stay warm. Sessions created before keep using the old pools.
+    """
+
+    global _client  # pylint: disable=global-statement
+
+    if (
+        _client is not None
+        and _client.pool_size == pool_size
+        and _client.timeout == timeout
+        and _client.host_limits == dict(host_limits or {})
+    ):
+        return _client
+
+    _client = HTTPClient(pool_size, timeout, host_limits)
+    logger.debug("HTTP client: %d connections per host", pool_size)
+
+    return _client
+
+
+def new_session() -> PooledSession:
+    """
+    Create a session that shares the connection pools of the shared http client.
+
+    ### Returns
+    - The session.
+    """
+
+    return get_http_client().new_session()
+
+
+class _SharedClientStats:
+    """
+    Reports the connection reuse of the shared client to the run metrics.
+    """
+
+    def cache_info(self) -> ConnectionInfo:
+        """
+        Get the connection reuse stats of the shared client.
+
+        ### Returns
+        - Named tuple with the hits and misses.
+        """
+
+        if _client is None:
+            return ConnectionInfo(hits=0, misses=0)
+
+        return _client.cache_info()
+
+
+register_cache("http-connections", _SharedClientStats())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_aiohttp() -> Any:
+    """
+    Import aiohttp, which is an optional dependency.
+
+    ### Returns
+    - The aiohttp module or None if it's not installed.
+    """
+
+    try:
+        import aiohttp  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        logger.debug("aiohttp is not installed, async requests run on threads")
+        return None
+
+    return aiohttp
+
+
+class AsyncResponse:
+    """
+    Response of an async request, with the parts of `requests.Response`
+    that are used by the providers.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        content: bytes,
+        url: str,
+        encoding: Optional[str] = None,
+    ):
+        """
+        Initialize the response.
+
+        ### Arguments
+        - status_code: The http status code.
+        - content: The body of the response.
+        - url: The final url of the response.
+        - encoding: The encoding of the body, defaults to utf-8.
+        """
+
+        self.status_code = status_code
+        self.content = content
+        self.url = url
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self) -> str:
+        """
+        Get the body of the response as text.
+
+        ### Returns
+        - The decoded body.
+        """
+
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        """
+        Parse the body of the response as JSON.
+
+        ### Returns
+        - The parsed body.
+        """
+
+        return json.loads(self.content)
+
+
+class AsyncHTTPClient:
+    """
+    Async http client for a single event loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_ASYNC_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """
+        Initialize the async http client.
+
+        ### Arguments
+        - pool_size: The number of concurrent connections per host.
+        - timeout: The default timeout of the requests in seconds.
+        """
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._session: Any = None
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Send a GET request.
+
+        ### Arguments
+        - url: The url to request.
+        - params: The query parameters.
+        - headers: The request headers.
+        - timeout: The timeout in seconds, defaults to the client timeout.
+
+        ### Returns
+        - The response.
+
+        ### Notes
+        - The proxies from `GlobalConfig` are used for every request.
+        """
+
+        timeout = timeout or self.timeout
+        aiohttp = _get_aiohttp()
+
+        if aiohttp is None:
+            response = await asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    get_http_client().get,
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                ),
+            )
+
+            return AsyncResponse(
+                response.status_code, response.content, response.url, response.encoding
+            )
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            )
+
+        proxies = GlobalConfig.get_parameter("proxies") or {}
+        async with self._session.get(
+            url,
+            params=params,
+            headers=headers,
+            proxy=proxies.get("https" if url.startswith("https") else "http"),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            content = await response.read()
+
+            return AsyncResponse(
+                response.status, content, str(response.url), response.charset
+            )
+
+    async def close(self) -> None:
+        """
+        Close the connections of the client.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPClient]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client() -> AsyncHTTPClient:
+    """
+    Get the async http client of the running event loop.
+
+    ### Returns
+    - The async http client.
+    """
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncHTTPClient()
+        _async_clients[loop] = client
+
+    return client
+
+
+async def close_async_http_client() -> None:
+    """
+    Close the async http client of the running event loop.
+    """
+
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop that runs the coroutines of blocking code,
+    starting its thread if needed.
+
+    ### Returns
+    - The event loop.
+    """
+
+    global _sync_loop  # pylint: disable=global-statement
+
+    with _sync_loop_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="spotdl-sync-loop", daemon=True
+            ).start()
+            _sync_loop = loop
+
+        return _sync_loop
+
+
+def run_sync(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine from blocking code.
+
+    ### Arguments
+    - coroutine: The coroutine to run.
+
+    ### Returns
+    - The return value of the coroutine.
+
+    ### Notes
+    - The coroutines run on a single long-lived event loop in a background
+        thread, so its async http client (and the aiohttp session or the
+        default executor behind it) keeps its connections between calls.
+    """
+
+    loop = _get_sync_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    if running is loop:
+        coroutine.close()
+        raise RuntimeError("run_sync can't be called from the coroutines it runs")
+
+    return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
@@ -0,0 +1,126 @@
+"""
+Module for processing cover images.
+
+Covers are resized, cropped to a square and recompressed to JPEG with Pillow,
+which is an optional dependency (`pip install spotdl[covers]`). Without Pillow
+the covers are embedded as they are, with their actual MIME type.
+"""
+
+import functools
+import importlib.util
+import io
+import logging
+from typing import Any, Optional, Tuple
+
+from spotdl.utils.tracing import traced
+
+__all__ = ["detect_mime", "normalize_cover", "is_pillow_installed", "JPEG_QUALITY"]
+
+# Quality of the recompressed covers
+JPEG_QUALITY = 90
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_pillow() -> Any:
+    """
+    Import Pillow, which is an optional dependency.
+
+    ### Returns
+    - The `PIL.Image` module or None if it's not installed.
+    """
+
+    try:
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        logger.debug("Pillow is not installed, covers are embedded as they are")
+        return None
+
+    return Image
+
+
+def is_pillow_installed() -> bool:
+    """
+    Check if Pillow is installed, without importing it.
+
+    ### Returns
+    - True if Pillow can be imported.
+    """
+
+    return importlib.util.find_spec("PIL") is not None
+
+
+def detect_mime(data: bytes) -> str:
+    """
+    Detect the MIME type of an image from its first bytes.
+
+    ### Arguments
+    - data: The image.
+
+    ### Returns
+    - The MIME type, `image/jpeg` if the format is unknown.
+    """
+
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+
+    return "image/jpeg"
+
+
+@traced("normalize_cover", "metadata")
+def normalize_cover(data: bytes, max_size: Optional[int]) -> Tuple[bytes, str]:
+    """
+    Crop a cover to a square, resize it to fit the maximum size
+    and recompress it to JPEG.
+
+    ### Arguments
+    - data: The image.
+    - max_size: The maximum width and height, None to keep the cover as it is.
+
+    ### Returns
+    - The processed image and its MIME type. The image is returned unchanged
+        if it's already a square JPEG within the maximum size, if it can't be
+        decoded or if Pillow isn't installed.
+    """
+
+    mime = detect_mime(data)
+    if not max_size:
+        return data, mime
+
+    image_module = _get_pillow()
+    if image_module is None:
+        return data, mime
+
+    try:
+        with image_module.open(io.BytesIO(data)) as image:
+            width, height = image.size
+            if mime == "image/jpeg" and width == height <= max_size:
+                return data, mime
+
+            # Crop the center, e.g. the album art in a 16:9 video thumbnail
+            side = min(width, height)
+            left = (width - side) // 2
+            top = (height - side) // 2
+            cover = image.crop((left, top, left + side, top + side))
+
+            if side > max_size:
+                cover = cover.resize(
+                    (max_size, max_size), image_module.Resampling.LANCZOS
+                )
+
+            output = io.BytesIO()
+            cover.convert("RGB").save(
+                output, "JPEG", quality=JPEG_QUALITY, optimize=True
+            )
+    except (OSError, ValueError) as exc:
+        logger.debug("Failed to process cover: %s", exc)
+        return data, mime
+
+    return output.getvalue(), "image/jpeg"
@@ -0,0 +1,449 @@
+"""
+Module for pools of interchangeable service instances (mirrors).
+
+The pool ranks the instances by health and latency, measured by the
+requests themselves and by a background probe. Calls go to the fastest
+healthy instance and fail over to the next one on errors. With a hedge
+delay, a second instance is also tried when the first one hasn't
+answered in time, and the first answer wins.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import requests
+
+from spotdl.utils.http import get_http_client
+
+__all__ = [
+    "InstancePoolError",
+    "InstanceState",
+    "InstancePool",
+    "PROBE_INTERVAL",
+    "PROBE_TIMEOUT",
+]
+
+# Number of seconds between two health probes of the instances
+PROBE_INTERVAL = 300
+
+# Timeout of a health probe in seconds
+PROBE_TIMEOUT = 5
+
+# Weight of the newest sample in the moving latency average
+LATENCY_SMOOTHING = 0.3
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class InstancePoolError(Exception):
+    """
+    Base class for all exceptions related to instance pools.
+    """
+
+
+@dataclass
+class InstanceState:
+    """
+    Health and latency of a single instance.
+    """
+
+    url: str
+    healthy: bool = True
+    latency: Optional[float] = None
+    failures: int = 0
+    last_probe: Optional[float] = None
+
+
+class InstancePool:
+    """
+    Thread-safe pool of instances of the same service.
+    """
+
+    def __init__(
+        self,
+        instances: List[str],
+        probe_path: str = "/",
+        probe_interval: Optional[float] = PROBE_INTERVAL,
+        hedge_delay: Optional[float] = None,
+    ):
+        """
+        Initialize the pool.
+
+        ### Arguments
+        - instances: The base urls of the instances, in order of preference.
+        - probe_path: The path requested by the health probe.
+        - probe_interval: The number of seconds between two probes,
+            None disables the background probe.
+        - hedge_delay: The number of seconds to wait for an instance before
+            also trying the next one, None disables hedged requests.
+
+        ### Errors
+        - InstancePoolError if no instances are given.
+        """
+
+        if not instances:
+            raise InstancePoolError("At least one instance is required")
+
+        self.instances = [instance.rstrip("/") for instance in instances]
+        self.probe_path = probe_path
+        self.probe_interval = probe_interval
+        self.hedge_delay = hedge_delay
+
+        self._lock = threading.Lock()
+        self._states: Dict[str, InstanceState] = {
+            url: InstanceState(url) for url in self.instances
+        }
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @property
+    def states(self) -> List[InstanceState]:
+        """
+        Get the state of every instance.
+
+        ### Returns
+        - The states, in the order of the instances.
+        """
+
+        with self._lock:
+            return [self._states[url] for url in self.instances]
+
+    def ranked(self) -> List[str]:
+        """
+        Get the instances in the order they should be tried.
+
+        ### Returns
+        - Healthy instances sorted by latency, followed by the unhealthy ones.
+            Instances that weren't measured yet keep their configured order.
+        """
+
+        with self._lock:
+            return sorted(
+                self.instances,
+                key=lambda url: (
+                    not self._states[url].healthy,
+                    self._states[url].latency or 0.0,
+                ),
+            )
+
+    def record(self, url: str, latency: Optional[float] = None) -> None:
+        """
+        Record the outcome of a call to an instance.
+
+        ### Arguments
+        - url: The base url of the instance.
+        - latency: The duration of the call in seconds, None if it failed.
+        """
+
+        with self._lock:
+            state = self._states[url]
+            if latency is None:
+                state.healthy = False
+                state.failures += 1
+                return
+
+            state.healthy = True
+            state.failures = 0
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency += LATENCY_SMOOTHING * (latency - state.latency)
+
+    def _record_lost(self, url: str, elapsed: float) -> None:
+        """
+        Record a call that was cancelled because another instance answered first.
+
+        ### Arguments
+        - url: The base url of the instance.
+        - elapsed: The time the call ran before it was cancelled, in seconds.
+
+        ### Notes
+        - The health of the instance is left as is, only its latency
+            is raised to at least the elapsed time.
+        """
+
+        with self._lock:
+            state = self._states[url]
+            if state.latency is None or state.latency < elapsed:
+                state.latency = elapsed
+
+    def call(self, func: Callable[[str], T], hedge: bool = False) -> T:
+        """
+        Call a function with the base url of the best instance,
+        failing over to the next instance if it raises.
+
+        ### Arguments
+        - func: The function to call, it should raise if the instance failed.
+        - hedge: Whether to hedge the call when a hedge delay is set,
+            only use this for idempotent calls.
+
+        ### Returns
+        - The return value of the first successful call.
+
+        ### Errors
+        - InstancePoolError if the call failed on every instance.
+        """
+
+        self.start()
+
+        instances = self.ranked()
+        if hedge and self.hedge_delay is not None and len(instances) > 1:
+            return self._call_hedged(func, instances)
+
+        last_error: Optional[Exception] = None
+        for url in instances:
+            try:
+                return self._timed(func, url)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.debug("Instance %s failed: %s", url, exc)
+                last_error = exc
+
+        raise InstancePoolError(
+            f"All instances failed, last error: {last_error}"
+        ) from last_error
+
+    async def call_async(
+        self, func: Callable[[str], Awaitable[T]], hedge: bool = False
+    ) -> T:
+        """
+        Await a coroutine function with the base url of the best instance,
+        failing over to the next instance if it raises.
+
+        ### Arguments
+        - func: The coroutine function to await.
+        - hedge: Whether to hedge the call when a hedge delay is set.
+
+        ### Returns
+        - The return value of the first successful call.
+
+        ### Errors
+        - InstancePoolError if the call failed on every instance.
+        """
+
+        self.start()
+
+        instances = iter(self.ranked())
+        delay = self.hedge_delay if hedge else None
+        pending: Dict["asyncio.Task[T]", str] = {}
+        last_error: Optional[BaseException] = None
+
+        async def timed(url: str) -> T:
+            start = time.perf_counter()
+            try:
+                result = await func(url)
+            except asyncio.CancelledError:
+                # Lost the hedge, the call didn't succeed but the time
+                # it took so far is a lower bound of its latency
+                self._record_lost(url, time.perf_counter() - start)
+                raise
+            except Exception:
+                self.record(url)
+                raise
+
+            self.record(url, time.perf_counter() - start)
+
+            return result
+
+        def launch() -> bool:
+            url = next(instances, None)
+            if url is None:
+                return False
+
+            pending[asyncio.ensure_future(timed(url))] = url
+            return True
+
+        launch()
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    # The slowest instance didn't answer in time, hedge
+                    if not launch():
+                        delay = None
+                    continue
+
+                for task in done:
+                    url = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+
+                    logger.debug("Instance %s failed: %s", url, task.exception())
+                    last_error = task.exception()
+
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise InstancePoolError(
+            f"All instances failed, last error: {last_error}"
+        ) from last_error
+
+    def probe(self) -> None:
+        """
+        Check the health and latency of every instance.
+        """
+
+        for url in self.instances:
+            start = time.perf_counter()
+            try:
+                response = get_http_client().get(
+                    url + self.probe_path, timeout=PROBE_TIMEOUT
+                )
+                healthy = response.status_code < 500
+            except requests.RequestException:
+                healthy = False
+
+            self.record(url, time.perf_counter() - start if healthy else None)
+            with self._lock:
+                self._states[url].last_probe = time.time()
+
+        logger.debug(
+            "Instance probe: %s",
+            ", ".join(
+                f"{state.url} ({'up' if state.healthy else 'down'}, {state.latency})"
+                for state in self.states
+            ),
+        )
+
+    def start(self) -> None:
+        """
+        Start the background probe, if it's enabled and not running yet.
+        """
+
+        if (
+            self.probe_interval is None
+            or self._prober is not None
+            or len(self.instances) < 2
+        ):
+            return
+
+        with self._lock:
+            if self._prober is not None:
+                return
+
+            self._prober = threading.Thread(
+                target=self._probe_loop, name="instance-probe", daemon=True
+            )
+            self._prober.start()
+
+    def close(self) -> None:
+        """
+        Stop the background probe and the hedging threads.
+        """
+
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _probe_loop(self) -> None:
+        """
+        Probe the instances until the pool is closed.
+        """
+
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.debug("Instance probe failed: %s", exc)
+
+            self._stop.wait(self.probe_interval)
+
+    def _timed(self, func: Callable[[str], T], url: str) -> T:
+        """
+        Call a function with an instance and record the outcome.
+
+        ### Arguments
+        - func: The function to call.
+        - url: The base url of the instance.
+
+        ### Returns
+        - The return value of the function.
+        """
+
+        start = time.perf_counter()
+        try:
+            result = func(url)
+        except Exception:
+            self.record(url)
+            raise
+
+        self.record(url, time.perf_counter() - start)
+
+        return result
+
+    def _call_hedged(self, func: Callable[[str], T], instances: List[str]) -> T:
+        """
+        Call a function on the instances in order, starting the next
+        instance when the previous ones fail or don't answer within the hedge delay.
+
+        ### Arguments
+        - func: The function to call.
+        - instances: The ranked instances.
+
+        ### Returns
+        - The return value of the first successful call.
+        """
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    thread_name_prefix="instance-hedge"
+                )
+
+        remaining = iter(instances)
+        pending: Dict["concurrent.futures.Future[T]", str] = {}
+        last_error: Optional[BaseException] = None
+        delay = self.hedge_delay
+
+        def launch() -> bool:
+            url = next(remaining, None)
+            if url is None:
+                return False
+
+            pending[self._executor.submit(self._timed, func, url)] = url  # type: ignore
+            return True
+
+        launch()
+
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, timeout=delay, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            if not done:
+                if not launch():
+                    delay = None
+                continue
+
+            for future in done:
+                url = pending.pop(future)
+                if future.exception() is None:
+                    # Slower calls keep running in the background, their
+                    # outcome is still recorded
+                    return future.result()
+
+                logger.debug("Instance %s failed: %s", url, future.exception())
+                last_error = future.exception()
+
+            if not pending:
+                launch()
+
+        raise InstancePoolError(
+            f"All instances failed, last error: {last_error}"
+        ) from last_error
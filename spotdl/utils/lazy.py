@@ -0,0 +1,70 @@
+"""
+Module for deferring imports of heavy modules until they are used.
+
+The providers and their dependencies (yt-dlp, ytmusicapi, bs4, ...) take
+a long time to import, and most invocations only use some of them.
+"""
+
+import importlib
+from typing import Any, Dict, Iterator, Mapping
+
+__all__ = ["lazy_import", "LazyRegistry"]
+
+
+def lazy_import(path: str) -> Any:
+    """
+    Import an attribute from a module.
+
+    ### Arguments
+    - path: The path to the attribute, e.g. `spotdl.providers.audio.youtube:YouTube`.
+
+    ### Returns
+    - The imported attribute.
+    """
+
+    module_name, _, attribute = path.partition(":")
+    module = importlib.import_module(module_name)
+
+    return getattr(module, attribute) if attribute else module
+
+
+class LazyRegistry(Mapping[str, Any]):
+    """
+    Read-only mapping of names to classes, that imports each class on first access.
+    Iterating over the registry or checking membership doesn't import anything.
+    """
+
+    def __init__(self, entries: Dict[str, str]):
+        """
+        Initialize the registry.
+
+        ### Arguments
+        - entries: Dictionary with the name as key and the import path
+            (`module:attribute`) as value.
+        """
+
+        self._entries = dict(entries)
+        self._loaded: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        loaded = self._loaded.get(key)
+        if loaded is not None:
+            return loaded
+
+        path = self._entries[key]
+        loaded = lazy_import(path)
+        self._loaded[key] = loaded
+
+        return loaded
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._entries)})"
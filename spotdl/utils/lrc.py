@@ -5,33 +5,100 @@
 import logging
 import re
 from pathlib import Path
-
-from syncedlyrics import search as syncedlyrics_search
-from syncedlyrics.utils import Lyrics, TargetType, has_translation
+from typing import List, Optional
 
 from spotdl.types.song import Song
+from spotdl.utils.cache import TTLCache
+from spotdl.utils.lyrics_cache import LRC, LyricsCache, lyrics_format
+from spotdl.utils.metrics import register_cache
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["generate_lrc", "remomve_lrc"]
+__all__ = ["generate_lrc", "remomve_lrc", "search_synced_lyrics"]
+
+# Results of the syncedlyrics searches, shared by the `synced` lyrics provider
+# and the lrc files so that a song is only searched for once
+_synced_lyrics: TTLCache[Optional[str]] = TTLCache(maxsize=1024, ttl=60 * 60)
+register_cache("synced-lyrics", _synced_lyrics)
 
 
-def generate_lrc(song: Song, output_file: Path):
+def search_synced_lyrics(
+    name: str, artists: List[str], synced_only: bool = False
+) -> Optional[str]:
+    """
+    Search for the lyrics of a song with syncedlyrics, the results are cached.
+
+    ### Arguments
+    - name: The name of the song.
+    - artists: The artists of the song.
+    - synced_only: Only accept synced lyrics.
+
+    ### Returns
+    - The lyrics of the song or None if no lyrics were found.
+
+    ### Errors
+    - requests.exceptions.SSLError if the search failed, the miss isn't cached.
+    """
+
+    import syncedlyrics  # pylint: disable=import-outside-toplevel
+
+    key = (name, tuple(artists), synced_only)
+    if key in _synced_lyrics:
+        return _synced_lyrics.get(key)
+
+    try:
+        lyrics = syncedlyrics.search(f"{name} - {artists[0]}", synced_only=synced_only)
+    except TypeError:
+        # Error at syncedlyrics.providers.musixmatch L89 -
+        #   Because `body` is occasionally an empty list instead of a dictionary.
+        # We get this error when synced_only is set to False,
+        #   and there are no synced lyrics present
+        # Because its empty, we know there are no lyrics
+        lyrics = None
+
+    _synced_lyrics.set(key, lyrics)
+
+    return lyrics
+
+
+def generate_lrc(
+    song: Song, output_file: Path, lyrics_cache: Optional[LyricsCache] = None
+):
     """
     Generates an LRC file for the current song
 
     ### Arguments
     - song: Song object
     - output_file: Path to the output file
+    - lyrics_cache: Cache of the synced lyrics lookups
     """
 
-    if song.lyrics and has_translation(song.lyrics):
+    # pylint: disable=import-outside-toplevel
+    from syncedlyrics.utils import Lyrics, TargetType, has_translation
+
+    lrc_data: Optional[str]
+    if song.lyrics and (
+        lyrics_format(song.lyrics) == "lrc" or has_translation(song.lyrics)
+    ):
+        # The embedded lyrics are synced already
         lrc_data = song.lyrics
     else:
-        try:
-            lrc_data = syncedlyrics_search(song.display_name)
-        except Exception:
-            lrc_data = None
+        cached = lyrics_cache.get(song, LRC) if lyrics_cache else None
+        if cached is not None:
+            lrc_data = cached.lyrics
+        else:
+            try:
+                lrc_data = search_synced_lyrics(song.name, song.artists)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.debug(
+                    "Failed to search for the lrc file of %s: %s",
+                    song.display_name,
+                    exc,
+                )
+                lrc_data = None
+            else:
+                if lyrics_cache is not None:
+                    lyrics_cache.set(song, lrc_data, "syncedlyrics", LRC)
 
     if lrc_data:
         Lyrics(lrc_data).save_lrc_file(
@@ -0,0 +1,276 @@
+"""
+Module for the persistent lyrics cache.
+
+Lyrics are cached in a sqlite database in the spotdl folder, keyed by the
+normalized title and artists of the song and its ISRC. Songs without lyrics
+are cached as well (negative caching), with a shorter TTL, so that they
+are not looked up on every provider again on every run.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from spotdl.types.song import Song
+from spotdl.utils.config import get_spotdl_path
+from spotdl.utils.formatter import slugify
+from spotdl.utils.metrics import record_cache
+
+__all__ = [
+    "LyricsCache",
+    "CachedLyrics",
+    "get_lyrics_cache_path",
+    "lyrics_format",
+    "EMBED",
+    "LRC",
+]
+
+# Namespaces of the cache: lyrics embedded in the files and lrc files
+EMBED = "embed"
+LRC = "lrc"
+
+# Lines starting with a timestamp, e.g. `[01:23.45]`
+LRC_TIMESTAMP = re.compile(r"^\[\d{1,2}:\d{2}(?:[.:]\d{1,3})?\]", re.MULTILINE)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedLyrics:
+    """
+    Lyrics stored in the cache.
+    """
+
+    lyrics: Optional[str]
+    provider: Optional[str]
+    format: Optional[str]
+    fetched_at: float
+
+
+def get_lyrics_cache_path() -> Path:
+    """
+    Get the path to the lyrics cache database.
+
+    ### Returns
+    - The path to the database in the spotdl folder.
+    """
+
+    return get_spotdl_path() / "lyrics.db"
+
+
+def lyrics_format(lyrics: str) -> str:
+    """
+    Detect the format of lyrics.
+
+    ### Arguments
+    - lyrics: The lyrics.
+
+    ### Returns
+    - `lrc` if the lyrics have timestamps, `plain` otherwise.
+    """
+
+    return "lrc" if LRC_TIMESTAMP.search(lyrics) else "plain"
+
+
+class LyricsCache:
+    """
+    Thread-safe persistent cache of lyrics lookups.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float = 30 * 24 * 60 * 60,
+        negative_ttl: float = 3 * 24 * 60 * 60,
+    ):
+        """
+        Initialize the cache, the database is opened on first use.
+
+        ### Arguments
+        - path: The path to the sqlite database.
+        - ttl: The number of seconds found lyrics stay valid.
+        - negative_ttl: The number of seconds a lookup without lyrics stays valid.
+        """
+
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def key(song: Song) -> str:
+        """
+        Create the cache key of a song.
+
+        ### Arguments
+        - song: The song.
+
+        ### Returns
+        - The normalized title, artists and ISRC of the song.
+        """
+
+        artists = sorted(
+            slugify(artist) for artist in song.artists or [song.artist] if artist
+        )
+
+        return "|".join([slugify(song.name), ",".join(artists), song.isrc or ""])
+
+    def get(
+        self, song: Song, namespace: str = EMBED, providers: str = ""
+    ) -> Optional[CachedLyrics]:
+        """
+        Get the cached lookup of a song.
+
+        ### Arguments
+        - song: The song.
+        - namespace: `embed` for embedded lyrics, `lrc` for lrc files.
+        - providers: The providers the lookup would use, comma separated.
+            Cached lyrics only count if they came from one of them, and a
+            cached miss if it was looked up with the same providers.
+            Empty to accept lyrics from any provider.
+
+        ### Returns
+        - The cached lookup, `lyrics` is None for a cached miss.
+            None if the song isn't cached or the entry expired.
+
+        ### Notes
+        - Database errors are logged and treated as a cache miss.
+        """
+
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT lyrics, provider, format, fetched_at, providers "
+                        "FROM lyrics WHERE namespace = ? AND key = ?",
+                        (namespace, self.key(song)),
+                    )
+                    .fetchone()
+                )
+        except sqlite3.Error as exc:
+            logger.debug("Failed to read the lyrics cache: %s", exc)
+            row = None
+
+        entry = None
+        if row is not None:
+            lyrics, provider, lyrics_fmt, fetched_at, searched = row
+            age = time.time() - fetched_at
+            if (
+                lyrics is not None
+                and age < self.ttl
+                and self._from_providers(provider, providers)
+            ):
+                entry = CachedLyrics(lyrics, provider, lyrics_fmt, fetched_at)
+            elif lyrics is None and age < self.negative_ttl and searched == providers:
+                entry = CachedLyrics(None, None, None, fetched_at)
+
+        record_cache(f"lyrics-{namespace}", entry is not None)
+
+        return entry
+
+    def set(
+        self,
+        song: Song,
+        lyrics: Optional[str],
+        provider: Optional[str] = None,
+        namespace: str = EMBED,
+        providers: str = "",
+    ) -> None:
+        """
+        Cache the lookup of a song.
+
+        ### Arguments
+        - song: The song.
+        - lyrics: The lyrics, None to cache a miss.
+        - provider: The name of the provider the lyrics came from.
+        - namespace: `embed` for embedded lyrics, `lrc` for lrc files.
+        - providers: The providers used for the lookup.
+
+        ### Notes
+        - Database errors are logged and ignored.
+        """
+
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO lyrics "
+                    "(namespace, key, lyrics, provider, format, fetched_at, providers) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        namespace,
+                        self.key(song),
+                        lyrics,
+                        provider,
+                        lyrics_format(lyrics) if lyrics else None,
+                        time.time(),
+                        providers,
+                    ),
+                )
+                connection.commit()
+        except sqlite3.Error as exc:
+            logger.debug("Failed to write the lyrics cache: %s", exc)
+
+    @staticmethod
+    def _from_providers(provider: Optional[str], providers: str) -> bool:
+        """
+        Check if cached lyrics came from one of the requested providers.
+
+        ### Arguments
+        - provider: The name of the provider the lyrics came from.
+        - providers: The requested providers, comma separated.
+
+        ### Returns
+        - True if the provider was requested or no providers were given.
+        """
+
+        if not providers:
+            return True
+
+        return (provider or "").lower() in providers.lower().split(",")
+
+    def close(self) -> None:
+        """
+        Close the database.
+        """
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database and create the table, has to be called with the lock held.
+
+        ### Returns
+        - The connection.
+        """
+
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                str(self.path), check_same_thread=False, timeout=10
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS lyrics ("
+                "namespace TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "lyrics TEXT, "
+                "provider TEXT, "
+                "format TEXT, "
+                "fetched_at REAL NOT NULL, "
+                "providers TEXT NOT NULL DEFAULT '', "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._connection.commit()
+
+        return self._connection
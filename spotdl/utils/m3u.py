@@ -1,16 +1,23 @@
 """
 Module for creating m3u content and writing it to a file.
+
+The lines are generated one song at a time and streamed to the file. The
+existence checks of `detect_formats` are answered from a listing of each
+folder, taken once, and the file is only replaced when its content changed.
 """
 
+import hashlib
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set
 
 from spotdl.types.song import Song
-from spotdl.utils.formatter import create_file_name, sanitize_string
+from spotdl.utils.formatter import get_file_name_template, sanitize_string
 
 __all__ = [
     "create_m3u_content",
+    "iter_m3u_lines",
     "gen_m3u_files",
     "create_m3u_file",
 ]
@@ -25,6 +32,7 @@ def create_m3u_content(
     restrict: Optional[str] = None,
     short: bool = False,
     detect_formats: Optional[List[str]] = None,
+    paths: Optional[Dict[str, Path]] = None,
 ) -> str:
     """
     Create m3u content and return it as a string.
@@ -36,40 +44,87 @@ def create_m3u_content(
     - restrict: sanitization to apply to the filename
     - short: whether to use the short version of the template
     - detect_formats: the formats to detect for existing files
+    - paths: the paths of the downloaded songs by their url
 
     ### Returns
     - the m3u content as a string
     """
 
-    text = "#EXTM3U\n"
+    return "".join(
+        iter_m3u_lines(
+            song_list,
+            template,
+            file_extension,
+            restrict,
+            short,
+            detect_formats,
+            paths,
+        )
+    )
+
+
+def iter_m3u_lines(
+    song_list: List[Song],
+    template: str,
+    file_extension: str,
+    restrict: Optional[str] = None,
+    short: bool = False,
+    detect_formats: Optional[List[str]] = None,
+    paths: Optional[Dict[str, Path]] = None,
+) -> Iterator[str]:
+    """
+    Generate the lines of the m3u content.
+
+    ### Arguments
+    - song_list: the list of songs
+    - template: the template to use
+    - file_extension: the file extension to use
+    - restrict: sanitization to apply to the filename
+    - short: whether to use the short version of the template
+    - detect_formats: the formats to detect for existing files
+    - paths: the paths of the downloaded songs by their url,
+        used instead of creating the file names again
+
+    ### Returns
+    - iterator over the lines, with their line endings
+    """
+
+    yield "#EXTM3U\n"
+
+    # Compiled once for the whole list
+    extinf_template = get_file_name_template(
+        "#EXTINF:{duration},{album-artist} - {title}"
+    )
+    file_name_template = get_file_name_template(template, restrict)
+    snapshot = _DirectorySnapshot()
 
     for song in song_list:
-        metadata = create_file_name(
-            song, "#EXTINF:{duration},{album-artist} - {title}", ""
-        )
-        text += str(metadata) + "\n"
+        metadata = extinf_template.create(song, "")
+        yield str(metadata) + "\n"
+
+        known_path = paths.get(song.url) if paths and song.url else None
 
         if not detect_formats:
-            file_name = create_file_name(
-                song, template, file_extension, restrict, short
-            )
+            if known_path is not None:
+                file_name = known_path
+            else:
+                file_name = file_name_template.create(song, file_extension, short)
 
-            text += str(file_name) + "\n"
+            yield str(file_name) + "\n"
         else:
+            if known_path is not None:
+                snapshot.add(known_path)
+
             for file_ext in detect_formats:
-                file_name = create_file_name(song, template, file_ext, restrict, short)
+                file_name = file_name_template.create(song, file_ext, short)
 
-                if file_name.exists():
-                    text += str(file_name) + "\n"
+                if snapshot.exists(file_name):
+                    yield str(file_name) + "\n"
                     break
             else:
                 # Runs if no existing file was found (no break)
-                file_name = create_file_name(
-                    song, template, file_extension, restrict, short
-                )
-                text += str(file_name) + "\n"
-
-    return text
+                file_name = file_name_template.create(song, file_extension, short)
+                yield str(file_name) + "\n"
 
 
 def gen_m3u_files(
@@ -80,6 +135,7 @@ def gen_m3u_files(
     restrict: Optional[str] = None,
     short: bool = False,
     detect_formats: Optional[List[str]] = None,
+    paths: Optional[Dict[str, Path]] = None,
 ):
     """
     Create an m3u8 filename from the query.
@@ -92,6 +148,7 @@ def gen_m3u_files(
     - restrict: sanitization to apply to the filename
     - short: whether to use the short version of the template
     - detect_formats: the formats to detect
+    - paths: the paths of the downloaded songs by their url
     """
 
     # If no file name is provided, use the first list's name
@@ -140,6 +197,7 @@ def gen_m3u_files(
                 restrict,
                 short,
                 detect_formats,
+                paths,
             )
     elif "{list[" in file_name and "]}" in file_name:
         # Create a single m3u file for specified song list name
@@ -151,6 +209,7 @@ def gen_m3u_files(
             restrict,
             short,
             detect_formats,
+            paths,
         )
     else:
         # Use the provided file name
@@ -162,6 +221,7 @@ def gen_m3u_files(
             restrict,
             short,
             detect_formats,
+            paths,
         )
 
 
@@ -173,7 +233,8 @@ def create_m3u_file(
     restrict: Optional[str] = None,
     short: bool = False,
     detect_formats: Optional[List[str]] = None,
-) -> str:
+    paths: Optional[Dict[str, Path]] = None,
+) -> Path:
     """
     Create the m3u file.
 
@@ -185,25 +246,123 @@ def create_m3u_file(
     - restrict: sanitization to apply to the filename
     - short: whether to use the short version of the template
     - detect_formats: the formats to detect
+    - paths: the paths of the downloaded songs by their url
 
     ### Returns
-    - the m3u content as a string
-    """
+    - the path of the m3u file
 
-    m3u_content = create_m3u_content(
-        song_list,
-        template,
-        file_extension,
-        restrict,
-        short,
-        detect_formats,
-    )
+    ### Notes
+    - The content is written to a temporary file next to the m3u file,
+        which replaces it only if the content changed.
+    """
 
     file_path = Path(
         *(sanitize_string(part) for part in Path(file_name).parts)
     ).absolute()
 
-    with open(file_path, "w", encoding="utf-8") as m3u_file:
-        m3u_file.write(m3u_content)
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    digest = hashlib.sha256()
+    try:
+        with open(temp_path, "w", encoding="utf-8") as m3u_file:
+            for line in iter_m3u_lines(
+                song_list,
+                template,
+                file_extension,
+                restrict,
+                short,
+                detect_formats,
+                paths,
+            ):
+                m3u_file.write(line)
+                digest.update(line.encode("utf-8"))
+
+        if _hash_file(file_path) == digest.hexdigest():
+            logger.debug("M3U file %s is up to date", file_path)
+        else:
+            os.replace(temp_path, file_path)
+    finally:
+        # Left over when the file was up to date or writing failed
+        temp_path.unlink(missing_ok=True)
+
+    return file_path
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    """
+    Hash the content of a file.
+
+    ### Arguments
+    - path: the file
+
+    ### Returns
+    - the hex digest, or None if the file doesn't exist
+    """
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+
+    return digest.hexdigest()
+
+
+class _DirectorySnapshot:
+    """
+    Listing of the folders of the songs, taken once per folder,
+    to check if files exist without a system call per file.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty snapshot.
+        """
+
+        self._folders: Dict[Path, Set[str]] = {}
+
+    def exists(self, path: Path) -> bool:
+        """
+        Check if a file existed when its folder was listed.
+
+        ### Arguments
+        - path: the file
+
+        ### Returns
+        - whether the file exists
+        """
+
+        return path.name in self._list(path.parent)
+
+    def add(self, path: Path) -> None:
+        """
+        Add a file that is known to exist.
+
+        ### Arguments
+        - path: the file
+        """
+
+        self._list(path.parent).add(path.name)
+
+    def _list(self, folder: Path) -> Set[str]:
+        """
+        Get the names of the files in a folder, listing it on first use.
+
+        ### Arguments
+        - folder: the folder
+
+        ### Returns
+        - the names, empty if the folder doesn't exist
+        """
+
+        names = self._folders.get(folder)
+        if names is None:
+            try:
+                names = set(os.listdir(folder))
+            except OSError:
+                names = set()
+
+            self._folders[folder] = names
 
-    return m3u_content
+        return names
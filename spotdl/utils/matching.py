@@ -35,6 +35,9 @@
     "calc_name_match",
     "calc_time_match",
     "calc_album_match",
+    "filter_candidates",
+    "score_candidates",
+    "order_results",
 ]
 
 logger = logging.getLogger(__name__)
@@ -650,25 +653,25 @@ def calc_album_match(song: Song, result: Result) -> float:
     return ratio(slugify(song.album_name), slugify(result.album))
 
 
-def order_results(
+def filter_candidates(
     results: List[Result],
     song: Song,
     search_query: Optional[str] = None,
-) -> Dict[Result, float]:
+) -> Dict[Result, Tuple[float, float, float]]:
     """
-    Order results.
+    Calculate the artists, name and time match of the results
+    and drop the ones that can't be a match for the song.
 
     ### Arguments
-    - results: The results to order.
-    - song: The song to order for.
+    - results: The results to filter.
+    - song: The song to filter for.
     - search_query: The search query.
 
     ### Returns
-    - The ordered results.
+    - The remaining results with their artists, name and time match.
     """
 
-    # Assign an overall avg match value to each result
-    links_with_match_value = {}
+    candidates: Dict[Result, Tuple[float, float, float]] = {}
 
     # Iterate over all results
     for result in results:
@@ -748,10 +751,6 @@ def order_results(
         )
         debug(song.song_id, result.result_id, f"Final name match: {name_match}")
 
-        # Calculate album match
-        album_match = calc_album_match(song, result)
-        debug(song.song_id, result.result_id, f"Final album match: {album_match}")
-
         # Calculate time match
         time_match = calc_time_match(song, result)
         debug(song.song_id, result.result_id, f"Final time match: {time_match}")
@@ -774,6 +773,43 @@ def order_results(
             )
             continue
 
+        # Skip results with time match lower than 25%
+        if time_match < 25:
+            debug(
+                song.song_id,
+                result.result_id,
+                "Skipping result due to time match lower than 25%",
+            )
+            continue
+
+        candidates[result] = (artists_match, name_match, time_match)
+
+    return candidates
+
+
+def score_candidates(
+    candidates: Dict[Result, Tuple[float, float, float]],
+    song: Song,
+) -> Dict[Result, float]:
+    """
+    Calculate the final match of the results that passed `filter_candidates`.
+
+    ### Arguments
+    - candidates: The results with their artists, name and time match.
+    - song: The song to score for.
+
+    ### Returns
+    - The results with their average match.
+    """
+
+    # Assign an overall avg match value to each result
+    links_with_match_value = {}
+
+    for result, (artists_match, name_match, time_match) in candidates.items():
+        # Calculate album match
+        album_match = calc_album_match(song, result)
+        debug(song.song_id, result.result_id, f"Final album match: {album_match}")
+
         # Calculate total match
         average_match = (artists_match + name_match) / 2
         debug(song.song_id, result.result_id, f"Average match: {average_match}")
@@ -793,15 +829,6 @@ def order_results(
                 f"Average match /w album match: {average_match}",
             )
 
-        # Skip results with time match lower than 25%
-        if time_match < 25:
-            debug(
-                song.song_id,
-                result.result_id,
-                "Skipping result due to time match lower than 25%",
-            )
-            continue
-
         # If the time match is lower than 50%
         # and the average match is lower than 75%
         # we skip the result
@@ -847,3 +874,23 @@ def order_results(
         links_with_match_value[result] = average_match
 
     return links_with_match_value
+
+
+def order_results(
+    results: List[Result],
+    song: Song,
+    search_query: Optional[str] = None,
+) -> Dict[Result, float]:
+    """
+    Order results.
+
+    ### Arguments
+    - results: The results to order.
+    - song: The song to order for.
+    - search_query: The search query.
+
+    ### Returns
+    - The ordered results.
+    """
+
+    return score_candidates(filter_candidates(results, song, search_query), song)
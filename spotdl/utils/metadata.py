@@ -11,15 +11,16 @@
 """
 
 import base64
+import copy
 import logging
 import re
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-import requests
 from mutagen._file import File
+from mutagen._tags import PaddingInfo
 from mutagen.flac import Picture
-from mutagen.id3 import ID3
+from mutagen.id3 import ID3, Frames, ID3NoHeaderError
 from mutagen.id3._frames import (
     APIC,
     COMM,
@@ -43,9 +44,20 @@
 from mutagen.wave import WAVE
 
 from spotdl.types.song import Song
-from spotdl.utils.config import GlobalConfig
+from spotdl.utils.cache import TTLCache
+from spotdl.utils.cover_cache import CoverCache, CoverImage, hash_cover
 from spotdl.utils.formatter import to_ms
+from spotdl.utils.http import get_http_client
+from spotdl.utils.image import detect_mime, normalize_cover
 from spotdl.utils.lrc import remomve_lrc
+from spotdl.utils.tags import (
+    M4A_TAG_PRESET,
+    MP3_TAG_PRESET,
+    TAG_PRESET,
+    TAG_TO_SONG,
+    read_tags,
+)
+from spotdl.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -60,92 +72,30 @@
     "LRC_REGEX",
     "embed_metadata",
     "embed_cover",
+    "get_cover",
     "embed_lyrics",
     "get_file_metadata",
 ]
 
 
+# Padding added after the tags when a file has to be rewritten anyway,
+# so that updating the tags later on doesn't rewrite it again
+TAG_PADDING = 16 * 1024
+
+# Larger padding is shrunk back to TAG_PADDING
+MAX_TAG_PADDING = 256 * 1024
+
+# Cover images encoded for each file type, shared by the files
+# of an album instead of being encoded again for every file
+_cover_payloads: TTLCache[Any] = TTLCache(maxsize=16, ttl=60 * 60)
+
+
 class MetadataError(Exception):
     """
     Base class for all exceptions related to metadata and id3 embedding.
     """
 
 
-# Apple has specific tags - see mutagen docs -
-# http://mutagen.readthedocs.io/en/latest/api/mp4.html
-M4A_TAG_PRESET = {
-    "album": "\xa9alb",
-    "artist": "\xa9ART",
-    "date": "\xa9day",
-    "title": "\xa9nam",
-    "year": "\xa9day",
-    "comment": "\xa9cmt",
-    "group": "\xa9grp",
-    "writer": "\xa9wrt",
-    "genre": "\xa9gen",
-    "tracknumber": "trkn",
-    "trackcount": "trkn",
-    "albumartist": "aART",
-    "discnumber": "disk",
-    "disccount": "disk",
-    "cpil": "cpil",
-    "albumart": "covr",
-    "encodedby": "\xa9too",
-    "copyright": "cprt",
-    "tempo": "tmpo",
-    "lyrics": "\xa9lyr",
-    "explicit": "rtng",
-    "woas": "----:spotdl:WOAS",
-    "isrc": "----:spotdl:ISRC",
-}
-
-MP3_TAG_PRESET = {
-    "album": "TALB",
-    "artist": "TPE1",
-    "date": "TDRC",
-    "title": "TIT2",
-    "year": "TDRC",
-    "comment": "COMM::XXX",
-    "group": "TIT1",
-    "writer": "TEXT",
-    "genre": "TCON",
-    "tracknumber": "TRCK",
-    "trackcount": "TRCK",
-    "albumartist": "TPE2",
-    "discnumber": "TPOS",
-    "disccount": "TPOS",
-    "cpil": "TCMP",
-    "albumart": "APIC",
-    "encodedby": "TENC",
-    "copyright": "TCOP",
-    "tempo": "TBPM",
-    "lyrics": "USLT::XXX",
-    "woas": "WOAS",
-    "isrc": "TSRC",
-    "explicit": "NULL",
-}
-
-TAG_PRESET = {key: key for key in M4A_TAG_PRESET}
-
-TAG_TO_SONG = {
-    "title": "name",
-    "artist": "artists",
-    "album": "album_name",
-    "albumartist": "album_artist",
-    "genre": "genres",
-    "discnumber": "disc_number",
-    "year": "year",
-    "date": "date",
-    "tracknumber": "track_number",
-    "encodedby": "publisher",
-    "woas": "url",
-    "comment": "download_url",
-    "isrc": "isrc",
-    "copyright": "copyright_text",
-    "lyrics": "lyrics",
-    "albumart": "album_art",
-}
-
 M4A_TO_SONG = {
     value: TAG_TO_SONG.get(key)
     for key, value in M4A_TAG_PRESET.items()
@@ -160,11 +110,21 @@ class MetadataError(Exception):
 LRC_REGEX = re.compile(r"(\[\d{2}:\d{2}.\d{2,3}\])")
 
 
+@traced(
+    "embed_metadata",
+    "metadata",
+    attributes=lambda output_file, song, *_, **__: {
+        "song_id": song.url or song.display_name,
+        "output_file": str(output_file),
+    },
+)
 def embed_metadata(
     output_file: Path,
     song: Song,
     id3_separator: str = "/",
     skip_album_art: Optional[bool] = False,
+    cover_cache: Optional[CoverCache] = None,
+    cover_max_size: Optional[int] = None,
 ):
     """
     Set ID3 tags for generic files (FLAC, OPUS, OGG)
@@ -174,28 +134,126 @@ def embed_metadata(
     - song: Song object.
     - id3_separator: The separator used for the id3 tags.
     - skip_album_art: Boolean to skip album art embedding.
+    - cover_cache: Cache to get the album art from.
+    - cover_max_size: Crop the album art to a square of at most this size
+        and recompress it to JPEG, None to embed it as it is.
     """
 
     # Get the file extension for the output file
     encoding = output_file.suffix[1:]
 
     if encoding == "wav":
-        embed_wav_file(output_file, song)
+        embed_wav_file(output_file, song, cover_cache, cover_max_size)
         return
 
-    # Get the tag preset for the file extension
-    tag_preset = TAG_PRESET if encoding != "m4a" else M4A_TAG_PRESET
+    if encoding == "mp3":
+        # All frames are built in memory and written with a single save
+        audio_file = _load_id3(output_file)
+        _set_id3_metadata(audio_file, song)
+    else:
+        audio_file = _load_file(output_file)
+        _set_metadata(audio_file, song, encoding)
+
+    if not skip_album_art:
+        # Embed album art
+        audio_file = embed_cover(
+            audio_file, song, encoding, cover_cache, cover_max_size
+        )
+
+    # Embed lyrics
+    audio_file = embed_lyrics(audio_file, song, encoding)
+
+    # Mp3 specific encoding
+    if encoding == "mp3":
+        audio_file.save(
+            str(output_file.resolve()),
+            v23_sep=id3_separator,
+            v2_version=3,
+            padding=_tag_padding,
+        )
+    else:
+        audio_file.save(padding=_tag_padding)
+
+
+def _tag_padding(info: PaddingInfo) -> int:
+    """
+    Choose the padding after the tags. The current padding is kept if the
+    new tags fit, so the file doesn't have to be rewritten. When it has to be
+    rewritten anyway, enough padding is added for the tags to grow later on.
+
+    ### Arguments
+    - info: The padding information from mutagen.
+
+    ### Returns
+    - The number of bytes of padding.
+    """
+
+    if 0 <= info.padding <= MAX_TAG_PADDING:
+        return info.padding
+
+    return TAG_PADDING
+
+
+def _load_file(output_file: Path):
+    """
+    Load a FLAC, Ogg, Opus or M4A file.
+
+    ### Arguments
+    - output_file: Path to the file.
+
+    ### Returns
+    - The mutagen file object.
+
+    ### Errors
+    - MetadataError if the file can't be loaded.
+    """
 
     try:
-        audio_file = File(str(output_file.resolve()), easy=encoding == "mp3")
+        audio_file = File(str(output_file.resolve()))
+    except Exception as exc:
+        raise MetadataError("Unable to load file.") from exc
 
-        if audio_file is None:
-            raise MetadataError(
-                f"Unrecognized file format for {output_file} from {song.url}"
-            )
+    if audio_file is None:
+        raise MetadataError(f"Unrecognized file format for {output_file}")
+
+    return audio_file
+
+
+def _load_id3(output_file: Path) -> ID3:
+    """
+    Load the ID3 tags of an MP3 file.
+
+    ### Arguments
+    - output_file: Path to the file.
+
+    ### Returns
+    - The tags, empty if the file doesn't have any yet.
+
+    ### Errors
+    - MetadataError if the file can't be loaded.
+    """
+
+    try:
+        return ID3(str(output_file.resolve()))
+    except ID3NoHeaderError:
+        return ID3()
     except Exception as exc:
         raise MetadataError("Unable to load file.") from exc
 
+
+def _set_metadata(audio_file, song: Song, encoding: str) -> None:
+    """
+    Set the basic metadata of a FLAC, Ogg, Opus or M4A file.
+
+    ### Arguments
+    - audio_file: Audio file object.
+    - song: Song object.
+    - encoding: The file type.
+    """
+
+    # Get the tag preset for the file extension
+    tag_preset = TAG_PRESET if encoding != "m4a" else M4A_TAG_PRESET
+
     # Embed basic metadata
     audio_file[tag_preset["artist"]] = song.artists
     audio_file[tag_preset["albumartist"]] = (
@@ -216,7 +274,7 @@ def embed_metadata(
     if song.copyright_text:
         audio_file[tag_preset["copyright"]] = song.copyright_text
 
-    if song.download_url and encoding != "mp3":
+    if song.download_url:
         audio_file[tag_preset["comment"]] = song.download_url
 
     # Embed some metadata in format specific ways
@@ -233,109 +291,197 @@ def embed_metadata(
         audio_file[tag_preset["tracknumber"]] = [(song.track_number, song.tracks_count)]
         audio_file[tag_preset["explicit"]] = (4 if song.explicit is True else 2,)
         audio_file[tag_preset["woas"]] = song.url.encode("utf-8")
-    elif encoding == "mp3":
-        audio_file["tracknumber"] = f"{str(song.track_number)}/{str(song.tracks_count)}"
-        audio_file["discnumber"] = f"{str(song.disc_number)}/{str(song.disc_count)}"
-        if song.isrc:
-            audio_file["isrc"] = song.isrc
-    # Mp3 specific encoding
-    if encoding == "mp3":
-        if id3_separator != "/":
-            audio_file.save(v23_sep=id3_separator, v2_version=3)
-        else:
-            audio_file.save(v2_version=3)
 
-        audio_file = ID3(str(output_file.resolve()))
 
-        audio_file.add(WOAS(encoding=3, url=song.url))
+def _set_id3_metadata(tags: ID3, song: Song) -> None:
+    """
+    Set the basic metadata of an MP3 file.
 
-        if song.download_url:
-            audio_file.add(COMM(encoding=3, text=song.download_url))
+    ### Arguments
+    - tags: The ID3 tags.
+    - song: Song object.
+    """
 
-        if song.popularity:
-            audio_file.add(
-                POPM(
-                    rating=int(song.popularity * 255 / 100),
-                )
+    def set_text(key: str, text: Any) -> None:
+        frame_id = MP3_TAG_PRESET[key]
+        tags.setall(frame_id, [Frames[frame_id](encoding=3, text=text)])
+
+    set_text("artist", song.artists)
+    set_text("albumartist", song.album_artist if song.album_artist else song.artist)
+    set_text("title", song.name)
+    set_text("date", song.date)
+    if song.publisher:
+        set_text("encodedby", song.publisher)
+
+    # Embed metadata that isn't always present
+    if song.album_name:
+        set_text("album", song.album_name)
+
+    if song.genres:
+        set_text("genre", song.genres[0].title())
+
+    if song.copyright_text:
+        set_text("copyright", song.copyright_text)
+
+    set_text("tracknumber", f"{str(song.track_number)}/{str(song.tracks_count)}")
+    set_text("discnumber", f"{str(song.disc_number)}/{str(song.disc_count)}")
+    if song.isrc:
+        set_text("isrc", song.isrc)
+
+    tags.add(WOAS(encoding=3, url=song.url))
+
+    if song.download_url:
+        tags.add(COMM(encoding=3, text=song.download_url))
+
+    if song.popularity:
+        tags.add(
+            POPM(
+                rating=int(song.popularity * 255 / 100),
             )
+        )
 
-        if song.year:
-            audio_file.add(TYER(encoding=3, text=str(song.year)))
+    if song.year:
+        tags.add(TYER(encoding=3, text=str(song.year)))
 
-    if not skip_album_art:
-        # Embed album art
-        audio_file = embed_cover(audio_file, song, encoding)
 
-    # Embed lyrics
-    audio_file = embed_lyrics(audio_file, song, encoding)
+def get_cover(
+    url: str,
+    cover_cache: Optional[CoverCache] = None,
+    max_size: Optional[int] = None,
+) -> Optional[CoverImage]:
+    """
+    Download a cover and normalize it, or get it from the cache.
 
-    # Mp3 specific encoding
-    if encoding == "mp3":
-        audio_file.save(v23_sep=id3_separator, v2_version=3)
+    ### Arguments
+    - url: The url of the cover.
+    - cover_cache: The cover cache, None to always download the cover.
+    - max_size: Crop the cover to a square of at most this size and recompress
+        it to JPEG, None to keep the cover as it is.
+
+    ### Returns
+    - The cover or None if it couldn't be downloaded.
+    """
+
+    def download(cover_url: str) -> Optional[bytes]:
+        response = get_http_client().get(cover_url)
+        if not response.ok:
+            logger.debug("Failed to download cover %s: %s", url, response.status_code)
+            return None
+
+        return normalize_cover(response.content, max_size)[0]
+
+    if cover_cache is not None:
+        # The processed covers are cached, so each one is processed only once
+        key = f"{url}#{max_size}" if max_size else url
+
+        return cover_cache.fetch(key, lambda _: download(url))
+
+    try:
+        data = download(url)
+    except Exception:
+        return None
+
+    if data is None:
+        return None
+
+    return CoverImage(data, hash_cover(data), detect_mime(data))
+
+
+def _get_cover_payload(cover: CoverImage, encoding: str) -> Any:
+    """
+    Get the cover encoded for a file type, encoding it only once per cover.
+
+    ### Arguments
+    - cover: The cover.
+    - encoding: The file type.
+
+    ### Returns
+    - The `Picture`, the base64 picture block, the `MP4Cover` or the `APIC` frame.
+    """
+
+    key = (cover.digest, encoding)
+    payload = _cover_payloads.get(key)
+    if payload is not None:
+        return payload
+
+    if encoding in ["flac", "ogg", "opus"]:
+        picture = Picture()
+        picture.type = 3
+        picture.desc = "Cover"
+        picture.mime = cover.mime
+        picture.data = cover.data
+
+        if encoding == "flac":
+            payload = picture
+        else:
+            payload = base64.b64encode(picture.write()).decode("ascii")
+    elif encoding == "m4a":
+        payload = MP4Cover(
+            cover.data,
+            imageformat=(
+                MP4Cover.FORMAT_PNG
+                if cover.mime == "image/png"
+                else MP4Cover.FORMAT_JPEG
+            ),
+        )
     else:
-        audio_file.save()
+        payload = APIC(
+            encoding=3,
+            mime=cover.mime,
+            type=3,
+            desc="Cover",
+            data=cover.data,
+        )
+
+    _cover_payloads.set(key, payload)
 
+    return payload
 
-def embed_cover(audio_file, song: Song, encoding: str):
+
+def embed_cover(
+    audio_file,
+    song: Song,
+    encoding: str,
+    cover_cache: Optional[CoverCache] = None,
+    max_size: Optional[int] = None,
+):
     """
     Embed the album art in the audio file.
 
     ### Arguments
     - audio_file: Audio file object.
     - song: Song object.
+    - encoding: The file type.
+    - cover_cache: Cache to get the album art from.
+    - max_size: The maximum size of the album art, see `get_cover`.
     """
 
     if not song.cover_url:
         return audio_file
 
     # Try to download the cover art
-    try:
-        cover_data = requests.get(
-            song.cover_url,
-            timeout=10,
-            proxies=GlobalConfig.get_parameter("proxies"),
-        ).content
-    except Exception:
+    cover = get_cover(song.cover_url, cover_cache, max_size)
+    if cover is None:
         return audio_file
 
-    # Create the image object for the file type
-    if encoding in ["flac", "ogg", "opus"]:
-        picture = Picture()
-        picture.type = 3
-        picture.desc = "Cover"
-        picture.mime = "image/jpeg"
-        picture.data = cover_data
-
-        if encoding in ["ogg", "opus"]:
-            image_data = picture.write()
-            encoded_data = base64.b64encode(image_data)
-            vcomment_value = encoded_data.decode("ascii")
-            if "metadata_block_picture" in audio_file.keys():
-                audio_file.pop("metadata_block_picture")
-            audio_file["metadata_block_picture"] = [vcomment_value]
-        elif encoding == "flac":
-            if audio_file.pictures:
-                audio_file.clear_pictures()
-            audio_file.add_picture(picture)
+    # The payloads are shared between files, the mutable ones are copied
+    payload = _get_cover_payload(cover, encoding)
+    if encoding in ["ogg", "opus"]:
+        if "metadata_block_picture" in audio_file.keys():
+            audio_file.pop("metadata_block_picture")
+        audio_file["metadata_block_picture"] = [payload]
+    elif encoding == "flac":
+        if audio_file.pictures:
+            audio_file.clear_pictures()
+        audio_file.add_picture(copy.copy(payload))
     elif encoding == "m4a":
         if M4A_TAG_PRESET["albumart"] in audio_file.keys():
             audio_file.pop(M4A_TAG_PRESET["albumart"])
-        audio_file[M4A_TAG_PRESET["albumart"]] = [
-            MP4Cover(
-                cover_data,
-                imageformat=MP4Cover.FORMAT_JPEG,
-            )
-        ]
+        audio_file[M4A_TAG_PRESET["albumart"]] = [payload]
     elif encoding == "mp3":
         if "APIC:Cover" in audio_file.keys():
             audio_file.pop("APIC:Cover")
-        audio_file["APIC"] = APIC(
-            encoding=3,
-            mime="image/jpeg",
-            type=3,
-            desc="Cover",
-            data=cover_data,
-        )
+        audio_file["APIC"] = copy.copy(payload)
 
     return audio_file
 
@@ -414,170 +560,23 @@ def get_file_metadata(path: Path, id3_separator: str = "/") -> Optional[Dict[str
     - MetadataError: If the file is not a valid audio file.
     """
 
-    if path.exists() is False:
-        raise OSError(f"File not found: {path}")
+    return read_tags(path, id3_separator=id3_separator)
 
-    audio_file = File(str(path.resolve()))
 
-    if audio_file is None or audio_file == {}:
-        return None
-
-    song_meta: Dict[str, Any] = {}
-    for key in TAG_PRESET:
-        if path.suffix == ".m4a":
-            val = audio_file.get(M4A_TAG_PRESET[key])
-        elif path.suffix == ".mp3":
-            val = audio_file.get(MP3_TAG_PRESET[key])
-        else:
-            val = audio_file.get(key)
-
-        # Cover art is a special case and
-        # has to be handled before checking the val
-        # M4A is handled in the m4a section since it
-        # has data in the val variable
-        if key == "albumart":
-            if path.suffix == ".mp3":
-                cover = audio_file.get("APIC:Cover")
-                if cover:
-                    song_meta["album_art"] = cover.data
-                else:
-                    song_meta["album_art"] = None
-
-                continue
-
-            if path.suffix == ".flac":
-                if audio_file.pictures:
-                    song_meta["album_art"] = audio_file.pictures[0].data
-                else:
-                    song_meta["album_art"] = None
-
-                continue
-
-            if path.suffix in [".ogg", ".opus"]:
-                pictures = audio_file.get("metadata_block_picture")
-                if pictures and pictures[0]:
-                    song_meta["album_art"] = pictures[0]
-                else:
-                    song_meta["album_art"] = None
-
-                continue
-
-        # If the tag is empty, skip it
-        if val is None:
-            # If the tag is empty but it's key is in the
-            # song object, set it to None
-            empty_key = TAG_TO_SONG.get(key)
-            if empty_key:
-                song_meta[empty_key] = None
-
-            continue
-
-        # MP3 specific decoding
-        if path.suffix == ".mp3":
-            if key == "woas":
-                song_meta["url"] = val.url
-            elif key == "comment":
-                song_meta["download_url"] = val.text[0]
-            elif key == "year":
-                song_meta["year"] = int(str(val.text[0])[:4])
-            elif key == "date":
-                song_meta["date"] = str(val.text[0])
-            elif key in ["tracknumber", "trackcount"]:
-                count = val.text[0].split(id3_separator)
-                if len(count) == 2:
-                    song_meta["track_number"] = int(count[0])
-                    song_meta["tracks_count"] = int(count[1])
-                else:
-                    song_meta["track_number"] = val.text[0]
-            elif key in ["discnumber", "disccount"]:
-                count = val.text[0].split(id3_separator)
-                if len(count) == 2:
-                    song_meta["disc_number"] = int(count[0])
-                    song_meta["disc_count"] = int(count[1])
-                else:
-                    song_meta["disc_number"] = val.text[0]
-            elif key == "artist":
-                artists_val: str = (
-                    val.text[0] if isinstance(val.text, list) else val.text
-                )
-                song_meta["artists"] = artists_val.split(id3_separator)
-            else:
-                meta_key = TAG_TO_SONG.get(key)
-                if meta_key and song_meta.get(meta_key) is None:
-                    song_meta[meta_key] = (
-                        val.text[0]
-                        if isinstance(val.text, list) and len(val.text) == 1
-                        else val.text
-                    )
-
-        # M4A specific decoding
-        elif path.suffix == ".m4a":
-            if key == "artist":
-                song_meta["artists"] = val
-            elif key == "woas":
-                song_meta["url"] = val[0].decode("utf-8")
-            elif key == "explicit":
-                song_meta["explicit"] = val == [4] if val else None
-            elif key == "year":
-                song_meta["year"] = int(str(val[0])[:4])
-            elif key == "discnumber":
-                song_meta["disc_number"] = val[0][0]
-                song_meta["disc_count"] = val[0][1]
-            elif key == "tracknumber":
-                song_meta["track_number"] = val[0][0]
-                song_meta["tracks_count"] = val[0][1]
-            else:
-                meta_key = TAG_TO_SONG.get(key)
-                if meta_key:
-                    song_meta[meta_key] = (
-                        val[0] if isinstance(val, list) and len(val) == 1 else val
-                    )
-
-        # FLAC, OGG, OPUS specific decoding
-        else:
-            if key == "artist":
-                song_meta["artists"] = val
-            elif key == "tracknumber":
-                song_meta["track_number"] = int(val[0])
-            elif key == "discnumber":
-                song_meta["disc_count"] = int(val[0])
-                song_meta["disc_number"] = int(val[0])
-            else:
-                meta_key = TAG_TO_SONG.get(key)
-                if meta_key:
-                    song_meta[meta_key] = (
-                        val[0] if isinstance(val, list) and len(val) == 1 else val
-                    )
-
-    # Make sure that artists is a list
-    if isinstance(song_meta["artists"], str):
-        song_meta["artists"] = [song_meta["artists"]]
-    elif song_meta["artists"] is not None:
-        song_meta["artists"] = list(song_meta["artists"])
-    else:
-        song_meta["artists"] = []
-
-    # Make sure that genres is a list
-    if isinstance(song_meta["genres"], str):
-        song_meta["genres"] = [song_meta["genres"]]
-
-    # Add main artist to the song meta object
-    if song_meta["artists"]:
-        song_meta["artist"] = song_meta["artists"][0]
-    else:
-        song_meta["artist"] = None
-
-    return song_meta
-
-
-def embed_wav_file(output_file: Path, song: Song):
+def embed_wav_file(
+    output_file: Path,
+    song: Song,
+    cover_cache: Optional[CoverCache] = None,
+    cover_max_size: Optional[int] = None,
+):
     """
     Embeds the song metadata into the wav file
 
     ### Arguments
     - output_file: The output file path
     - song: The song object
-    - id3_separator: The separator used for the id3 tags
+    - cover_cache: Cache to get the album art from
+    - cover_max_size: The maximum size of the album art, see `get_cover`
     """
     audio = WAVE(output_file)
     if audio is None:
@@ -617,15 +616,9 @@ def embed_wav_file(output_file: Path, song: Song):
         )
 
     if song.cover_url:
-        try:
-            cover_data = requests.get(song.cover_url, timeout=10).content
-            audio.tags.add(  # type: ignore
-                APIC(
-                    encoding=3, mime="image/jpeg", type=3, desc="Cover", data=cover_data
-                )
-            )
-        except Exception:
-            pass
+        cover = get_cover(song.cover_url, cover_cache, cover_max_size)
+        if cover is not None:
+            audio.tags.add(copy.copy(_get_cover_payload(cover, "wav")))  # type: ignore
 
     if song.lyrics:
         # Check if the lyrics are in lrc format
@@ -0,0 +1,443 @@
+"""
+Module for collecting run metrics.
+
+The downloader records how long each song spends in each stage
+(search, lyrics, download, convert, sponsorblock, embed, lrc), how many bytes
+were downloaded and how much CPU time ffmpeg used. At the end of a run
+the metrics are summarized as latency percentiles and throughput.
+"""
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Union
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # resource module is not available on Windows
+    resource = None  # type: ignore
+
+__all__ = [
+    "RunMetrics",
+    "CacheStats",
+    "SupportsCacheInfo",
+    "cache_stats",
+    "percentile",
+    "register_cache",
+    "record_cache",
+]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    Calculate the percentile of a list of values using linear interpolation.
+
+    ### Arguments
+    - values: The values.
+    - pct: The percentile, between 0 and 100.
+
+    ### Returns
+    - The percentile or None if there are no values.
+    """
+
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = position - lower
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def _get_children_cpu_time() -> Optional[float]:
+    """
+    Get the CPU time used by terminated child processes (ffmpeg).
+
+    ### Returns
+    - The user and system time in seconds, or None if not supported.
+    """
+
+    if resource is None:
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    return usage.ru_utime + usage.ru_stime
+
+
+class SupportsCacheInfo(Protocol):
+    """
+    A cache with a `cache_info` method like `functools.lru_cache`,
+    returning a named tuple with at least the hits and misses.
+    """
+
+    def cache_info(self) -> Any:
+        """
+        Get the hits and misses of the cache.
+
+        ### Returns
+        - Named tuple with the hits and misses.
+        """
+
+
+class CacheStats:
+    """
+    Thread-safe hit and miss counters for the caches used by spotdl.
+    """
+
+    def __init__(self):
+        """
+        Initialize the counters.
+        """
+
+        self._lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.lru_caches: Dict[str, SupportsCacheInfo] = {}
+
+    def record(self, name: str, hit: bool) -> None:
+        """
+        Record a cache lookup.
+
+        ### Arguments
+        - name: The name of the cache.
+        - hit: Whether the lookup was a hit.
+        """
+
+        with self._lock:
+            if hit:
+                self.hits[name] += 1
+            else:
+                self.misses[name] += 1
+
+    def register(self, name: str, func: SupportsCacheInfo) -> None:
+        """
+        Register a function decorated with `functools.lru_cache`,
+        or another cache with a `cache_info` method.
+
+        ### Arguments
+        - name: The name of the cache.
+        - func: The cached function or the cache.
+        """
+
+        self.lru_caches[name] = func
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the current counters for all caches.
+
+        ### Returns
+        - Dictionary with the cache name as key and the hits and misses as value.
+        """
+
+        with self._lock:
+            stats = {
+                name: {"hits": self.hits[name], "misses": self.misses[name]}
+                for name in set(self.hits) | set(self.misses)
+            }
+
+        for name, func in self.lru_caches.items():
+            info = func.cache_info()
+            stats[name] = {"hits": info.hits, "misses": info.misses}
+
+        return stats
+
+
+cache_stats = CacheStats()
+
+
+def record_cache(name: str, hit: bool) -> None:
+    """
+    Record a cache lookup in the global cache stats.
+
+    ### Arguments
+    - name: The name of the cache.
+    - hit: Whether the lookup was a hit.
+    """
+
+    cache_stats.record(name, hit)
+
+
+def register_cache(name: str, func: SupportsCacheInfo) -> None:
+    """
+    Register an lru cached function, or another cache with a `cache_info`
+    method, in the global cache stats.
+
+    ### Arguments
+    - name: The name of the cache.
+    - func: The cached function or the cache.
+    """
+
+    cache_stats.register(name, func)
+
+
+class RunMetrics:
+    """
+    Thread-safe metrics for a single downloader run.
+    """
+
+    def __init__(self):
+        """
+        Initialize the metrics and start the run clock.
+        """
+
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.stage_times: Dict[str, List[float]] = defaultdict(list)
+        self.song_stages: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.song_latencies: Dict[str, float] = {}
+        self.song_outcomes: Dict[str, str] = {}
+        self.bytes_downloaded = 0
+        self.circuit_events: Dict[str, Counter] = defaultdict(Counter)
+
+        self._children_cpu_start = _get_children_cpu_time()
+        self._cache_start = cache_stats.snapshot()
+        self.ffmpeg_cpu_time: Optional[float] = None
+        self.cache_stats: Dict[str, Dict[str, Any]] = {}
+
+    def record_stage(
+        self, stage: str, seconds: float, song_id: Optional[str] = None
+    ) -> None:
+        """
+        Record the time spent in a stage.
+
+        ### Arguments
+        - stage: The name of the stage.
+        - seconds: The time spent in the stage.
+        - song_id: The identifier of the song, if any.
+        """
+
+        with self._lock:
+            self.stage_times[stage].append(seconds)
+            if song_id is not None:
+                song_stages = self.song_stages[song_id]
+                song_stages[stage] = song_stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, stage: str, song_id: Optional[str] = None) -> Iterator[None]:
+        """
+        Measure the time spent in the context manager as a stage.
+
+        ### Arguments
+        - stage: The name of the stage.
+        - song_id: The identifier of the song, if any.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start, song_id)
+
+    def record_song(self, song_id: str, seconds: float, success: bool) -> None:
+        """
+        Record the total latency of a song.
+
+        ### Arguments
+        - song_id: The identifier of the song.
+        - seconds: The time it took to process the song.
+        - success: Whether the song ended up with a file.
+
+        ### Notes
+        - Successful songs without a `download` stage are counted as skipped.
+        """
+
+        with self._lock:
+            if not success:
+                outcome = "failed"
+            elif "download" in self.song_stages.get(song_id, {}):
+                outcome = "downloaded"
+            else:
+                outcome = "skipped"
+
+            self.song_latencies[song_id] = seconds
+            self.song_outcomes[song_id] = outcome
+
+    def record_circuit(self, provider: str, event: str) -> None:
+        """
+        Record a circuit breaker event of a provider.
+
+        ### Arguments
+        - provider: The name of the provider.
+        - event: The new state of the circuit, or `rejected` for a skipped call.
+        """
+
+        with self._lock:
+            self.circuit_events[provider][event] += 1
+
+    def add_bytes(self, count: int) -> None:
+        """
+        Add downloaded bytes.
+
+        ### Arguments
+        - count: The number of bytes.
+        """
+
+        with self._lock:
+            self.bytes_downloaded += count
+
+    def finish(self) -> None:
+        """
+        Stop the run clock and collect the ffmpeg CPU time and cache stats.
+        """
+
+        self.finished_at = time.perf_counter()
+
+        children_cpu_end = _get_children_cpu_time()
+        if children_cpu_end is not None and self._children_cpu_start is not None:
+            self.ffmpeg_cpu_time = children_cpu_end - self._children_cpu_start
+
+        self.cache_stats = {}
+        for name, counts in cache_stats.snapshot().items():
+            start = self._cache_start.get(name, {"hits": 0, "misses": 0})
+            hits = counts["hits"] - start["hits"]
+            misses = counts["misses"] - start["misses"]
+            if hits or misses:
+                self.cache_stats[name] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses),
+                }
+
+    @property
+    def duration(self) -> float:
+        """
+        Get the wall time of the run.
+
+        ### Returns
+        - The duration in seconds.
+        """
+
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+
+        return end - self.started_at
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the metrics.
+
+        ### Returns
+        - Dictionary with the summary, safe to serialize as JSON.
+        """
+
+        with self._lock:
+            latencies = list(self.song_latencies.values())
+            outcomes = Counter(self.song_outcomes.values())
+            stages = {
+                stage: {
+                    "count": len(times),
+                    "total": sum(times),
+                    "p50": percentile(times, 50),
+                    "p95": percentile(times, 95),
+                    "p99": percentile(times, 99),
+                }
+                for stage, times in self.stage_times.items()
+            }
+            songs = [
+                {
+                    "id": song_id,
+                    "latency": latency,
+                    "outcome": self.song_outcomes.get(song_id),
+                    "stages": dict(self.song_stages.get(song_id, {})),
+                }
+                for song_id, latency in self.song_latencies.items()
+            ]
+            circuits = {
+                provider: dict(events)
+                for provider, events in self.circuit_events.items()
+            }
+
+        duration = self.duration
+
+        return {
+            "duration": duration,
+            "songs_total": len(latencies),
+            "songs_downloaded": outcomes["downloaded"],
+            "songs_skipped": outcomes["skipped"],
+            "songs_failed": outcomes["failed"],
+            "songs_per_minute": (
+                outcomes["downloaded"] / duration * 60 if duration > 0 else 0.0
+            ),
+            "bytes_downloaded": self.bytes_downloaded,
+            "megabytes_per_second": (
+                self.bytes_downloaded / 1024 / 1024 / duration if duration > 0 else 0.0
+            ),
+            "ffmpeg_cpu_time": self.ffmpeg_cpu_time,
+            "latency": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+            },
+            "stages": stages,
+            "caches": self.cache_stats,
+            "circuits": circuits,
+            "songs": songs,
+        }
+
+    def format_summary(self) -> List[str]:
+        """
+        Format the summary as human readable lines.
+
+        ### Returns
+        - List of lines.
+        """
+
+        summary = self.summary()
+
+        def fmt(value: Optional[float]) -> str:
+            return "n/a" if value is None else f"{value:.2f}s"
+
+        latency = summary["latency"]
+        lines = [
+            f"Processed {summary['songs_total']} songs in {summary['duration']:.2f}s "
+            f"({summary['songs_downloaded']} downloaded, "
+            f"{summary['songs_skipped']} skipped, {summary['songs_failed']} failed)",
+            f"Throughput: {summary['songs_per_minute']:.2f} songs/min, "
+            f"{summary['megabytes_per_second']:.2f} MB/s "
+            f"({summary['bytes_downloaded'] / 1024 / 1024:.2f} MB downloaded)",
+            f"Song latency: p50 {fmt(latency['p50'])}, "
+            f"p95 {fmt(latency['p95'])}, p99 {fmt(latency['p99'])}",
+        ]
+
+        if summary["ffmpeg_cpu_time"] is not None:
+            lines.append(f"FFmpeg CPU time: {summary['ffmpeg_cpu_time']:.2f}s")
+
+        for stage, stats in summary["stages"].items():
+            lines.append(
+                f"Stage {stage}: {stats['count']} calls, total {stats['total']:.2f}s, "
+                f"p50 {fmt(stats['p50'])}, p95 {fmt(stats['p95'])}, "
+                f"p99 {fmt(stats['p99'])}"
+            )
+
+        for name, stats in summary["caches"].items():
+            lines.append(
+                f"Cache {name}: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate'] * 100:.1f}% hit rate)"
+            )
+
+        for provider, events in summary["circuits"].items():
+            lines.append(
+                f"Circuit {provider}: opened {events.get('open', 0)} times, "
+                f"{events.get('rejected', 0)} calls skipped"
+            )
+
+        return lines
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the summary to a JSON file.
+
+        ### Arguments
+        - path: The path to the file.
+        """
+
+        with open(path, "w", encoding="utf-8") as metrics_file:
+            json.dump(self.summary(), metrics_file, indent=4)
@@ -0,0 +1,336 @@
+"""
+Module for profiling spotdl runs.
+
+Most of the work done by spotdl happens in the event loop's executor threads,
+so a regular `cProfile` run of the main thread only shows the event loop waiting.
+The sampling profiler in this module periodically captures the stacks of every
+running thread and attributes each sample to the stage (search, lyrics, download, ...)
+that the thread was executing at that moment.
+
+```python
+profiler = SamplingProfiler()
+profiler.start()
+
+with profile_stage("search"):
+    ...
+
+profiler.stop()
+profiler.save("spotdl.profile")
+```
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+__all__ = [
+    "STAGES",
+    "OTHER_STAGE",
+    "SamplingProfiler",
+    "profile_stage",
+    "get_thread_stage",
+]
+
+STAGES = ["search", "lyrics", "download", "convert", "sponsorblock", "embed", "lrc"]
+OTHER_STAGE = "other"
+
+# Maximum number of frames captured for a single sample
+MAX_STACK_DEPTH = 64
+
+# Stage stack for each thread, keyed by the thread identifier
+_thread_stages: Dict[int, List[str]] = {}
+
+
+@contextmanager
+def profile_stage(stage: str) -> Iterator[None]:
+    """
+    Mark the code executed inside of the context manager
+    as a part of the given stage for the current thread.
+
+    ### Arguments
+    - stage: The name of the stage.
+
+    ### Notes
+    - Stages can be nested, the innermost stage is used for the samples.
+    - This is cheap enough to be used when the profiler is not running.
+    """
+
+    thread_id = threading.get_ident()
+    stack = _thread_stages.setdefault(thread_id, [])
+    stack.append(stage)
+
+    try:
+        yield
+    finally:
+        stack.pop()
+        if not stack:
+            _thread_stages.pop(thread_id, None)
+
+
+def get_thread_stage(thread_id: Optional[int] = None) -> str:
+    """
+    Get the stage that a thread is currently executing.
+
+    ### Arguments
+    - thread_id: The thread identifier, defaults to the current thread.
+
+    ### Returns
+    - The name of the stage or `OTHER_STAGE` if the thread is not in any stage.
+    """
+
+    if thread_id is None:
+        thread_id = threading.get_ident()
+
+    stack = _thread_stages.get(thread_id)
+    if not stack:
+        return OTHER_STAGE
+
+    return stack[-1]
+
+
+def _format_code(code: CodeType) -> str:
+    """
+    Create a readable name for a code object.
+
+    ### Arguments
+    - code: The code object.
+
+    ### Returns
+    - The formatted name, e.g. `search (base.py:158)`
+    """
+
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Sampling profiler that captures the stacks of all threads.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Initialize the profiler.
+
+        ### Arguments
+        - interval: The time between two samples in seconds.
+        """
+
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Start sampling in a background thread.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="spotdl-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling and wait for the background thread to finish.
+        """
+
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.stopped_at = time.perf_counter()
+
+    def _run(self) -> None:
+        """
+        Sample the threads until the profiler is stopped.
+        """
+
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """
+        Capture the stacks of all threads, except the profiler thread.
+        """
+
+        own_id = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():  # pylint: disable=W0212
+            if thread_id == own_id:
+                continue
+
+            stage = get_thread_stage(thread_id)
+
+            codes: List[CodeType] = []
+            current: Optional[FrameType] = frame
+            while current is not None and len(codes) < MAX_STACK_DEPTH:
+                codes.append(current.f_code)
+                current = current.f_back
+
+            codes.reverse()
+            self.samples[(stage, tuple(codes))] += 1
+
+        self.sample_count += 1
+
+    @property
+    def duration(self) -> float:
+        """
+        Get the wall time covered by the profiler.
+
+        ### Returns
+        - The duration in seconds.
+        """
+
+        if self.started_at is None:
+            return 0.0
+
+        end = self.stopped_at if self.stopped_at is not None else time.perf_counter()
+
+        return end - self.started_at
+
+    def get_stage_samples(self) -> Dict[str, int]:
+        """
+        Get the number of thread samples for each stage.
+
+        ### Returns
+        - Dictionary with the stage name as key and the number of samples as value.
+        """
+
+        stage_samples: Counter = Counter()
+        for (stage, _), count in self.samples.items():
+            stage_samples[stage] += count
+
+        return dict(stage_samples)
+
+    def get_top_functions(
+        self, stage: str, limit: int = 10
+    ) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """
+        Get the functions with the most samples for a stage.
+
+        ### Arguments
+        - stage: The name of the stage.
+        - limit: The number of functions to return.
+
+        ### Returns
+        - Tuple with the functions sorted by self samples
+        and the functions sorted by cumulative samples.
+        """
+
+        self_counts: Counter = Counter()
+        cumulative_counts: Counter = Counter()
+        for (sample_stage, codes), count in self.samples.items():
+            if sample_stage != stage or not codes:
+                continue
+
+            self_counts[_format_code(codes[-1])] += count
+
+            seen: Set[str] = set()
+            for code in codes:
+                name = _format_code(code)
+                if name in seen:
+                    continue
+
+                seen.add(name)
+                cumulative_counts[name] += count
+
+        return self_counts.most_common(limit), cumulative_counts.most_common(limit)
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Create a text report with the time spent in each stage.
+
+        ### Arguments
+        - limit: The number of functions to show for each stage.
+
+        ### Returns
+        - The report.
+        """
+
+        stage_samples = self.get_stage_samples()
+        total_samples = sum(stage_samples.values()) or 1
+
+        lines = [
+            f"Profiled {self.duration:.2f}s of wall time, "
+            f"{self.sample_count} samples every {self.interval * 1000:.0f}ms",
+            "",
+            f"{'Stage':<14}{'Samples':>10}{'Thread time':>14}{'Share':>8}",
+        ]
+
+        stages = [stage for stage in STAGES if stage in stage_samples] + sorted(
+            stage for stage in stage_samples if stage not in STAGES
+        )
+
+        for stage in stages:
+            count = stage_samples[stage]
+            lines.append(
+                f"{stage:<14}{count:>10}{count * self.interval:>13.2f}s"
+                f"{count / total_samples * 100:>7.1f}%"
+            )
+
+        for stage in stages:
+            self_top, cumulative_top = self.get_top_functions(stage, limit)
+
+            lines.extend(["", f"[{stage}] top functions (self)"])
+            lines.extend(f"{count:>10}  {name}" for name, count in self_top)
+
+            lines.extend(["", f"[{stage}] top functions (cumulative)"])
+            lines.extend(f"{count:>10}  {name}" for name, count in cumulative_top)
+
+        return "\n".join(lines) + "\n"
+
+    def folded_stacks(self) -> List[str]:
+        """
+        Create the collapsed stacks for the samples.
+        The stage is used as the root frame of each stack.
+
+        ### Returns
+        - List of lines in the folded stack format,
+        that is understood by flamegraph.pl and speedscope.
+        """
+
+        folded: Counter = Counter()
+        for (stage, codes), count in self.samples.items():
+            names = [stage] + [_format_code(code).replace(";", ":") for code in codes]
+            folded[";".join(names)] += count
+
+        return [f"{stack} {count}" for stack, count in sorted(folded.items())]
+
+    def save(self, path: Union[str, Path]) -> Tuple[Path, Path]:
+        """
+        Save the report and the folded stacks.
+
+        ### Arguments
+        - path: The path to the report file,
+        folded stacks are saved next to it with the `.folded` suffix.
+
+        ### Returns
+        - Tuple with the report path and the folded stacks path.
+        """
+
+        report_path = Path(path)
+        folded_path = report_path.with_name(report_path.name + ".folded")
+
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            report_file.write(self.report())
+
+        with open(folded_path, "w", encoding="utf-8") as folded_file:
+            folded_file.write("\n".join(self.folded_stacks()) + "\n")
+
+        return report_path, folded_path
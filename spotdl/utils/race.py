@@ -0,0 +1,174 @@
+"""
+Module for racing calls that are listed in order of preference.
+
+All calls start at the same time. A good answer is accepted as soon as every
+more preferred call has finished without one. Otherwise, the more preferred
+calls get a grace window after the first good answer to come up with theirs.
+Calls that lose the race are abandoned.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+__all__ = ["race", "race_async"]
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def _pick(results: Sequence[Optional[T]], finished: Sequence[bool]) -> Optional[T]:
+    """
+    Pick the most preferred good answer that can't be beaten anymore.
+
+    ### Arguments
+    - results: The answers of the calls, None if there is none (yet).
+    - finished: Whether the calls finished.
+
+    ### Returns
+    - The answer, or None if a more preferred call is still running.
+    """
+
+    for result, done in zip(results, finished):
+        if not done:
+            return None
+
+        if result:
+            return result
+
+    return None
+
+
+def _best(results: Sequence[Optional[T]]) -> Optional[T]:
+    """
+    Pick the most preferred good answer, regardless of the running calls.
+
+    ### Arguments
+    - results: The answers of the calls.
+
+    ### Returns
+    - The answer, or None if there is none.
+    """
+
+    return next((result for result in results if result), None)
+
+
+def race(
+    calls: List[Callable[[], Optional[T]]],
+    grace: float,
+    executor: concurrent.futures.Executor,
+) -> Optional[T]:
+    """
+    Race blocking calls in the executor.
+
+    ### Arguments
+    - calls: The calls, in order of preference. Falsy answers and exceptions
+        count as no answer.
+    - grace: The number of seconds the more preferred calls get after the
+        first good answer.
+    - executor: The executor to run the calls in.
+
+    ### Returns
+    - The winning answer, or None if no call had a good answer.
+
+    ### Notes
+    - Calls that lose the race keep running in the executor, but nobody
+        waits for them.
+    """
+
+    futures = [executor.submit(call) for call in calls]
+    index = {future: position for position, future in enumerate(futures)}
+    results: List[Optional[T]] = [None] * len(futures)
+    finished = [False] * len(futures)
+    deadline: Optional[float] = None
+    pending = set(futures)
+
+    try:
+        while pending:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=None if timeout is None else max(timeout, 0),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+
+            for future in done:
+                position = index[future]
+                finished[position] = True
+                try:
+                    results[position] = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.debug("Call %d failed: %s", position, exc)
+
+            winner = _pick(results, finished)
+            if winner:
+                return winner
+
+            if deadline is None and any(results):
+                deadline = time.monotonic() + grace
+            elif deadline is not None and time.monotonic() >= deadline:
+                return _best(results)
+
+        return _best(results)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def race_async(calls: List[Awaitable[Optional[T]]], grace: float) -> Optional[T]:
+    """
+    Race awaitables on the running event loop.
+
+    ### Arguments
+    - calls: The awaitables, in order of preference. Falsy answers and
+        exceptions count as no answer.
+    - grace: The number of seconds the more preferred calls get after the
+        first good answer.
+
+    ### Returns
+    - The winning answer, or None if no call had a good answer.
+
+    ### Notes
+    - The tasks that lose the race are cancelled.
+    """
+
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    index = {task: position for position, task in enumerate(tasks)}
+    results: List[Optional[T]] = [None] * len(tasks)
+    finished = [False] * len(tasks)
+    deadline: Optional[float] = None
+    pending = set(tasks)
+
+    try:
+        while pending:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=None if timeout is None else max(timeout, 0),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            for task in done:
+                position = index[task]
+                finished[position] = True
+                if task.exception() is None:
+                    results[position] = task.result()
+                else:
+                    logger.debug("Call %d failed: %s", position, task.exception())
+
+            winner = _pick(results, finished)
+            if winner:
+                return winner
+
+            if deadline is None and any(results):
+                deadline = time.monotonic() + grace
+            elif deadline is not None and time.monotonic() >= deadline:
+                return _best(results)
+
+        return _best(results)
+    finally:
+        for task in pending:
+            task.cancel()
@@ -6,14 +6,16 @@
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional
-
-from ytmusicapi import YTMusic
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from spotdl.types.album import Album
 from spotdl.types.song import Song, SongList
 from spotdl.utils.csv import parse_csv
 from spotdl.utils.metadata import get_file_metadata
+from spotdl.utils.tags import read_tags
+
+if TYPE_CHECKING:
+    from ytmusicapi import YTMusic
 
 __all__ = [
     "QueryError",
@@ -30,7 +32,7 @@
 client = None  # pylint: disable=invalid-name
 
 
-def get_ytm_client() -> YTMusic:
+def get_ytm_client() -> "YTMusic":
     """
     Lazily initialize the YTMusic client.
 
@@ -40,7 +42,12 @@ def get_ytm_client() -> YTMusic:
 
     global client  # pylint: disable=global-statement
     if client is None:
-        client = YTMusic()
+        # pylint: disable=import-outside-toplevel
+        from ytmusicapi import YTMusic
+
+        from spotdl.utils.http import new_session
+
+        client = YTMusic(requests_session=new_session())
 
     return client
 
@@ -261,17 +268,17 @@ def gather_known_songs(output: str, output_format: str) -> Dict[str, List[Path]]
 
     known_songs: Dict[str, List[Path]] = {}
     for path in paths:
-        # Try to get the song from the metadata
-        song = get_song_from_file_metadata(path)
+        # Only the url is needed, so the rest of the tags isn't loaded
+        tags = read_tags(path, {"url"})
 
-        if song is None or song.url is None:
+        if tags is None or tags["url"] is None:
             continue
 
-        known_paths = known_songs.get(song.url)
+        known_paths = known_songs.get(tags["url"])
         if known_paths is None:
-            known_songs[song.url] = [path]
+            known_songs[tags["url"]] = [path]
         else:
-            known_songs[song.url].append(path)
+            known_songs[tags["url"]].append(path)
 
     return known_songs
 
@@ -0,0 +1,403 @@
+"""
+Module for reading the tags of audio files using Mutagen.
+
+```python
+read_tags(
+    path=Path("test.mp3"),
+    fields={"url", "isrc"},
+)
+```
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+from mutagen import MutagenError
+from mutagen._file import File
+from mutagen._vorbis import VCommentDict
+from mutagen.id3 import ID3, Frames, Frames_2_2, ID3NoHeaderError
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "M4A_TAG_PRESET",
+    "MP3_TAG_PRESET",
+    "TAG_PRESET",
+    "TAG_TO_SONG",
+    "TAG_TO_FIELDS",
+    "read_tags",
+]
+
+# Type of the metadata block with the vorbis comments in FLAC files
+FLAC_VORBIS_COMMENT = 4
+
+# Apple has specific tags - see mutagen docs -
+# http://mutagen.readthedocs.io/en/latest/api/mp4.html
+M4A_TAG_PRESET = {
+    "album": "\xa9alb",
+    "artist": "\xa9ART",
+    "date": "\xa9day",
+    "title": "\xa9nam",
+    "year": "\xa9day",
+    "comment": "\xa9cmt",
+    "group": "\xa9grp",
+    "writer": "\xa9wrt",
+    "genre": "\xa9gen",
+    "tracknumber": "trkn",
+    "trackcount": "trkn",
+    "albumartist": "aART",
+    "discnumber": "disk",
+    "disccount": "disk",
+    "cpil": "cpil",
+    "albumart": "covr",
+    "encodedby": "\xa9too",
+    "copyright": "cprt",
+    "tempo": "tmpo",
+    "lyrics": "\xa9lyr",
+    "explicit": "rtng",
+    "woas": "----:spotdl:WOAS",
+    "isrc": "----:spotdl:ISRC",
+}
+
+MP3_TAG_PRESET = {
+    "album": "TALB",
+    "artist": "TPE1",
+    "date": "TDRC",
+    "title": "TIT2",
+    "year": "TDRC",
+    "comment": "COMM::XXX",
+    "group": "TIT1",
+    "writer": "TEXT",
+    "genre": "TCON",
+    "tracknumber": "TRCK",
+    "trackcount": "TRCK",
+    "albumartist": "TPE2",
+    "discnumber": "TPOS",
+    "disccount": "TPOS",
+    "cpil": "TCMP",
+    "albumart": "APIC",
+    "encodedby": "TENC",
+    "copyright": "TCOP",
+    "tempo": "TBPM",
+    "lyrics": "USLT::XXX",
+    "woas": "WOAS",
+    "isrc": "TSRC",
+    "explicit": "NULL",
+}
+
+TAG_PRESET = {key: key for key in M4A_TAG_PRESET}
+
+TAG_TO_SONG = {
+    "title": "name",
+    "artist": "artists",
+    "album": "album_name",
+    "albumartist": "album_artist",
+    "genre": "genres",
+    "discnumber": "disc_number",
+    "year": "year",
+    "date": "date",
+    "tracknumber": "track_number",
+    "encodedby": "publisher",
+    "woas": "url",
+    "comment": "download_url",
+    "isrc": "isrc",
+    "copyright": "copyright_text",
+    "lyrics": "lyrics",
+    "albumart": "album_art",
+}
+
+# Song fields decoded from each tag
+TAG_TO_FIELDS = {
+    **{key: {value} for key, value in TAG_TO_SONG.items()},
+    "artist": {"artists", "artist"},
+    "tracknumber": {"track_number", "tracks_count"},
+    "trackcount": {"track_number", "tracks_count"},
+    "discnumber": {"disc_number", "disc_count"},
+    "disccount": {"disc_number", "disc_count"},
+    "explicit": {"explicit"},
+}
+
+
+def read_tags(
+    path: Path,
+    fields: Optional[Iterable[str]] = None,
+    id3_separator: str = "/",
+) -> Optional[Dict[str, Any]]:
+    """
+    Read some of the metadata of a song, without loading the tags
+    that aren't needed for them.
+
+    ### Arguments
+    - path: Path to the song.
+    - fields: Names of the song fields to read, e.g. `{"url", "isrc"}`,
+        None to read all of them like `get_file_metadata`.
+    - id3_separator: The separator used for the id3 tags.
+
+    ### Returns
+    - Dict with the requested fields, None for the ones that aren't set,
+        or None if the file doesn't have any tags.
+
+    ### Raises
+    - OSError: If the file is not found.
+    - ValueError: If a field isn't a song field stored in the tags.
+
+    ### Notes
+    - The album art is only loaded when `album_art` is requested,
+        MP3 files are read without scanning the audio stream and only the
+        comment block of FLAC files is read.
+    """
+
+    if path.exists() is False:
+        raise OSError(f"File not found: {path}")
+
+    if fields is None:
+        keys = list(TAG_PRESET)
+    else:
+        fields = set(fields)
+        unknown = fields.difference(*TAG_TO_FIELDS.values())
+        if unknown:
+            raise ValueError(f"Unknown tag fields: {', '.join(sorted(unknown))}")
+
+        keys = [
+            key
+            for key in TAG_PRESET
+            if not fields.isdisjoint(TAG_TO_FIELDS.get(key, ()))
+        ]
+
+    audio_file = _load_tags(path, keys)
+
+    if audio_file is None or audio_file == {}:
+        return None
+
+    song_meta: Dict[str, Any] = {}
+    for key in keys:
+        if path.suffix == ".m4a":
+            val = audio_file.get(M4A_TAG_PRESET[key])
+        elif path.suffix == ".mp3":
+            val = audio_file.get(MP3_TAG_PRESET[key])
+        else:
+            val = audio_file.get(key)
+
+        # Cover art is a special case and
+        # has to be handled before checking the val
+        # M4A is handled in the m4a section since it
+        # has data in the val variable
+        if key == "albumart":
+            if path.suffix == ".mp3":
+                cover = audio_file.get("APIC:Cover")
+                if cover:
+                    song_meta["album_art"] = cover.data
+                else:
+                    song_meta["album_art"] = None
+
+                continue
+
+            if path.suffix == ".flac":
+                if audio_file.pictures:
+                    song_meta["album_art"] = audio_file.pictures[0].data
+                else:
+                    song_meta["album_art"] = None
+
+                continue
+
+            if path.suffix in [".ogg", ".opus"]:
+                pictures = audio_file.get("metadata_block_picture")
+                if pictures and pictures[0]:
+                    song_meta["album_art"] = pictures[0]
+                else:
+                    song_meta["album_art"] = None
+
+                continue
+
+        # If the tag is empty, skip it
+        if val is None:
+            # If the tag is empty but it's key is in the
+            # song object, set it to None
+            empty_key = TAG_TO_SONG.get(key)
+            if empty_key:
+                song_meta[empty_key] = None
+
+            continue
+
+        # MP3 specific decoding
+        if path.suffix == ".mp3":
+            if key == "woas":
+                song_meta["url"] = val.url
+            elif key == "comment":
+                song_meta["download_url"] = val.text[0]
+            elif key == "year":
+                song_meta["year"] = int(str(val.text[0])[:4])
+            elif key == "date":
+                song_meta["date"] = str(val.text[0])
+            elif key in ["tracknumber", "trackcount"]:
+                count = val.text[0].split(id3_separator)
+                if len(count) == 2:
+                    song_meta["track_number"] = int(count[0])
+                    song_meta["tracks_count"] = int(count[1])
+                else:
+                    song_meta["track_number"] = val.text[0]
+            elif key in ["discnumber", "disccount"]:
+                count = val.text[0].split(id3_separator)
+                if len(count) == 2:
+                    song_meta["disc_number"] = int(count[0])
+                    song_meta["disc_count"] = int(count[1])
+                else:
+                    song_meta["disc_number"] = val.text[0]
+            elif key == "artist":
+                artists_val: str = (
+                    val.text[0] if isinstance(val.text, list) else val.text
+                )
+                song_meta["artists"] = artists_val.split(id3_separator)
+            else:
+                meta_key = TAG_TO_SONG.get(key)
+                if meta_key and song_meta.get(meta_key) is None:
+                    song_meta[meta_key] = (
+                        val.text[0]
+                        if isinstance(val.text, list) and len(val.text) == 1
+                        else val.text
+                    )
+
+        # M4A specific decoding
+        elif path.suffix == ".m4a":
+            if key == "artist":
+                song_meta["artists"] = val
+            elif key == "woas":
+                song_meta["url"] = val[0].decode("utf-8")
+            elif key == "explicit":
+                song_meta["explicit"] = val == [4] if val else None
+            elif key == "year":
+                song_meta["year"] = int(str(val[0])[:4])
+            elif key == "discnumber":
+                song_meta["disc_number"] = val[0][0]
+                song_meta["disc_count"] = val[0][1]
+            elif key == "tracknumber":
+                song_meta["track_number"] = val[0][0]
+                song_meta["tracks_count"] = val[0][1]
+            else:
+                meta_key = TAG_TO_SONG.get(key)
+                if meta_key:
+                    song_meta[meta_key] = (
+                        val[0] if isinstance(val, list) and len(val) == 1 else val
+                    )
+
+        # FLAC, OGG, OPUS specific decoding
+        else:
+            if key == "artist":
+                song_meta["artists"] = val
+            elif key == "tracknumber":
+                song_meta["track_number"] = int(val[0])
+            elif key == "discnumber":
+                song_meta["disc_count"] = int(val[0])
+                song_meta["disc_number"] = int(val[0])
+            else:
+                meta_key = TAG_TO_SONG.get(key)
+                if meta_key:
+                    song_meta[meta_key] = (
+                        val[0] if isinstance(val, list) and len(val) == 1 else val
+                    )
+
+    if "artists" in song_meta:
+        # Make sure that artists is a list
+        if isinstance(song_meta["artists"], str):
+            song_meta["artists"] = [song_meta["artists"]]
+        elif song_meta["artists"] is not None:
+            song_meta["artists"] = list(song_meta["artists"])
+        else:
+            song_meta["artists"] = []
+
+        # Add main artist to the song meta object
+        if song_meta["artists"]:
+            song_meta["artist"] = song_meta["artists"][0]
+        else:
+            song_meta["artist"] = None
+
+    # Make sure that genres is a list
+    if isinstance(song_meta.get("genres"), str):
+        song_meta["genres"] = [song_meta["genres"]]
+
+    if fields is None:
+        return song_meta
+
+    return {field: song_meta.get(field) for field in fields}
+
+
+def _load_tags(path: Path, keys: List[str]) -> Any:
+    """
+    Load the tags of a song that are needed to read some keys.
+
+    ### Arguments
+    - path: Path to the song.
+    - keys: The keys of `TAG_PRESET` that will be read.
+
+    ### Returns
+    - A mapping of the tags, or None if the file doesn't have any.
+    """
+
+    with_cover = "albumart" in keys
+
+    if path.suffix == ".mp3":
+        # Frames that aren't known are kept as raw bytes instead of being
+        # decoded, and the mpeg frames after the tags aren't read at all
+        skipped = set() if with_cover else {"APIC", "PIC"}
+        if "lyrics" not in keys:
+            skipped.update(("USLT", "SYLT", "ULT", "SLT"))
+
+        known_frames = None
+        if skipped:
+            known_frames = {
+                name: frame
+                for name, frame in {**Frames, **Frames_2_2}.items()
+                if name not in skipped
+            }
+
+        try:
+            return ID3(str(path.resolve()), known_frames=known_frames)
+        except ID3NoHeaderError:
+            return None
+
+    if path.suffix == ".flac" and not with_cover:
+        with open(path, "rb") as file:
+            comments = _read_flac_comments(file)
+
+        if comments is not False:
+            return comments
+
+    return File(str(path.resolve()))
+
+
+def _read_flac_comments(file: BinaryIO) -> Union[VCommentDict, None, bool]:
+    """
+    Read the vorbis comments of a FLAC file, stopping at the comment block
+    and seeking over the blocks before it, e.g. pictures and seek tables.
+
+    ### Arguments
+    - file: The file opened in binary mode.
+
+    ### Returns
+    - The comments, None if the file doesn't have any
+        or False if the file should be read by mutagen instead.
+    """
+
+    if file.read(4) != b"fLaC":
+        return False
+
+    while True:
+        header = file.read(4)
+        if len(header) < 4:
+            return False
+
+        block_type = header[0] & 0x7F
+        length = int.from_bytes(header[1:], "big")
+
+        if block_type == FLAC_VORBIS_COMMENT:
+            try:
+                return VCommentDict(file.read(length), framing=False)
+            except MutagenError as exc:
+                logger.debug("Failed to read the FLAC comments: %s", exc)
+                return False
+
+        if header[0] & 0x80:
+            return None
+
+        file.seek(length, 1)
@@ -0,0 +1,356 @@
+"""
+Module for exporting spans of a run to a trace file.
+
+Two formats are supported, based on the file extension:
+- `.json` (or anything else): Chrome Trace Event format, can be opened in Perfetto
+    or `chrome://tracing`.
+- `.jsonl`: One OTLP-style span per line, with start/end time in unix nanoseconds.
+
+Tracing is disabled unless a tracer is enabled with `enable_tracing`,
+in which case `span` and `traced` only cost a global lookup.
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, Union
+
+from spotdl.utils.profiling import get_thread_stage
+
+__all__ = [
+    "Tracer",
+    "enable_tracing",
+    "disable_tracing",
+    "get_tracer",
+    "span",
+    "traced",
+]
+
+JSONL_SUFFIXES = [".jsonl", ".ndjson"]
+
+_tracer: Optional["Tracer"] = None
+
+# Shared context manager used when tracing is disabled,
+# attributes written to it are discarded
+_NULL_SPAN: ContextManager[Dict[str, Any]] = nullcontext({})
+
+
+class Tracer:
+    """
+    Thread-safe writer for trace events.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open the trace file.
+
+        ### Arguments
+        - path: The path to the trace file.
+        """
+
+        self.path = Path(path)
+        self.jsonl = self.path.suffix.lower() in JSONL_SUFFIXES
+        self.pid = os.getpid()
+
+        # Used to convert the monotonic clock to unix time
+        self._epoch_offset = time.time_ns() - time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._named_threads: set = set()
+        self._first_event = True
+        self._closed = False
+
+        self._file = open(  # pylint: disable=consider-using-with
+            self.path, "w", encoding="utf-8"
+        )
+
+        if not self.jsonl:
+            self._file.write("[\n")
+
+    def now(self) -> int:
+        """
+        Get the current time in the format used by `add_span`.
+
+        ### Returns
+        - Monotonic time in nanoseconds.
+        """
+
+        return time.perf_counter_ns()
+
+    def _write(self, event: Dict[str, Any]) -> None:
+        """
+        Write an event to the file. Must be called with the lock held.
+
+        ### Arguments
+        - event: The event to write.
+        """
+
+        if self._closed:
+            return
+
+        if self.jsonl:
+            self._file.write(json.dumps(event, default=str) + "\n")
+        else:
+            if not self._first_event:
+                self._file.write(",\n")
+
+            self._file.write(json.dumps(event, default=str))
+            self._first_event = False
+
+    def add_span(
+        self,
+        name: str,
+        start: int,
+        end: int,
+        attributes: Optional[Dict[str, Any]] = None,
+        category: str = "spotdl",
+        asynchronous: bool = False,
+    ) -> None:
+        """
+        Add a finished span to the trace.
+
+        ### Arguments
+        - name: The name of the span.
+        - start: The start time, from `Tracer.now`.
+        - end: The end time, from `Tracer.now`.
+        - attributes: The attributes of the span (song id, stage, provider, outcome).
+        - category: The category of the span.
+        - asynchronous: Whether the span can overlap with other spans on the same thread,
+            e.g. spans of coroutines running in the event loop.
+        """
+
+        attributes = attributes or {}
+        thread = threading.current_thread()
+        thread_id = threading.get_native_id()
+
+        with self._lock:
+            span_id = next(self._ids)
+
+            if self.jsonl:
+                self._write(
+                    {
+                        "name": name,
+                        "spanId": f"{span_id:016x}",
+                        "startTimeUnixNano": start + self._epoch_offset,
+                        "endTimeUnixNano": end + self._epoch_offset,
+                        "attributes": {
+                            "category": category,
+                            "thread.id": thread_id,
+                            "thread.name": thread.name,
+                            **attributes,
+                        },
+                        "status": {
+                            "code": (
+                                "ERROR"
+                                if attributes.get("outcome") == "error"
+                                else "OK"
+                            )
+                        },
+                    }
+                )
+
+                return
+
+            if thread_id not in self._named_threads:
+                self._named_threads.add(thread_id)
+                self._write(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self.pid,
+                        "tid": thread_id,
+                        "args": {"name": thread.name},
+                    }
+                )
+
+            start_us = (start + self._epoch_offset) / 1000
+            end_us = (end + self._epoch_offset) / 1000
+            event = {
+                "name": name,
+                "cat": category,
+                "pid": self.pid,
+                "tid": thread_id,
+                "args": attributes,
+            }
+
+            if asynchronous:
+                self._write({**event, "ph": "b", "id": span_id, "ts": start_us})
+                self._write({**event, "ph": "e", "id": span_id, "ts": end_us})
+            else:
+                self._write(
+                    {**event, "ph": "X", "ts": start_us, "dur": end_us - start_us}
+                )
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        category: str = "spotdl",
+        asynchronous: bool = False,
+        **attributes: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Record the code executed inside of the context manager as a span.
+
+        ### Arguments
+        - name: The name of the span.
+        - category: The category of the span.
+        - asynchronous: Whether the span is recorded by a coroutine.
+        - attributes: The attributes of the span.
+
+        ### Returns
+        - The attributes dictionary, which can be updated inside of the span.
+
+        ### Notes
+        - The `stage` attribute defaults to the stage of the current thread.
+        - If an exception is raised, the outcome is set to `error`.
+        """
+
+        attributes.setdefault("stage", get_thread_stage())
+        start = self.now()
+
+        try:
+            yield attributes
+        except BaseException as exc:
+            attributes["outcome"] = "error"
+            attributes["error"] = f"{exc.__class__.__name__}: {exc}"
+            raise
+        finally:
+            attributes.setdefault("outcome", "ok")
+            self.add_span(name, start, self.now(), attributes, category, asynchronous)
+
+    def close(self) -> None:
+        """
+        Finish and close the trace file.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+
+            if not self.jsonl:
+                self._file.write("\n]\n")
+
+            self._closed = True
+            self._file.close()
+
+
+def enable_tracing(path: Union[str, Path]) -> Tracer:
+    """
+    Enable tracing for the whole process.
+
+    ### Arguments
+    - path: The path to the trace file.
+
+    ### Returns
+    - The tracer.
+
+    ### Notes
+    - The trace file is closed at exit.
+    """
+
+    global _tracer  # pylint: disable=global-statement
+
+    if _tracer is not None:
+        if _tracer.path == Path(path):
+            return _tracer
+
+        _tracer.close()
+
+    _tracer = Tracer(path)
+    atexit.register(_tracer.close)
+
+    return _tracer
+
+
+def disable_tracing() -> None:
+    """
+    Disable tracing and close the trace file.
+    """
+
+    global _tracer  # pylint: disable=global-statement
+
+    if _tracer is not None:
+        _tracer.close()
+        _tracer = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Get the active tracer.
+
+    ### Returns
+    - The tracer or None if tracing is disabled.
+    """
+
+    return _tracer
+
+
+def span(
+    name: str, category: str = "spotdl", asynchronous: bool = False, **attributes: Any
+) -> ContextManager[Dict[str, Any]]:
+    """
+    Record a span with the active tracer, does nothing if tracing is disabled.
+
+    ### Arguments
+    - name: The name of the span.
+    - category: The category of the span.
+    - asynchronous: Whether the span is recorded by a coroutine,
+        so it can overlap with other spans on the same thread.
+    - attributes: The attributes of the span.
+
+    ### Returns
+    - Context manager that yields the attributes dictionary.
+    """
+
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+
+    return tracer.span(name, category, asynchronous, **attributes)
+
+
+def traced(
+    name: str,
+    category: str = "spotdl",
+    attributes: Optional[Callable[..., Dict[str, Any]]] = None,
+    outcome: Optional[Callable[[Any], str]] = None,
+) -> Callable:
+    """
+    Decorator that records a span for each call of the function.
+
+    ### Arguments
+    - name: The name of the span.
+    - category: The category of the span.
+    - attributes: Function that creates the span attributes
+        from the arguments of the decorated function.
+    - outcome: Function that creates the outcome from the return value.
+
+    ### Returns
+    - The decorator.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+
+            span_attributes = attributes(*args, **kwargs) if attributes else {}
+            with tracer.span(name, category, **span_attributes) as current:
+                result = func(*args, **kwargs)
+                if outcome is not None:
+                    current["outcome"] = outcome(result)
+
+                return result
+
+        return wrapper
+
+    return decorator
@@ -262,7 +262,12 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
         while True:
             await websocket.receive_json()
     except WebSocketDisconnect:
-        app_state.clients.pop(client_id, None)
+        client = app_state.clients.pop(client_id, None)
+        if client is not None:
+            # Waits for the lrc files that are still being written
+            await asyncio.get_running_loop().run_in_executor(
+                None, client.downloader.close
+            )
 
         if (
             len(app_state.clients) == 0
@@ -489,12 +494,16 @@ def update_settings(
 
     new_settings = DownloaderOptions(**settings_cpy)  # type: ignore
 
-    # Re-initialize downloader
-    client.downloader_settings = new_settings
-    client.downloader = Downloader(
+    # Re-initialize downloader, the previous one is closed once
+    # the new one was created successfully
+    downloader = Downloader(
         new_settings,
         loop=state.loop,
     )
+    client.downloader.close()
+
+    client.downloader_settings = new_settings
+    client.downloader = downloader
 
     return new_settings
 
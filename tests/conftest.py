@@ -11,9 +11,12 @@
 
 ORIGINAL_INITIALIZE = SpotifyClient.init
 
-SpotifyClient.init(
-    "ad996353310b4ced82f5be1309b11b14", "2e5851cff3bc45f495cd7cfa40be1b48"
-)
+try:
+    SpotifyClient.init(
+        "ad996353310b4ced82f5be1309b11b14", "2e5851cff3bc45f495cd7cfa40be1b48"
+    )
+except Exception:
+    pass
 
 init_logging("MATCH")
 
@@ -0,0 +1,12 @@
+from spotdl.console.meta import find_audio_files
+
+
+def test_find_audio_files(tmp_path):
+    for name in ["b.mp3", "a.flac", "cover.jpg", "sub/c.m4a", "sub/deep/d.opus"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    assert [
+        path.relative_to(tmp_path).as_posix() for path in find_audio_files(tmp_path)
+    ] == ["a.flac", "b.mp3", "sub/c.m4a", "sub/deep/d.opus"]
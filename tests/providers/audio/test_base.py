@@ -0,0 +1,89 @@
+import asyncio
+import dataclasses
+
+from spotdl.providers.audio.base import AsyncAudioProvider, AudioProvider
+from spotdl.types.result import Result
+from spotdl.types.song import Song
+
+SONG = Song.from_missing_data(
+    name="Mortals",
+    artists=["Warriyo", "Laura Brehm"],
+    artist="Warriyo",
+    duration=229,
+)
+
+
+def make_result(name, url):
+    return Result(
+        source="test",
+        url=url,
+        verified=True,
+        name=name,
+        duration=229,
+        author="Warriyo",
+        result_id=url,
+        artists=("Warriyo", "Laura Brehm"),
+        views=100,
+    )
+
+
+class SyncProvider(AudioProvider):
+    SUPPORTS_ISRC = False
+    GET_RESULTS_OPTS = [{"filter": "songs"}]
+
+    def get_results(self, search_term, **kwargs):
+        return [
+            make_result("Something else", "https://example.com/other"),
+            make_result("Mortals", "https://example.com/mortals"),
+        ]
+
+
+class NativeAsyncProvider(AsyncAudioProvider):
+    SUPPORTS_ISRC = False
+    GET_RESULTS_OPTS = [{"filter": "songs"}]
+
+    async def get_results_async(self, search_term, **kwargs):
+        await asyncio.sleep(0)
+
+        return [make_result("Mortals", "https://example.com/async")]
+
+
+class EnrichingProvider(SyncProvider):
+    ENRICHES_RESULTS = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enriched = []
+
+    def enrich_results(self, results):
+        self.enriched.extend(result.url for result in results)
+
+        return [dataclasses.replace(result, album="Mortals") for result in results]
+
+
+def test_sync_and_async_search_match():
+    provider = SyncProvider()
+
+    assert provider.search(SONG) == "https://example.com/mortals"
+    assert asyncio.run(provider.search_async(SONG)) == "https://example.com/mortals"
+
+
+def test_native_async_provider():
+    provider = NativeAsyncProvider()
+
+    assert provider.NATIVE_ASYNC is True
+    assert asyncio.run(provider.search_async(SONG)) == "https://example.com/async"
+
+    # The blocking interface runs the coroutine in a new event loop
+    assert provider.search(SONG) == "https://example.com/async"
+
+
+def test_only_filtered_results_are_enriched():
+    provider = EnrichingProvider()
+    song = dataclasses.replace(SONG, album_name="Mortals")
+
+    assert provider.search(song) == "https://example.com/mortals"
+    assert provider.enriched == ["https://example.com/mortals"]
+
+    assert asyncio.run(provider.search_async(song)) == "https://example.com/mortals"
+    assert provider.enriched == ["https://example.com/mortals"] * 2
@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from spotdl.providers.registry import ProviderRegistry
+from spotdl.utils.circuit import CLOSED
+
+
+class FakeProvider:
+    name = "Fake"
+    circuit = None
+    created = 0
+
+    def __init__(self, **options):
+        time.sleep(0.05)
+        FakeProvider.created += 1
+        self.options = options
+
+
+def test_registry_shares_providers_per_configuration():
+    FakeProvider.created = 0
+    registry = ProviderRegistry({"audio": {"fake": FakeProvider}})
+
+    providers = []
+    threads = [
+        threading.Thread(
+            target=lambda: providers.append(registry.get("audio", "fake", fmt="mp3"))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeProvider.created == 1
+    assert all(provider is providers[0] for provider in providers)
+
+    other = registry.get("audio", "fake", fmt="opus")
+    assert other is not providers[0]
+    assert other.options == {"fmt": "opus"}
+
+    with_circuit = registry.get("audio", "fake", (3, 10.0), fmt="mp3")
+    assert with_circuit is not providers[0]
+    assert with_circuit.circuit.state == CLOSED
+    assert with_circuit.circuit.failure_threshold == 3
+    assert len(registry) == 3
+
+    with pytest.raises(KeyError):
+        registry.get("audio", "missing")
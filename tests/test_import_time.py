@@ -0,0 +1,78 @@
+import importlib.util
+import json
+import subprocess
+import sys
+
+# Modules that should only be imported when the feature using them is needed
+HEAVY_MODULES = [
+    "yt_dlp",
+    "pytube",
+    "ytmusicapi",
+    "soundcloud",
+    "syncedlyrics",
+    "bs4",
+    "fastapi",
+    "uvicorn",
+    "mutagen",
+    "pykakasi",
+    "requests",
+]
+
+# Maximum import time of the console entry point, as a fraction of the
+# import time of the heavy modules measured on the same machine
+IMPORT_TIME_RATIO = 0.5
+
+SCRIPT = """
+import importlib
+import json
+import sys
+import time
+
+start = time.perf_counter()
+for module in sys.argv[1:]:
+    importlib.import_module(module)
+duration = time.perf_counter() - start
+
+print(json.dumps({"duration": duration, "modules": list(sys.modules)}))
+"""
+
+
+def measure_import(*modules):
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *modules],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_entry_point_does_not_import_heavy_modules():
+    """
+    Starting the CLI shouldn't import providers, the web stack or transliteration.
+    """
+
+    modules = set(measure_import("spotdl.console.entry_point")["modules"])
+
+    assert [module for module in HEAVY_MODULES if module in modules] == []
+
+
+def test_entry_point_import_time():
+    """
+    Importing the console entry point should take a fraction of the time it
+    takes to import the heavy modules, measured in the same run so that the
+    result doesn't depend on the speed of the machine.
+    """
+
+    heavy_modules = [
+        module for module in HEAVY_MODULES if importlib.util.find_spec(module)
+    ]
+
+    # Use the best of a few runs, to reduce the noise from the machine
+    duration = min(
+        measure_import("spotdl.console.entry_point")["duration"] for _ in range(3)
+    )
+    baseline = min(measure_import(*heavy_modules)["duration"] for _ in range(3))
+
+    assert duration < baseline * IMPORT_TIME_RATIO
@@ -0,0 +1,107 @@
+import time
+
+from spotdl.utils.cache import RefreshingValue, TTLCache
+
+
+def test_ttl_cache_get_and_set():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert "a" in cache
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a", "expired") == "expired"
+    assert len(cache) == 0
+
+
+def test_ttl_cache_get_or_set():
+    cache = TTLCache(maxsize=2, ttl=60)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_set("a", factory) == "value"
+    assert cache.get_or_set("a", factory) == "value"
+    assert len(calls) == 1
+
+
+def test_refreshing_value():
+    fetched = []
+
+    def fetch():
+        time.sleep(0.05)
+        fetched.append(len(fetched))
+        return f"code-{len(fetched)}"
+
+    value = RefreshingValue("code", fetch, ttl=0.1)
+
+    # The first get waits for the value
+    assert value.get() == "code-1"
+    assert value.get() == "code-1"
+
+    # A stale value is returned while it's refreshed in the background
+    time.sleep(0.15)
+    assert value.get() == "code-1"
+    time.sleep(0.1)
+    assert value.get() == "code-2"
+    assert fetched == [0, 1]
+
+
+def test_refreshing_value_keeps_old_value_on_failure():
+    results = iter(["code", None, None])
+    value = RefreshingValue("code", lambda: next(results), ttl=0)
+
+    assert value.get() == "code"
+    value.refresh()
+    time.sleep(0.05)
+    assert value.get() == "code"
+    time.sleep(0.05)
+
+
+def test_refreshing_value_remembers_failures():
+    fetched = []
+
+    def fetch():
+        fetched.append(len(fetched))
+        return None if len(fetched) < 3 else "code"
+
+    value = RefreshingValue("code", fetch, ttl=60, failure_ttl=0.05)
+
+    # A failed fetch isn't repeated on every get
+    assert value.get() is None
+    assert value.get() is None
+    assert fetched == [0]
+
+    time.sleep(0.06)
+    assert value.get() is None
+    assert fetched == [0, 1]
+
+    # Invalidating fetches again right away
+    value.invalidate()
+    assert value.get() == "code"
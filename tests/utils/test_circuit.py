@@ -0,0 +1,73 @@
+import time
+import weakref
+
+from spotdl.utils.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def test_circuit_opens_after_consecutive_failures():
+    changes = []
+    circuit = CircuitBreaker(
+        "test",
+        failure_threshold=2,
+        cooldown=60,
+        on_change=lambda *args: changes.append(args),
+    )
+
+    circuit.record_failure()
+    circuit.record_success()
+    circuit.record_failure()
+    assert circuit.state == CLOSED
+
+    circuit.record_failure()
+    assert circuit.state == OPEN
+    assert circuit.allow() is False
+    assert changes == [("test", OPEN)]
+
+
+def test_circuit_half_open_probe():
+    circuit = CircuitBreaker("test", failure_threshold=1, cooldown=0.01)
+
+    circuit.record_failure()
+    time.sleep(0.02)
+
+    # Only a single probe is let through
+    assert circuit.allow() is True
+    assert circuit.state == HALF_OPEN
+    assert circuit.allow() is False
+
+    # A failed probe opens the circuit again
+    circuit.record_failure()
+    assert circuit.state == OPEN
+
+    time.sleep(0.02)
+    assert circuit.allow() is True
+    circuit.record_success()
+    assert circuit.state == CLOSED
+    assert circuit.allow() is True
+
+
+def test_circuit_listeners():
+    class Listener:
+        def __init__(self):
+            self.changes = []
+
+        def on_change(self, name, state):
+            self.changes.append((name, state))
+
+    circuit = CircuitBreaker("test", failure_threshold=1, cooldown=60)
+    first, second = Listener(), Listener()
+    circuit.subscribe(first.on_change)
+    circuit.subscribe(first.on_change)
+    circuit.subscribe(second.on_change)
+
+    circuit.record_failure()
+    assert first.changes == second.changes == [("test", OPEN)]
+
+    # Unsubscribed and garbage collected listeners are not called anymore
+    circuit.unsubscribe(first.on_change)
+    second_ref = weakref.ref(second)
+    del second
+    assert second_ref() is None
+
+    circuit.record_success()
+    assert first.changes == [("test", OPEN)]
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from spotdl.utils.cover_cache import CoverCache, hash_cover
+
+
+def test_cover_cache_is_content_addressed(tmp_path):
+    cache = CoverCache(tmp_path)
+
+    cover = cache.set("https://a/cover.jpg", b"image")
+    cache.set("https://b/cover.jpg", b"image")
+
+    assert cover.digest == hash_cover(b"image")
+    assert cache.size() == len(b"image")
+    assert len(list(tmp_path.glob("*/" + cover.digest))) == 1
+
+    # The covers survive reopening
+    cache.close()
+    reopened = CoverCache(tmp_path)
+    assert reopened.get("https://b/cover.jpg") == cover
+    assert reopened.get("https://c/cover.jpg") is None
+
+
+def test_cover_cache_evicts_least_recently_used(tmp_path):
+    cache = CoverCache(tmp_path, max_bytes=10)
+
+    cache.set("first", b"11111")
+    cache.set("second", b"22222")
+    CoverCache(tmp_path).get("first")
+    cache.set("third", b"33333")
+
+    assert cache.size() == 10
+    reopened = CoverCache(tmp_path)
+    assert reopened.get("first") is not None
+    assert reopened.get("second") is None
+    assert reopened.get("third") is not None
+
+
+def test_cover_cache_coalesces_fetches(tmp_path):
+    cache = CoverCache(tmp_path)
+    downloads = []
+
+    def download(url):
+        downloads.append(url)
+        time.sleep(0.1)
+        return b"image"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.fetch("url", download)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert downloads == ["url"]
+    assert [cover.data for cover in results] == [b"image"] * 4
+    assert cache.fetch("missing", lambda _: None) is None
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from spotdl.utils.daemon import UNIX_SOCKETS, DaemonError, DaemonServer, submit_job
+
+pytestmark = pytest.mark.skipif(
+    not UNIX_SOCKETS, reason="The daemon needs Unix sockets"
+)
+
+
+def run_job(job, context):
+    if job["operation"] == "fail":
+        raise ValueError("boom")
+
+    context.log("INFO", f"Running {job['operation']}")
+    for progress in [50, 100]:
+        context.progress(job["query"][0], progress, "Downloading")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    socket_path = tmp_path / "spotdl.sock"
+    server = DaemonServer(socket_path, run_job)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield socket_path
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_submit_job(daemon, tmp_path):
+    messages = list(
+        submit_job(daemon, "download", ["songs.csv"], {"threads": 2}, str(tmp_path))
+    )
+
+    assert [message["type"] for message in messages] == [
+        "log",
+        "progress",
+        "progress",
+        "done",
+    ]
+    assert messages[0]["message"] == "Running download"
+    assert messages[2]["progress"] == 100
+    assert messages[-1]["success"] is True
+
+
+def test_failed_job(daemon):
+    messages = list(submit_job(daemon, "fail", ["songs.csv"]))
+
+    assert messages[-1] == {
+        "type": "done",
+        "success": False,
+        "error": "ValueError: boom",
+    }
+
+
+def test_daemon_already_running(daemon):
+    with pytest.raises(DaemonError):
+        DaemonServer(daemon, run_job)
+
+
+def test_daemon_not_running(tmp_path):
+    with pytest.raises(DaemonError):
+        list(submit_job(tmp_path / "missing.sock", "download", ["songs.csv"]))
@@ -143,3 +143,39 @@ def test_convert(tmpdir, monkeypatch):
         output_format="m4a",
         bitrate="320K",
     ) == (True, None)
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="Uses a shell script")
+def test_convert_progress_and_bounded_errors(tmp_path):
+    """
+    Test the progress and the error report of the convert function.
+    """
+
+    fake_ffmpeg = tmp_path / "ffmpeg"
+    fake_ffmpeg.write_text(
+        "#!/bin/sh\n"
+        "for time in 0 5000000 10000000; do\n"
+        '  printf "out_time_us=%s\\nout_time_ms=%s\\nprogress=continue\\n" $time $time\n'
+        "done\n"
+        'for line in $(seq 1 500); do echo "error $line" >&2; done\n'
+        "exit 1\n"
+    )
+    fake_ffmpeg.chmod(0o755)
+    input_file = tmp_path / "input.webm"
+    input_file.touch()
+
+    progress = []
+    success, error = convert(
+        input_file=input_file,
+        output_file=tmp_path / "output.mp3",
+        ffmpeg=str(fake_ffmpeg),
+        progress_handler=progress.append,
+        duration=20,
+    )
+
+    assert success is False
+    assert progress == [0, 25, 50]
+    assert error is not None
+    assert error["error"].splitlines() == [
+        f"error {line}" for line in range(501 - ERROR_LINES, 501)
+    ]
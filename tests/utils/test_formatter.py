@@ -2,6 +2,7 @@
 
 from spotdl.types.song import Song, SongList
 from spotdl.utils.formatter import (
+    FileNameTemplate,
     create_file_name,
     create_song_title,
     parse_duration,
@@ -153,6 +154,36 @@ def test_create_file_name_restrict():
     )
 
 
+def test_file_name_template():
+    """
+    Test the compiled file name template
+    """
+
+    template = FileNameTemplate("{artist}/{list-name}/{list-position} - {title}")
+
+    assert template.fields == {
+        "{artist}",
+        "{list-name}",
+        "{list-position}",
+        "{title}",
+        "{output-ext}",
+    }
+
+    song = Song.from_missing_data(
+        name="Ropes: Remix",
+        artists=["Dirty Palm"],
+        artist="Dirty Palm",
+        list_name="test",
+        list_position=5,
+        list_length=11,
+    )
+    assert template.create(song, "mp3") == Path("Dirty Palm/test/05 - Ropes- Remix.mp3")
+
+    # Empty list fields are removed from the template
+    song.list_name = None
+    assert template.create(song, "mp3") == Path("Dirty Palm/05 - Ropes- Remix.mp3")
+
+
 def test_parse_duration():
     """
     Test the duration parsing
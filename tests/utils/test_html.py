@@ -0,0 +1,90 @@
+import pytest
+
+from spotdl.providers.lyrics.azlyrics import AzLyrics
+from spotdl.providers.lyrics.musixmatch import MusixMatch
+from spotdl.utils.html import ParseOnly, available_backends, parse_html
+
+AZLYRICS_PAGE = """
+<html><body>
+<div class="container"><div class="col">
+<div class="ringtone"><a href="/ringtone">Ringtone</a></div>
+<b>"Shockwave"</b>
+<div>
+<!-- Usage of azlyrics.com content by any third-party lyrics provider is prohibited. -->
+Always think about you<br>
+Always thought I have a life I could grow with you
+</div>
+<div class="smt">Submit Corrections</div>
+<div>A longer text that is not part of the lyrics, but of the footer of the page</div>
+</div></div>
+</body></html>
+"""
+
+AZLYRICS_SEARCH = """
+<table>
+<tr><td><a href="https://www.azlyrics.com/lyrics/marshmello/shockwave.html">
+<span>"Shockwave"</span></a> - <b>Marshmello</b></td></tr>
+<tr><td>No link</td></tr>
+</table>
+"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_parse_html(backend):
+    page = parse_html(
+        '<div><p class="a b" id="x">Hello <i>world</i></p><p>Bye</p></div>',
+        backend=backend,
+    )
+
+    paragraph = page.select_one("p")
+    assert paragraph is not None
+    assert paragraph.text == "Hello world"
+    assert paragraph.get("class") == "a b"
+    assert paragraph.get("missing", "default") == "default"
+    assert len(page.select("p")) == 2
+    assert len(page.select("p", limit=1)) == 1
+
+    page.remove("i")
+    assert page.select_one("p.a").text == "Hello "  # type: ignore
+
+
+def test_parse_html_only():
+    page = parse_html(
+        '<div class="Lyrics__Container-x">Lyrics</div><div class="ad">Ad</div>',
+        ParseOnly("div", ("Lyrics__Container",)),
+        backend="html.parser",
+    )
+
+    assert [div.text for div in page.select("div")] == ["Lyrics"]
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_parse_azlyrics(backend):
+    lyrics = AzLyrics.parse_lyrics(AZLYRICS_PAGE, backend)
+    assert lyrics is not None
+    assert lyrics.startswith("Always think about you")
+    assert lyrics.endswith("grow with you")
+
+    assert AzLyrics.parse_results(AZLYRICS_SEARCH, backend) == {
+        'Marshmello - "Shockwave"': (
+            "https://www.azlyrics.com/lyrics/marshmello/shockwave.html"
+        )
+    }
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_parse_musixmatch(backend):
+    assert (
+        MusixMatch.parse_lyrics(
+            '<p class="mxm-lyrics__content">One</p>'
+            '<p class="other">Ad</p>'
+            '<p class="mxm-lyrics__content">Two</p>',
+            backend,
+        )
+        == "One\nTwo"
+    )
+
+    assert MusixMatch.parse_results(
+        '<a href="/lyrics/Warriyo/Mortals">Mortals</a><a href="/album/x">Album</a>',
+        backend,
+    ) == {"Mortals": "https://www.musixmatch.com/lyrics/Warriyo/Mortals"}
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from spotdl.utils.config import GlobalConfig
+from spotdl.utils.http import HTTPClient, get_async_http_client, run_sync
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_reuse(server_url):
+    client = HTTPClient(pool_size=2)
+    session = client.new_session()
+
+    assert client.get(server_url).text == "ok"
+    assert client.get(server_url).text == "ok"
+    assert session.get(server_url).text == "ok"
+
+    stats = client.stats()["127.0.0.1"]
+    assert stats == {"requests": 3, "connections": 1, "reused": 2}
+    assert client.cache_info() == (2, 1)
+
+
+def test_host_limits(server_url):
+    client = HTTPClient(host_limits={"127.0.0.1": 1})
+
+    assert client.get_host_limit("https://example.com/") is None
+    assert client.get_host_limit(server_url) is client.get_host_limit(server_url)
+    assert client.get(server_url).status_code == 200
+
+
+def test_proxies_from_global_config(server_url, monkeypatch):
+    monkeypatch.setitem(GlobalConfig.parameters, "proxies", {"http": "http://proxy"})
+    client = HTTPClient()
+
+    sent = {}
+
+    def fake_send(request, **kwargs):
+        sent.update(kwargs)
+        raise RuntimeError("not sent")
+
+    monkeypatch.setattr(client.session, "send", fake_send)
+
+    with pytest.raises(RuntimeError):
+        client.get(server_url)
+
+    assert sent["proxies"]["http"] == "http://proxy"
+    assert sent["timeout"] == client.timeout
+
+
+def test_async_client(server_url):
+    async def fetch():
+        client = get_async_http_client()
+        assert get_async_http_client() is client
+
+        return await client.get(server_url, params={"q": "test"})
+
+    response = run_sync(fetch())
+
+    assert response.status_code == 200
+    assert response.text == "ok"
+
+
+def test_run_sync_reuses_loop():
+    async def get_client():
+        return asyncio.get_running_loop(), get_async_http_client()
+
+    assert run_sync(get_client()) == run_sync(get_client())
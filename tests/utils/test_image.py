@@ -0,0 +1,32 @@
+import io
+
+import pytest
+
+from spotdl.utils.image import detect_mime, normalize_cover
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 16
+
+
+def test_detect_mime():
+    assert detect_mime(PNG) == "image/png"
+    assert detect_mime(b"RIFF\0\0\0\0WEBPVP8 ") == "image/webp"
+    assert detect_mime(b"GIF89a") == "image/gif"
+    assert detect_mime(b"\xff\xd8\xff\xe0") == "image/jpeg"
+
+
+def test_normalize_cover_without_max_size():
+    assert normalize_cover(PNG, None) == (PNG, "image/png")
+
+
+def test_normalize_cover_crops_and_resizes():
+    image_module = pytest.importorskip("PIL.Image")
+
+    thumbnail = io.BytesIO()
+    image_module.new("RGB", (1280, 720), "red").save(thumbnail, "WEBP")
+
+    data, mime = normalize_cover(thumbnail.getvalue(), 600)
+
+    assert mime == "image/jpeg"
+    with image_module.open(io.BytesIO(data)) as cover:
+        assert cover.size == (600, 600)
+        assert cover.format == "JPEG"
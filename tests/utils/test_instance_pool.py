@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from spotdl.utils.instance_pool import InstancePool, InstancePoolError
+
+
+def test_ranked_prefers_fast_healthy_instances():
+    pool = InstancePool(["https://a", "https://b/", "https://c"], probe_interval=None)
+
+    assert pool.ranked() == ["https://a", "https://b", "https://c"]
+
+    pool.record("https://a", 0.5)
+    pool.record("https://b", 0.1)
+    pool.record("https://c")
+
+    assert pool.ranked() == ["https://b", "https://a", "https://c"]
+
+
+def test_call_fails_over():
+    pool = InstancePool(["https://a", "https://b"], probe_interval=None)
+
+    def func(url):
+        if url == "https://a":
+            raise ConnectionError("down")
+
+        return url
+
+    assert pool.call(func) == "https://b"
+    assert [state.healthy for state in pool.states] == [False, True]
+
+    # The failed instance is now tried last
+    assert pool.ranked() == ["https://b", "https://a"]
+
+
+def test_call_raises_when_all_instances_fail():
+    pool = InstancePool(["https://a", "https://b"], probe_interval=None)
+
+    def func(url):
+        raise ConnectionError(url)
+
+    with pytest.raises(InstancePoolError):
+        pool.call(func)
+
+
+def test_hedged_call_uses_first_answer():
+    pool = InstancePool(
+        ["https://a", "https://b"], probe_interval=None, hedge_delay=0.05
+    )
+
+    def func(url):
+        if url == "https://a":
+            time.sleep(0.5)
+
+        return url
+
+    start = time.perf_counter()
+    assert pool.call(func, hedge=True) == "https://b"
+    assert time.perf_counter() - start < 0.4
+
+    pool.close()
+
+
+def test_async_call_hedges_and_fails_over():
+    pool = InstancePool(
+        ["https://a", "https://b", "https://c"], probe_interval=None, hedge_delay=0.05
+    )
+
+    async def func(url):
+        if url == "https://a":
+            await asyncio.sleep(0.5)
+        elif url == "https://b":
+            raise ConnectionError("down")
+
+        return url
+
+    pool.states[0].failures = 1
+
+    assert asyncio.run(pool.call_async(func, hedge=True)) == "https://c"
+
+    # The cancelled call isn't counted as a success, but its latency is raised
+    assert pool.states[0].failures == 1
+    assert pool.states[0].latency >= 0.05
+    assert asyncio.run(pool.call_async(func)) == "https://c"
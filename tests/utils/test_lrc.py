@@ -0,0 +1,53 @@
+import requests
+import syncedlyrics
+
+from spotdl.providers.lyrics.synced import Synced
+from spotdl.types.song import Song
+from spotdl.utils.circuit import CLOSED, OPEN, CircuitBreaker
+from spotdl.utils.lrc import generate_lrc, search_synced_lyrics
+
+LRC = "[00:01.00] Hello\n[00:02.00] World"
+
+
+def test_search_synced_lyrics_is_cached(monkeypatch):
+    searches = []
+
+    def search(term, **_):
+        searches.append(term)
+        return LRC
+
+    monkeypatch.setattr(syncedlyrics, "search", search)
+
+    assert search_synced_lyrics("Cached", ["Artist"]) == LRC
+    assert search_synced_lyrics("Cached", ["Artist"]) == LRC
+    assert searches == ["Cached - Artist"]
+
+
+def test_generate_lrc_reuses_synced_lyrics(monkeypatch, tmp_path):
+    monkeypatch.setattr(syncedlyrics, "search", lambda *_, **__: None)
+
+    song = Song.from_missing_data(
+        name="Synced", artists=["Artist"], artist="Artist", lyrics=LRC
+    )
+    generate_lrc(song, tmp_path / "song.mp3")
+
+    assert (tmp_path / "song.lrc").read_text(encoding="utf-8") == LRC
+
+
+def test_synced_provider_reports_outcome(monkeypatch):
+    def search(term, **_):
+        if term.startswith("Failing"):
+            raise requests.exceptions.SSLError("Max retries exceeded")
+
+        return LRC
+
+    monkeypatch.setattr(syncedlyrics, "search", search)
+
+    provider = Synced()
+    provider.circuit = CircuitBreaker("Synced", failure_threshold=1)
+
+    assert provider.get_lyrics("Failing", ["Artist"]) is None
+    assert provider.circuit.state == OPEN
+
+    assert provider.get_lyrics("Working", ["Artist"]) == LRC
+    assert provider.circuit.state == CLOSED
@@ -0,0 +1,59 @@
+import time
+
+from spotdl.types.song import Song
+from spotdl.utils.lyrics_cache import EMBED, LRC, LyricsCache, lyrics_format
+
+SONG = Song.from_missing_data(
+    name="Mortals",
+    artists=["Warriyo", "Laura Brehm"],
+    artist="Warriyo",
+)
+
+
+def test_lyrics_cache_hit(tmp_path):
+    cache = LyricsCache(tmp_path / "lyrics.db")
+    cache.set(SONG, "[00:01.00] Hello", "Genius", providers="genius")
+
+    cached = cache.get(SONG, providers="musixmatch,genius")
+    assert cached is not None
+    assert cached.lyrics == "[00:01.00] Hello"
+    assert cached.provider == "Genius"
+    assert cached.format == "lrc"
+
+    # Namespaces are separate
+    assert cache.get(SONG, LRC) is None
+
+    cache.close()
+
+    # The cache survives reopening
+    assert LyricsCache(tmp_path / "lyrics.db").get(SONG, EMBED) is not None
+
+
+def test_lyrics_cache_hit_from_other_provider(tmp_path):
+    cache = LyricsCache(tmp_path / "lyrics.db")
+    cache.set(SONG, "Hello", "Genius", providers="genius,musixmatch")
+
+    # Lyrics of a provider that is no longer used are looked up again
+    assert cache.get(SONG, providers="musixmatch,azlyrics") is None
+    assert cache.get(SONG, providers="azlyrics,genius") is not None
+    assert cache.get(SONG) is not None
+
+
+def test_lyrics_cache_miss(tmp_path):
+    cache = LyricsCache(tmp_path / "lyrics.db", negative_ttl=0.05)
+    cache.set(SONG, None, providers="genius,musixmatch")
+
+    cached = cache.get(SONG, providers="genius,musixmatch")
+    assert cached is not None
+    assert cached.lyrics is None
+
+    # A miss only counts for the same providers
+    assert cache.get(SONG, providers="genius,azlyrics") is None
+
+    time.sleep(0.1)
+    assert cache.get(SONG, providers="genius,musixmatch") is None
+
+
+def test_lyrics_format():
+    assert lyrics_format("Hello\nWorld") == "plain"
+    assert lyrics_format("[ar: Warriyo]\n[00:12.34] Hello") == "lrc"
@@ -1,6 +1,9 @@
+from pathlib import Path
+
 import pytest
 
 from spotdl.types.playlist import Playlist
+from spotdl.types.song import Song
 from spotdl.utils.m3u import create_m3u_content, create_m3u_file
 
 PLAYLIST = "https://open.spotify.com/playlist/5LkNhFidYyyjRWwnkcMbQs"
@@ -18,8 +21,52 @@ def test_create_m3u_content():
     assert content.split("\n")[1].startswith("#EXTINF:")
     assert content.split("\n")[2].endswith(".mp3")
 
+
 def test_create_m3u_file(tmpdir, monkeypatch):
     monkeypatch.chdir(tmpdir)
     playlist = Playlist.from_url(PLAYLIST)
     create_m3u_file("test.m3u", playlist.songs, "", "mp3")
     assert tmpdir.join("test.m3u").isfile() is True
+
+
+def test_create_m3u_file_detects_formats_and_skips_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    songs = [
+        Song.from_missing_data(
+            name=f"Song {index}",
+            artists=["Artist"],
+            artist="Artist",
+            album_artist="Artist",
+            duration=100,
+            url=f"https://open.spotify.com/track/{index}",
+        )
+        for index in range(3)
+    ]
+    (tmp_path / "Artist - Song 1.flac").touch()
+
+    file_path = create_m3u_file(
+        "test.m3u",
+        songs,
+        "",
+        "mp3",
+        detect_formats=["flac", "mp3"],
+        paths={songs[2].url: Path("Artist - Song 2.opus")},
+    )
+
+    assert file_path.read_text(encoding="utf-8").splitlines()[2::2] == [
+        "Artist - Song 0.mp3",
+        "Artist - Song 1.flac",
+        "Artist - Song 2.mp3",
+    ]
+
+    # The file isn't rewritten when the content is the same
+    mtime = file_path.stat().st_mtime_ns
+    create_m3u_file("test.m3u", songs, "", "mp3", detect_formats=["flac", "mp3"])
+    assert file_path.stat().st_mtime_ns == mtime
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
+
+    # The paths of the downloader are used as they are
+    content = create_m3u_content(
+        songs, "", "mp3", paths={songs[2].url: Path("Artist - Song 2.opus")}
+    )
+    assert content.splitlines()[-1] == "Artist - Song 2.opus"
@@ -90,3 +90,38 @@ def test_embed_metadata(tmpdir, monkeypatch, output_format):
             continue
 
         assert file_metadata[key] == value
+
+
+def test_embed_metadata_mp3_keeps_padding(tmp_path):
+    # A few silent MPEG-1 Layer III frames
+    output_file = tmp_path / "song.mp3"
+    output_file.write_bytes((b"\xff\xfb\x90\x64" + b"\0" * 413) * 20)
+
+    song = Song.from_missing_data(
+        name="Mortals",
+        artists=["Warriyo", "Laura Brehm"],
+        artist="Warriyo",
+        album_name="Mortals",
+        album_artist="Warriyo",
+        genres=["dubstep"],
+        date="2019-09-02",
+        year=2019,
+        track_number=1,
+        tracks_count=1,
+        disc_number=1,
+        disc_count=1,
+        url="https://open.spotify.com/track/1",
+        lyrics="la la la",
+    )
+
+    embed_metadata(output_file, song, skip_album_art=True)
+    size = output_file.stat().st_size
+
+    metadata = get_file_metadata(output_file)
+    assert metadata is not None
+    assert metadata["artists"] == ["Warriyo", "Laura Brehm"]
+    assert metadata["lyrics"] == "la la la"
+
+    # Updating the tags fits in the padding, so the file isn't rewritten
+    embed_metadata(output_file, song, skip_album_art=True)
+    assert output_file.stat().st_size == size
@@ -0,0 +1,46 @@
+import json
+
+from spotdl.utils.metrics import RunMetrics, percentile, record_cache
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([1.0], 99) == 1.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([0.0, 10.0], 95) == 9.5
+
+
+def test_run_metrics_summary(tmpdir):
+    metrics = RunMetrics()
+
+    with metrics.measure("search", "song-1"):
+        pass
+
+    metrics.record_stage("download", 2.0, "song-1")
+    metrics.record_stage("search", 1.0, "song-2")
+    metrics.add_bytes(1024 * 1024)
+
+    metrics.record_song("song-1", 3.0, True)
+    metrics.record_song("song-2", 1.0, True)
+    metrics.record_song("song-3", 0.5, False)
+
+    record_cache("test-cache", True)
+    record_cache("test-cache", False)
+
+    metrics.finish()
+    summary = metrics.summary()
+
+    assert summary["songs_total"] == 3
+    assert summary["songs_downloaded"] == 1
+    assert summary["songs_skipped"] == 1
+    assert summary["songs_failed"] == 1
+    assert summary["bytes_downloaded"] == 1024 * 1024
+    assert summary["latency"]["p50"] == 1.0
+    assert summary["stages"]["search"]["count"] == 2
+    assert summary["caches"]["test-cache"]["hit_rate"] == 0.5
+
+    assert any(line.startswith("Song latency") for line in metrics.format_summary())
+
+    metrics.save(tmpdir.join("metrics.json"))
+    with open(tmpdir.join("metrics.json"), encoding="utf-8") as metrics_file:
+        assert json.load(metrics_file)["songs_total"] == 3
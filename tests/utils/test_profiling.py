@@ -0,0 +1,56 @@
+import threading
+import time
+
+from spotdl.utils.profiling import (
+    OTHER_STAGE,
+    SamplingProfiler,
+    get_thread_stage,
+    profile_stage,
+)
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_profile_stage_nesting():
+    assert get_thread_stage() == OTHER_STAGE
+
+    with profile_stage("download"):
+        assert get_thread_stage() == "download"
+
+        with profile_stage("convert"):
+            assert get_thread_stage() == "convert"
+
+        assert get_thread_stage() == "download"
+
+    assert get_thread_stage() == OTHER_STAGE
+
+
+def test_profiler_samples_worker_threads(tmpdir):
+    def worker():
+        with profile_stage("convert"):
+            busy_wait(0.2)
+
+    profiler = SamplingProfiler(interval=0.005)
+    profiler.start()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    profiler.stop()
+
+    assert profiler.get_stage_samples().get("convert", 0) > 0
+
+    self_top, cumulative_top = profiler.get_top_functions("convert")
+    assert any(name.startswith("busy_wait") for name, _ in self_top)
+    assert any(name.startswith("worker") for name, _ in cumulative_top)
+
+    report_path, folded_path = profiler.save(tmpdir.join("spotdl.profile"))
+    assert "convert" in report_path.read_text(encoding="utf-8")
+    assert folded_path.read_text(encoding="utf-8").startswith("convert;") or (
+        "\nconvert;" in folded_path.read_text(encoding="utf-8")
+    )
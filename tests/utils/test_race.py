@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+import time
+
+from spotdl.utils.race import race, race_async
+
+
+def answer_after(seconds, value):
+    def call():
+        time.sleep(seconds)
+        return value
+
+    return call
+
+
+def test_race_takes_fast_answer_when_preferred_calls_miss():
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        start = time.perf_counter()
+        result = race(
+            [
+                answer_after(0.01, None),
+                answer_after(0.02, "second"),
+                answer_after(0.4, "slow"),
+            ],
+            grace=0.5,
+            executor=executor,
+        )
+
+        assert result == "second"
+        assert time.perf_counter() - start < 0.3
+
+
+def test_race_waits_for_preferred_call_within_grace():
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        result = race(
+            [answer_after(0.1, "preferred"), answer_after(0.01, "fast")],
+            grace=0.5,
+            executor=executor,
+        )
+
+        assert result == "preferred"
+
+
+def test_race_gives_up_on_preferred_call_after_grace():
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        start = time.perf_counter()
+        result = race(
+            [answer_after(0.4, "preferred"), answer_after(0.01, "fast")],
+            grace=0.05,
+            executor=executor,
+        )
+
+        assert result == "fast"
+        assert time.perf_counter() - start < 0.3
+
+
+def test_race_async_cancels_losers():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+        return "slow"
+
+    async def fast():
+        return "fast"
+
+    async def failing():
+        raise ValueError("no lyrics")
+
+    async def main():
+        result = await race_async([failing(), fast(), slow()], grace=0.05)
+        await asyncio.sleep(0)
+
+        return result
+
+    assert asyncio.run(main()) == "fast"
+    assert cancelled == [True]
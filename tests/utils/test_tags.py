@@ -0,0 +1,42 @@
+import pytest
+
+from spotdl.types.song import Song
+from spotdl.utils.metadata import embed_metadata, get_file_metadata
+from spotdl.utils.tags import read_tags
+
+
+def test_read_tags(tmp_path):
+    output_file = tmp_path / "song.mp3"
+    output_file.write_bytes((b"\xff\xfb\x90\x64" + b"\0" * 413) * 20)
+
+    song = Song.from_missing_data(
+        name="Mortals",
+        artists=["Warriyo", "Laura Brehm"],
+        artist="Warriyo",
+        album_name="Mortals",
+        album_artist="Warriyo",
+        genres=["dubstep"],
+        date="2019-09-02",
+        year=2019,
+        track_number=1,
+        tracks_count=2,
+        disc_number=1,
+        disc_count=1,
+        isrc="GB2LD2110301",
+        url="https://open.spotify.com/track/1",
+    )
+    embed_metadata(output_file, song, skip_album_art=True)
+
+    assert read_tags(output_file, {"url", "isrc"}) == {
+        "url": "https://open.spotify.com/track/1",
+        "isrc": "GB2LD2110301",
+    }
+    assert read_tags(output_file, ["artist", "tracks_count", "lyrics"]) == {
+        "artist": "Warriyo",
+        "tracks_count": 2,
+        "lyrics": None,
+    }
+    assert read_tags(output_file) == get_file_metadata(output_file)
+
+    with pytest.raises(ValueError):
+        read_tags(output_file, {"title"})
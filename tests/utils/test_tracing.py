@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from spotdl.utils.profiling import profile_stage
+from spotdl.utils.tracing import (
+    disable_tracing,
+    enable_tracing,
+    get_tracer,
+    span,
+    traced,
+)
+
+
+@traced("double", attributes=lambda value: {"value": value})
+def double(value):
+    return value * 2
+
+
+def test_tracing_disabled():
+    assert get_tracer() is None
+
+    with span("noop") as attributes:
+        attributes["outcome"] = "ignored"
+
+    assert double(2) == 4
+
+
+def test_chrome_trace(tmpdir):
+    trace_path = tmpdir.join("trace.json")
+    enable_tracing(str(trace_path))
+
+    try:
+        with profile_stage("search"):
+            with span("provider", song_id="song-1") as attributes:
+                attributes["provider"] = "test"
+
+        assert double(3) == 6
+
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+    finally:
+        disable_tracing()
+
+    with open(trace_path, encoding="utf-8") as trace_file:
+        events = json.load(trace_file)
+
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert spans["provider"]["args"]["stage"] == "search"
+    assert spans["provider"]["args"]["provider"] == "test"
+    assert spans["double"]["args"]["value"] == 3
+    assert spans["failing"]["args"]["outcome"] == "error"
+
+
+def test_jsonl_trace(tmpdir):
+    trace_path = tmpdir.join("trace.jsonl")
+    enable_tracing(str(trace_path))
+
+    try:
+        with span("provider", song_id="song-1"):
+            pass
+    finally:
+        disable_tracing()
+
+    with open(trace_path, encoding="utf-8") as trace_file:
+        events = [json.loads(line) for line in trace_file]
+
+    assert len(events) == 1
+    assert events[0]["attributes"]["song_id"] == "song-1"
+    assert events[0]["endTimeUnixNano"] >= events[0]["startTimeUnixNano"]
+    assert events[0]["status"]["code"] == "OK"